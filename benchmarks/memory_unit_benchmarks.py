@@ -87,3 +87,20 @@ class MemSolveModel:
         t = np.linspace(0, 3600, 600)
         solver.solve(self.model, t)
         return solver
+
+
+class MemBuildModel:
+    param_names = ["intern symbols"]
+    params = [False, True]
+
+    def mem_build_DFN(self, intern_symbols):
+        model = pybamm.lithium_ion.DFN(
+            {
+                "SEI": "solvent-diffusion limited",
+                "lithium plating": "irreversible",
+                "thermal": "lumped",
+            }
+        )
+        if intern_symbols:
+            model.intern_symbols()
+        return model
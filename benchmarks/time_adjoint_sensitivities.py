@@ -0,0 +1,71 @@
+import pybamm
+import casadi
+import numpy as np
+
+parameters = [
+    "Current function [A]",
+    "Negative electrode diffusivity [m2.s-1]",
+    "Positive electrode diffusivity [m2.s-1]",
+    "Negative electrode active material volume fraction",
+    "Positive electrode active material volume fraction",
+    "Cation transference number",
+    "Negative electrode porosity",
+    "Positive electrode porosity",
+    "Separator porosity",
+    "Negative electrode Bruggeman coefficient (electrolyte)",
+    "Positive electrode conductivity [S.m-1]",
+    "Initial concentration in electrolyte [mol.m-3]",
+]
+
+
+class TimeAdjointSensitivities:
+    param_names = ["n_parameters", "mode"]
+    params = ([1, 4, 12], ["forward", "adjoint"])
+
+    def setup(self, n_parameters, mode):
+        if mode == "forward" and n_parameters > 1:
+            # forward sensitivities take more than a minute for two parameters
+            raise NotImplementedError
+        parameter_values = pybamm.ParameterValues("Chen2020")
+        self.inputs = {}
+        for name in parameters[:n_parameters]:
+            self.inputs[name] = parameter_values[name]
+            parameter_values[name] = "[input]"
+        sim = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(), parameter_values=parameter_values
+        )
+        sim.build()
+        self.model = sim.built_model
+        self.t_eval = np.linspace(0, 3000, 50)
+        solution = pybamm.CasadiSolver().solve(
+            self.model.new_copy(), self.t_eval, inputs=self.inputs
+        )
+        self.data = solution["Voltage [V]"].entries.reshape(1, -1) + 0.01
+        self.solver = pybamm.CasadiSolver()
+        # set up once, so that only the solves are timed
+        self.solve(mode)
+
+    def rmse(self, variables):
+        return casadi.sqrt(casadi.sumsqr(variables["Voltage [V]"] - self.data) / 50)
+
+    def solve(self, mode):
+        if mode == "forward":
+            solution = self.solver.solve(
+                self.model,
+                self.t_eval,
+                inputs=self.inputs,
+                calculate_sensitivities=True,
+            )
+            voltage = solution["Voltage [V]"]
+            error = voltage.entries - self.data[0]
+            rmse = np.sqrt(np.mean(error**2))
+            for name in self.inputs:
+                sensitivity = np.asarray(voltage.sensitivities[name]).flatten()
+                np.mean(error * sensitivity) / rmse
+        else:
+            self.solver.solve_adjoint(
+                self.model, self.t_eval, self.rmse, ["Voltage [V]"], self.inputs
+            )
+
+    def time_gradient(self, n_parameters, mode):
+        self.solve(mode)
@@ -0,0 +1,19 @@
+import pybamm
+
+options = {
+    "SEI": "solvent-diffusion limited",
+    "SEI on cracks": "true",
+    "lithium plating": "partially reversible",
+    "loss of active material": "stress-driven",
+    "particle mechanics": "swelling and cracking",
+    "thermal": "lumped",
+}
+
+
+class TimeBuildDFNWithOptions:
+    def setup(self):
+        # the first build finds and caches the order of the submodels
+        pybamm.lithium_ion.DFN(options)
+
+    def time_build_DFN(self):
+        pybamm.lithium_ion.DFN(options)
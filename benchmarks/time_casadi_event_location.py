@@ -0,0 +1,40 @@
+import pybamm
+
+
+class TimeCasadiEventLocation:
+    param_names = ["model"]
+    params = (["SPM", "DFN"],)
+
+    def setup(self, model):
+        model = getattr(pybamm.lithium_ion, model)()
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C until 3.3V",
+                    "Rest for 10 minutes",
+                    "Charge at 0.7C until 4.1V",
+                    "Hold at 4.1V until 50mA",
+                    "Rest for 10 minutes",
+                )
+            ]
+            * 5,
+            period="30 seconds",
+        )
+        self.sim = pybamm.Simulation(
+            model, experiment=experiment, solver=pybamm.CasadiSolver("safe")
+        )
+        self.sim.build_for_experiment()
+
+    def time_solve(self, model):
+        self.sim.solve()
+
+    def track_n_integrators(self, model):
+        self.sim.solve()
+        solvers = {
+            id(solver): solver for solver in self.sim.op_conds_to_built_solvers.values()
+        }
+        return sum(
+            len(integrators)
+            for solver in solvers.values()
+            for integrators in solver.integrators.values()
+        )
@@ -0,0 +1,26 @@
+import pybamm
+import numpy as np
+
+
+class TimeCompiledFunctions:
+    param_names = ["model", "compile_functions"]
+    params = (["SPM", "SPMe", "DFN"], [False, True])
+    n_points = 100
+
+    def setup(self, model, compile_functions):
+        # compiled functions are cached on disk, so only the first setup compiles
+        solver = pybamm.CasadiSolver(compile_functions=compile_functions)
+        self.sim = pybamm.Simulation(
+            getattr(pybamm.lithium_ion, model)(), solver=solver
+        )
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.sim.solve(self.t_eval)
+        built_model = self.sim.built_model
+        self.rhs = built_model.casadi_rhs.map(self.n_points)
+        self.y = np.tile(built_model.y0.full(), (1, self.n_points))
+
+    def time_evaluate_rhs(self, model, compile_functions):
+        self.rhs(0, self.y, [])
+
+    def time_solve(self, model, compile_functions):
+        self.sim.solve(self.t_eval)
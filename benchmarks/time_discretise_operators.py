@@ -0,0 +1,31 @@
+import pybamm
+
+
+class TimeDiscretiseOperators:
+    param_names = ["model", "dimensionality"]
+    params = (["SPMe", "DFN"], [0, 1])
+
+    def setup(self, model, dimensionality):
+        options = {}
+        if dimensionality == 1:
+            options = {"current collector": "potential pair", "dimensionality": 1}
+        model = getattr(pybamm.lithium_ion, model)(options)
+        parameter_values = model.default_parameter_values
+        self.model = parameter_values.process_model(model, inplace=False)
+        geometry = model.default_geometry
+        parameter_values.process_geometry(geometry)
+        var_pts = {
+            **model.default_var_pts,
+            "x_n": 20,
+            "x_s": 20,
+            "x_p": 20,
+            "r_n": 30,
+            "r_p": 30,
+            "z": 10,
+        }
+        self.mesh = pybamm.Mesh(geometry, model.default_submesh_types, var_pts)
+        self.spatial_methods = model.default_spatial_methods
+
+    def time_discretise(self, model, dimensionality):
+        disc = pybamm.Discretisation(self.mesh, self.spatial_methods)
+        disc.process_model(self.model, inplace=False)
@@ -0,0 +1,35 @@
+import pybamm
+import numpy as np
+
+
+class TimeExpandedFunctions:
+    param_names = ["model", "expand_functions"]
+    params = (["SPM", "SPMe", "DFN"], [False, True])
+    n_points = 100
+
+    def setup(self, model, expand_functions):
+        self.model = getattr(pybamm.lithium_ion, model)()
+        self.solver = pybamm.CasadiSolver(
+            mode="fast", expand_functions=expand_functions
+        )
+        self.sim = pybamm.Simulation(self.model, solver=self.solver)
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.sim.solve(self.t_eval)
+        built_model = self.sim.built_model
+        self.rhs_algebraic = built_model.rhs_algebraic_eval.map(self.n_points)
+        self.jac = built_model.jac_rhs_algebraic_eval.map(self.n_points)
+        self.y = np.tile(built_model.y0.full(), (1, self.n_points))
+
+    def time_set_up(self, model, expand_functions):
+        # build time of the solver functions (conversion to casadi, Jacobians and,
+        # in SX mode, expansion)
+        self.solver.copy().set_up(self.sim.built_model.new_copy())
+
+    def time_evaluate_rhs_algebraic(self, model, expand_functions):
+        self.rhs_algebraic(0, self.y, [])
+
+    def time_evaluate_jacobian(self, model, expand_functions):
+        self.jac(0, self.y, [])
+
+    def time_solve(self, model, expand_functions):
+        self.sim.solve(self.t_eval)
@@ -0,0 +1,22 @@
+import pybamm
+import numpy as np
+
+
+class TimeIDAKLUDenseOutput:
+    param_names = ["dense_output"]
+    params = ([False, True],)
+
+    def setup(self, dense_output):
+        if not pybamm.have_idaklu():
+            raise NotImplementedError
+        model = pybamm.lithium_ion.DFN()
+        self.sim = pybamm.Simulation(
+            model,
+            solver=pybamm.IDAKLUSolver(options={"dense_output": dense_output}),
+        )
+        self.sim.build()
+        # 1 Hz output over a one hour discharge
+        self.t_eval = np.linspace(0, 3600, 3601)
+
+    def time_solve(self, dense_output):
+        self.sim.solve(self.t_eval)
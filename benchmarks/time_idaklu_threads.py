@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pybamm
+
+
+class TimeIDAKLUThreads:
+    param_names = ["max_workers"]
+    params = ([1, 4],)
+
+    def setup(self, max_workers):
+        if not pybamm.have_idaklu():
+            raise NotImplementedError
+        model = pybamm.lithium_ion.SPMe()
+        parameter_values = model.default_parameter_values
+        parameter_values.update({"Current function [A]": "[input]"})
+        self.sim = pybamm.Simulation(
+            model, parameter_values=parameter_values, solver=pybamm.IDAKLUSolver()
+        )
+        self.t_eval = np.linspace(0, 3600, 100)
+        self.currents = np.linspace(0.5, 5, 16)
+        # set up the solver, then clone a compiled solver for each worker
+        self.sim.build()
+        self.solve(self.currents[0])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.solve, self.currents[:max_workers]))
+
+    def solve(self, current):
+        return self.sim.solver.solve(
+            self.sim.built_model, self.t_eval, inputs={"Current function [A]": current}
+        )
+
+    def time_solve(self, max_workers):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.solve, self.currents))
@@ -0,0 +1,27 @@
+import pybamm
+import numpy as np
+
+
+class TimeNaturalSteps:
+    param_names = ["natural_steps"]
+    params = ([False, True],)
+
+    def setup(self, natural_steps):
+        if not pybamm.have_idaklu():
+            raise NotImplementedError
+        model = pybamm.lithium_ion.DFN()
+        self.sim = pybamm.Simulation(
+            model,
+            solver=pybamm.IDAKLUSolver(
+                natural_steps=natural_steps, natural_steps_tol=1e-4
+            ),
+        )
+        self.sim.build()
+        # 1 Hz output over a one hour discharge
+        self.t_eval = np.linspace(0, 3600, 3601)
+
+    def time_solve(self, natural_steps):
+        self.sim.solve(self.t_eval)
+
+    def track_number_of_time_points(self, natural_steps):
+        return len(self.sim.solve(self.t_eval).t)
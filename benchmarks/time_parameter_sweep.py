@@ -0,0 +1,25 @@
+import pybamm
+import numpy as np
+
+
+class TimeParameterSweep:
+    param_names = ["model", "n_values", "mode"]
+    params = (["SPM", "DFN"], [4, 16], ["rebuild", "sweep"])
+    name = "Negative electrode diffusivity [m2.s-1]"
+
+    def setup(self, model, n_values, mode):
+        self.model = getattr(pybamm.lithium_ion, model)()
+        self.parameter_values = pybamm.ParameterValues("Chen2020")
+        self.values = np.linspace(1e-14, 1e-13, n_values)
+
+    def time_sweep(self, model, n_values, mode):
+        if mode == "rebuild":
+            # a new simulation for each value
+            for value in self.values:
+                parameter_values = self.parameter_values.copy()
+                parameter_values[self.name] = value
+                sim = pybamm.Simulation(self.model, parameter_values=parameter_values)
+                sim.solve([0, 3600])
+        else:
+            sim = pybamm.Simulation(self.model, parameter_values=self.parameter_values)
+            sim.sweep({self.name: self.values}, [0, 3600])
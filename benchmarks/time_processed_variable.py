@@ -0,0 +1,40 @@
+import pybamm
+import numpy as np
+
+
+class TimeProcessedVariable:
+    param_names = ["model", "number of time points", "solver_class"]
+    params = (
+        ["SPM", "DFN"],
+        [100, 10000],
+        [pybamm.CasadiSolver, pybamm.IDAKLUSolver],
+    )
+    variable_names = [
+        "Voltage [V]",
+        "Electrolyte concentration [mol.m-3]",
+        "Negative particle concentration [mol.m-3]",
+    ]
+
+    def setup(self, model, n_t, solver_class):
+        model = getattr(pybamm.lithium_ion, model)()
+        sim = pybamm.Simulation(model, solver=solver_class())
+        self.solution = sim.solve(np.linspace(0, 3600, n_t))
+        # create the casadi functions for the variables, so that only the
+        # evaluation is timed
+        self.solution.update(self.variable_names)
+
+    def time_process_variables(self, model, n_t, solver_class):
+        self.solution._variables = pybamm.FuzzyDict()
+        self.solution.update(self.variable_names)
+
+    def time_evaluate_index_by_index(self, model, n_t, solver_class):
+        # reference: evaluate the casadi functions one time point at a time
+        for name in self.variable_names:
+            var_casadi = self.solution.all_models[0]._variables_casadi[name]
+            for ts, ys, inputs in zip(
+                self.solution.all_ts,
+                self.solution.all_ys,
+                self.solution.all_inputs_casadi,
+            ):
+                for idx, t in enumerate(ts):
+                    var_casadi(t, ys[:, idx], inputs).full()
@@ -1,4 +1,6 @@
 import pybamm
+import shutil
+import tempfile
 
 parameters = [
     "Marquis2019",
@@ -115,3 +117,48 @@ class TimeBuildDFNSimulation:
             pybamm.Simulation(self.model, parameter_values=self.param, experiment=exp)
         else:
             pybamm.Simulation(self.model, parameter_values=self.param, C_rate=1)
+
+
+class TimeBuildDFNSimulationFromCache:
+    param_names = ["build cache"]
+    params = [False, True]
+
+    def setup(self, build_cache):
+        self.directory = tempfile.mkdtemp()
+        if build_cache:
+            sim = pybamm.Simulation(
+                pybamm.lithium_ion.DFN(), build_cache=self.directory
+            )
+            sim.solve([0, 1])
+
+    def teardown(self, build_cache):
+        shutil.rmtree(self.directory)
+
+    def time_build_and_set_up_DFN_simulation(self, build_cache):
+        sim = pybamm.Simulation(
+            pybamm.lithium_ion.DFN(),
+            build_cache=self.directory if build_cache else None,
+        )
+        sim.solve([0, 1])
+
+
+class TimeBuildDFNMeshRefinement:
+    param_names = ["remesh"]
+    params = [False, True]
+
+    def setup(self, remesh):
+        self.model = pybamm.lithium_ion.DFN()
+        self.sim = pybamm.Simulation(self.model)
+        self.sim.build()
+        self.var_pts = [
+            {**self.model.default_var_pts, "x_n": n, "x_p": n, "r_n": n, "r_p": n}
+            for n in [10, 20, 40]
+        ]
+
+    def time_build_DFN_mesh_refinement(self, remesh):
+        for var_pts in self.var_pts:
+            if remesh:
+                sim = self.sim.remesh(var_pts)
+            else:
+                sim = pybamm.Simulation(self.model, var_pts=var_pts)
+            sim.build()
@@ -48,3 +48,25 @@ class TimeSimulation:
 
     def time_solve(self, experiment, parameters, model_class, solver_class):
         self.sim.solve()
+
+
+class TimeBuildExperiment:
+    param_names = ["model_class", "build_option"]
+    params = [
+        [pybamm.lithium_ion.SPM, pybamm.lithium_ion.DFN],
+        [None, "share_experiment_structure", "generic_experiment_steps"],
+    ]
+
+    def setup(self, model_class, build_option):
+        self.model = model_class()
+        self.exp = pybamm.Experiment(
+            [f"Discharge at {c} C until 3.3 V" for c in [0.1, 0.2, 0.5, 1, 2]]
+            + [f"Charge at {c} C until 4.1 V" for c in [0.1, 0.2, 0.5, 1]]
+            + ["Hold at 4.1 V until 10 mA", "Rest for 1 hour"]
+            + [f"Discharge at {p} W until 3.3 V" for p in [1, 2, 5]]
+        )
+        self.kwargs = {} if build_option is None else {build_option: True}
+
+    def time_build(self, model_class, build_option):
+        sim = pybamm.Simulation(self.model, experiment=self.exp, **self.kwargs)
+        sim.build_for_experiment()
@@ -0,0 +1,34 @@
+import pybamm
+import numpy as np
+
+
+class TimeSparseJacobian:
+    param_names = ["use_jacobian_colouring"]
+    params = ([False, True],)
+
+    def setup(self, use_jacobian_colouring):
+        model = pybamm.lithium_ion.DFN()
+        model.convert_to_format = "python"
+        model.use_jacobian_colouring = use_jacobian_colouring
+        var_pts = {"x_n": 40, "x_s": 20, "x_p": 40, "r_n": 40, "r_p": 40}
+        sim = pybamm.Simulation(model, var_pts=var_pts)
+        sim.build()
+        self.model = sim.built_model
+        self.solver = pybamm.BaseSolver(root_method="lm")
+        self.solver.set_up(self.model)
+        self.y0 = self.model.concatenated_initial_conditions.evaluate().flatten()
+
+    def time_set_up(self, use_jacobian_colouring):
+        self.solver.copy().set_up(self.model.new_copy())
+
+    def time_evaluate_jacobian(self, use_jacobian_colouring):
+        self.model.jac_rhs_algebraic_eval(0, self.y0, {})
+
+    def time_solve_spme(self, use_jacobian_colouring):
+        model = pybamm.lithium_ion.SPMe()
+        model.convert_to_format = "python"
+        model.use_jacobian_colouring = use_jacobian_colouring
+        var_pts = {"x_n": 40, "x_s": 20, "x_p": 40, "r_n": 100, "r_p": 100}
+        solver = pybamm.ScipySolver(method="BDF")
+        sim = pybamm.Simulation(model, var_pts=var_pts, solver=solver)
+        sim.solve(np.linspace(0, 3600, 100))
@@ -0,0 +1,61 @@
+import pybamm
+import anytree
+
+
+class TimeTraverseSymbols:
+    param_names = ["model"]
+    params = (["SPM", "SPMe", "DFN"],)
+
+    def setup(self, model):
+        model = getattr(pybamm.lithium_ion, model)()
+        sim = pybamm.Simulation(model)
+        sim.build()
+        self.model = sim.model_with_set_params
+        self.mesh = sim.mesh
+        self.spatial_methods = sim.spatial_methods
+        self.built_model = sim.built_model
+        # all the expression trees of the parameterised model
+        self.symbols = [
+            *self.model.rhs.values(),
+            *self.model.algebraic.values(),
+            *self.model.variables.values(),
+        ]
+        self.n_unique_nodes = len(self.transform_all(lambda node: None))
+
+    def transform_all(self, transform):
+        cache = {}
+        for symbol in self.symbols:
+            pybamm.transform_symbol(symbol, transform, cache)
+        return cache
+
+    def time_anytree_pre_order(self, model):
+        # reference: the pre-order iterator of anytree
+        for symbol in self.symbols:
+            for _ in anytree.PreOrderIter(symbol):
+                pass
+
+    def time_pre_order(self, model):
+        for symbol in self.symbols:
+            for _ in symbol.pre_order():
+                pass
+
+    def time_transform_unique_nodes(self, model):
+        self.transform_all(lambda node: None)
+
+    def time_unpack_variables(self, model):
+        pybamm.SymbolUnpacker(pybamm.Variable).unpack_list_of_symbols(self.symbols)
+
+    def time_jacobian(self, model):
+        y = pybamm.StateVector(slice(0, self.built_model.len_rhs_and_alg))
+        pybamm.Jacobian().jac(self.built_model.concatenated_rhs, y)
+
+    def time_discretise(self, model):
+        disc = pybamm.Discretisation(self.mesh, self.spatial_methods)
+        disc.process_model(self.model, inplace=False)
+
+    def track_transform_time_per_unique_node(self, model):
+        timer = pybamm.Timer()
+        self.transform_all(lambda node: None)
+        return timer.time().value / self.n_unique_nodes
+
+    track_transform_time_per_unique_node.unit = "seconds"
@@ -0,0 +1,29 @@
+import pybamm
+
+
+class TrackSolverStats:
+    param_names = ["solver"]
+    params = (["CasadiSolver", "IDAKLUSolver"],)
+
+    def setup(self, solver):
+        if solver == "IDAKLUSolver" and not pybamm.have_idaklu():
+            raise NotImplementedError
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C until 3.3V", "Charge at C/2 until 4.1V")] * 3,
+            period="30 seconds",
+        )
+        self.sim = pybamm.Simulation(
+            pybamm.lithium_ion.DFN(),
+            experiment=experiment,
+            solver=getattr(pybamm, solver)(),
+        )
+        self.sol = self.sim.solve()
+
+    def track_number_of_steps(self, solver):
+        return self.sol.solver_stats.number_of_steps
+
+    def track_number_of_jacobian_evaluations(self, solver):
+        return self.sol.solver_stats.number_of_jacobian_evaluations
+
+    def track_residual_time(self, solver):
+        return self.sol.solver_stats.residual_time
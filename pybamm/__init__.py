@@ -54,6 +54,7 @@ from .util import (
 from .logger import logger, set_logging_level, get_new_logger
 from .settings import settings
 from .citations import Citations, citations, print_citations
+
 #
 # Classes for the Expression Tree
 #
@@ -91,8 +92,20 @@ from .expression_tree.operations.evaluate_python import EvaluatorJax
 from .expression_tree.operations.evaluate_python import JaxCooMatrix
 
 from .expression_tree.operations.jacobian import Jacobian
+from .expression_tree.operations.sparse_jacobian import (
+    ColouredJacobian,
+    colour_columns,
+    jacobian_sparsity,
+)
 from .expression_tree.operations.convert_to_casadi import CasadiConverter
 from .expression_tree.operations.unpack_symbols import SymbolUnpacker
+from .expression_tree.operations.replace_symbols import SymbolReplacer
+from .expression_tree.operations.intern_symbols import SymbolInterner
+from .expression_tree.operations.traverse_symbols import (
+    pre_order,
+    post_order,
+    transform_symbol,
+)
 
 #
 # Model classes
@@ -200,9 +213,12 @@ from .spatial_methods.scikit_finite_element import ScikitFiniteElement
 #
 # Solver classes
 #
+from .solvers.solver_stats import SolverStats
 from .solvers.solution import Solution, EmptySolution, make_cycle_solution
+from .solvers.solution_sink import SolutionSink, NpzSolutionSink
 from .solvers.processed_variable import ProcessedVariable
 from .solvers.processed_variable_computed import ProcessedVariableComputed
+from .solvers.casadi_function_compiler import CasadiFunctionCompiler
 from .solvers.base_solver import BaseSolver
 from .solvers.dummy_solver import DummySolver
 from .solvers.algebraic_solver import AlgebraicSolver
@@ -238,6 +254,7 @@ from .plotting.dynamic_plot import dynamic_plot
 # Simulation
 #
 from .simulation import Simulation, load_sim, is_notebook
+from .build_cache import BuildCache
 
 #
 # Batch Study
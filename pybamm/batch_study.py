@@ -2,6 +2,8 @@
 # BatchStudy class
 #
 import pybamm
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor
 from itertools import product
 
 
@@ -44,6 +46,25 @@ class BatchStudy:
         and second model with second solver, second experiment etc.
         If True runs a cartesian product of models, solvers and experiments.
         Default is False
+    sweep : dict (optional)
+        A dictionary of the values over which to sweep some of the parameters (see
+        :meth:`pybamm.Simulation.sweep`). If given, each simulation is built once,
+        with the swept parameters as input parameters, and solved for every set of
+        values, so the solution of each simulation is a list of solutions. The
+        values are combined as in :meth:`pybamm.Simulation.sweep`, with the same
+        `permutations`, and the solutions are plotted together, labelled with the
+        values of the swept parameters. Default is None
+    executor : int or :class:`concurrent.futures.Executor` (optional)
+        How to run the simulations, which are independent of each other,
+        concurrently. If an int, the number of worker processes to build and solve
+        the simulations in. If an executor (e.g. a
+        :class:`concurrent.futures.ProcessPoolExecutor`), the simulations are
+        submitted to it, and it is not shut down afterwards. The simulations are
+        sent to (and returned from) worker processes by pickling, so their models
+        cannot be in the "python" format. Each simulation is given its own copy of
+        its solver, so that simulations which use the same solver can also run in
+        threads. Default is None, which builds and solves the simulations one after
+        the other in this process.
     """
 
     INPUT_LIST = [
@@ -72,6 +93,8 @@ class BatchStudy:
         C_rates=None,
         repeats=1,
         permutations=False,
+        sweep=None,
+        executor=None,
     ):
         self.models = models
         self.experiments = experiments
@@ -85,6 +108,8 @@ class BatchStudy:
         self.C_rates = C_rates
         self.repeats = repeats
         self.permutations = permutations
+        self.sweep = sweep
+        self.executor = executor
         self.quick_plot = None
 
         if not self.permutations:
@@ -110,10 +135,14 @@ class BatchStudy:
         **kwargs,
     ):
         """
+        Build and solve each simulation of the study. The solved simulations are
+        stored in `self.sims`, in the same order whether or not they are run
+        concurrently, and the time taken to build them and to solve them (for each
+        of the `repeats`) in `self.timings`.
+
         For more information on the parameters used in the solve,
         See :meth:`pybamm.Simulation.solve`
         """
-        self.sims = []
         iter_func = product if self.permutations else zip
 
         # Instantiate items in INPUT_LIST based on the value of self.permutations
@@ -127,6 +156,7 @@ class BatchStudy:
                 inp_value = [None] * len(self.models)
             inp_values.append(inp_value)
 
+        sims_and_solvers = []
         for (
             model,
             experiment,
@@ -139,6 +169,9 @@ class BatchStudy:
             output_variable,
             C_rate,
         ) in iter_func(self.models.values(), *inp_values):
+            if self.executor is not None and solver is not None:
+                # Simulations run concurrently must not share a solver
+                solver = solver.copy()
             sim = pybamm.Simulation(
                 model,
                 experiment=experiment,
@@ -151,36 +184,81 @@ class BatchStudy:
                 output_variables=output_variable,
                 C_rate=C_rate,
             )
-            # Repeat to get average solve time and integration time
-            solve_time = 0
-            integration_time = 0
-            for _ in range(self.repeats):
-                sol = sim.solve(
-                    t_eval,
-                    solver,
-                    check_model,
-                    save_at_cycles,
-                    calc_esoh,
-                    starting_solution,
-                    initial_soc,
-                    **kwargs,
-                )
-                solve_time += sol.solve_time
-                integration_time += sol.integration_time
-            sim.solution.solve_time = solve_time / self.repeats
-            sim.solution.integration_time = integration_time / self.repeats
-            self.sims.append(sim)
+            sims_and_solvers.append((sim, solver))
+
+        solve_args = (
+            self.sweep,
+            self.permutations,
+            t_eval,
+            check_model,
+            save_at_cycles,
+            calc_esoh,
+            starting_solution,
+            initial_soc,
+            kwargs,
+        )
+        if self.executor is None:
+            results = [
+                _build_and_solve(sim, solver, self.repeats, *solve_args)
+                for sim, solver in sims_and_solvers
+            ]
+        elif isinstance(self.executor, Executor):
+            results = self._run_in_executor(self.executor, sims_and_solvers, solve_args)
+        else:
+            with ProcessPoolExecutor(max_workers=self.executor) as executor:
+                results = self._run_in_executor(executor, sims_and_solvers, solve_args)
+
+        self.sims = [sim for sim, _ in results]
+        self.timings = [timings for _, timings in results]
+
+    def _run_in_executor(self, executor, sims_and_solvers, solve_args):
+        """
+        Submit each simulation to an executor, and return the results in the same
+        order as the simulations.
+        """
+        futures = [
+            executor.submit(
+                _build_and_solve, sim, solver, self.repeats, *solve_args, pickle=True
+            )
+            for sim, solver in sims_and_solvers
+        ]
+        return [future.result() for future in futures]
 
     def plot(self, output_variables=None, **kwargs):
         """
         For more information on the parameters used in the plot,
         See :meth:`pybamm.Simulation.plot`
         """
+        solutions, labels = self._get_solutions_and_labels()
+        kwargs.setdefault("labels", labels)
         self.quick_plot = pybamm.dynamic_plot(
-            self.sims, output_variables=output_variables, **kwargs
+            solutions, output_variables=output_variables, **kwargs
         )
         return self.quick_plot
 
+    def _get_solutions_and_labels(self):
+        """
+        Get the solutions to plot, and their labels (None to use the names of the
+        models). With `sweep`, the solutions of each simulation are plotted one
+        after the other, labelled with the name of the model and the values of the
+        swept parameters.
+        """
+        if self.sweep is None:
+            return self.sims, None
+        solutions = []
+        labels = []
+        for sim in self.sims:
+            for sol in sim.solution:
+                inputs = sol.all_inputs[0]
+                values = ", ".join(
+                    f"{name}={np.squeeze(inputs[name])}"
+                    for name in self.sweep
+                    if name in inputs
+                )
+                solutions.append(sol)
+                labels.append(f"{sim.model.name} ({values})")
+        return solutions, labels
+
     def create_gif(self, number_of_images=80, duration=0.1, output_filename="plot.gif"):
         """
         Generates x plots over a time span of t_eval and compiles them to create
@@ -198,10 +276,96 @@ class BatchStudy:
         """
 
         if self.quick_plot is None:
-            self.quick_plot = pybamm.QuickPlot(self.sims)
+            solutions, labels = self._get_solutions_and_labels()
+            self.quick_plot = pybamm.QuickPlot(solutions, labels=labels)
 
         self.quick_plot.create_gif(
             number_of_images=number_of_images,
             duration=duration,
             output_filename=output_filename,
         )
+
+
+def _build_and_solve(
+    sim,
+    solver,
+    repeats,
+    sweep,
+    permutations,
+    t_eval,
+    check_model,
+    save_at_cycles,
+    calc_esoh,
+    starting_solution,
+    initial_soc,
+    kwargs,
+    pickle=False,
+):
+    """
+    Build and solve a simulation of a :class:`BatchStudy`, `repeats` times, and
+    return the solved simulation along with the time taken to build it and to solve
+    it. If `pickle` is True, the simulation is made ready to be pickled (to be sent
+    back from a worker process). If `sweep` is given, the simulation is solved for
+    each set of values of the swept parameters.
+    """
+    timer = pybamm.Timer()
+    if sweep is not None:
+        sim.set_input_parameters(list(sweep))
+    if sim.operating_mode == "with experiment":
+        sim.build_for_experiment(check_model=check_model, initial_soc=initial_soc)
+    else:
+        sim.build(check_model=check_model, initial_soc=initial_soc)
+    build_time = timer.time()
+
+    # Repeat to get average solve time and integration time
+    solve_times = []
+    integration_times = []
+    sweep_times = []
+    for _ in range(repeats):
+        if sweep is None:
+            sol = sim.solve(
+                t_eval,
+                solver,
+                check_model,
+                save_at_cycles,
+                calc_esoh,
+                starting_solution,
+                initial_soc,
+                **kwargs,
+            )
+            solve_times.append(sol.solve_time)
+            integration_times.append(sol.integration_time)
+        else:
+            timer.reset()
+            sols = sim.sweep(
+                sweep,
+                t_eval,
+                solver,
+                check_model,
+                permutations,
+                save_at_cycles=save_at_cycles,
+                calc_esoh=calc_esoh,
+                starting_solution=starting_solution,
+                initial_soc=initial_soc,
+                **kwargs,
+            )
+            solve_times.append(timer.time())
+            integration_times.append(sum(sol.integration_time for sol in sols))
+            sweep_times.append([(sol.solve_time, sol.integration_time) for sol in sols])
+    if sweep is None:
+        sim.solution.solve_time = sum(solve_times) / repeats
+        sim.solution.integration_time = sum(integration_times) / repeats
+    else:
+        # Average the times of each swept solution over the repeats
+        for i, sol in enumerate(sim.solution):
+            sol.solve_time = sum(times[i][0] for times in sweep_times) / repeats
+            sol.integration_time = sum(times[i][1] for times in sweep_times) / repeats
+
+    if pickle:
+        sim._clear_solver_problems()
+    timings = {
+        "build time": build_time,
+        "solve times": solve_times,
+        "integration times": integration_times,
+    }
+    return sim, timings
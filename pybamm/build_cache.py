@@ -0,0 +1,390 @@
+#
+# On-disk cache of built simulations
+#
+import hashlib
+import inspect
+import numbers
+import os
+import pickle
+import tempfile
+import types
+
+import numpy as np
+from scipy.sparse import issparse
+
+import pybamm
+
+
+class BuildCache:
+    """
+    Content-addressed on-disk cache of built simulations. Each entry holds the built
+    (parameterised and discretised) model and the mesh of a simulation, and is
+    stored under a hash of everything the build depends on: the model equations,
+    variables and options, the parameter values, the geometry, the mesh and the
+    spatial methods. Once the model has been solved, the entry also holds the
+    functions created by the solver set-up, so that a simulation with the same
+    solver settings and input parameters in another process can skip both the build
+    and the solver set-up.
+
+    Pass a cache (or a directory) as the `build_cache` argument of
+    :class:`pybamm.Simulation` to use it.
+
+    **EXPERIMENTAL** - this class is experimental and the format of the entries may
+    change in future releases. Only simulations without an experiment, whose model
+    is converted to casadi, are cached.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which to store the entries. Created if it does not exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_filename(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get_simulation_key(self, simulation):
+        """
+        Get the key of the entry for a simulation, which is a hash of everything the
+        build of the simulation depends on. Parameter functions are hashed from their
+        source code and the values they use (default arguments, closures and
+        globals), and symbols from each of their nodes, including their data (e.g.
+        the data of interpolants). Returns None if the simulation depends on an object that cannot be
+        hashed reliably, in which case the simulation is not cached.
+
+        Parameters
+        ----------
+        simulation : :class:`pybamm.Simulation`
+            The simulation (which has not been built yet)
+
+        Returns
+        -------
+        str or None
+            The key of the entry
+        """
+        try:
+            return _hash(
+                [
+                    pybamm.__version__,
+                    _describe_model(simulation._unprocessed_model),
+                    simulation._parameter_values,
+                    simulation._geometry,
+                    simulation._submesh_types,
+                    simulation._var_pts,
+                    simulation._spatial_methods,
+                ]
+            )
+        except _NotFingerprintable as error:
+            pybamm.logger.info(
+                f"Simulation not cached: cannot hash an object of type {error}"
+            )
+            return None
+
+    def get_set_up_key(self, solver, model, t_eval, inputs):
+        """
+        Get the key of the solver set-up of a built model, which is a hash of the
+        solver settings and of the input parameters. Returns None if the set-up of
+        `solver` cannot be cached (e.g. if the solver also stores functions on
+        itself, like the :class:`pybamm.IDAKLUSolver`).
+
+        Parameters
+        ----------
+        solver : :class:`pybamm.BaseSolver`
+            The solver used to solve the model
+        model : :class:`pybamm.BaseModel`
+            The built model
+        t_eval : numeric type
+            The times at which the model is solved
+        inputs : dict or list
+            The input parameters passed to the solver
+
+        Returns
+        -------
+        str or None
+            The key of the set-up
+        """
+        if type(solver).set_up is not pybamm.BaseSolver.set_up or (
+            solver.output_variables
+        ):
+            return None
+        if isinstance(inputs, list):
+            inputs = inputs[0] if inputs else {}
+        inputs = inputs or {}
+        description = [
+            _describe_solver(solver),
+            {name: np.shape(value) for name, value in inputs.items()},
+        ]
+        # The number of discontinuity events of models with modulo functions of time
+        # depends on the final time
+        if any(
+            isinstance(symbol, pybamm.Modulo)
+            for eqn in [*model.rhs.values(), *model.algebraic.values()]
+            for symbol in eqn.pre_order()
+        ):
+            description.append(None if t_eval is None else float(t_eval[-1]))
+        try:
+            return _hash(description)
+        except _NotFingerprintable:
+            return None
+
+    def load(self, key):
+        """
+        Load an entry.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry
+
+        Returns
+        -------
+        dict or None
+            The entry, or None if there is no (readable) entry for this key
+        """
+        filename = self._get_filename(key)
+        try:
+            with open(filename, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ) as error:
+            # truncated or corrupted entries, or entries that refer to classes that
+            # no longer exist
+            pybamm.logger.warning(
+                f"Rejected build cache entry '{filename}': {type(error).__name__}: "
+                f"{error}"
+            )
+            return None
+
+    def save(self, key, entry):
+        """
+        Save an entry. The entry is first written to a temporary file, which then
+        replaces any existing entry, so that other processes never read a partly
+        written entry.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry
+        entry : dict
+            The entry
+        """
+        fd, temporary_filename = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_filename, self._get_filename(key))
+        except BaseException:
+            os.remove(temporary_filename)
+            raise
+
+    def clear(self):
+        """
+        Remove all the entries.
+        """
+        for filename in os.listdir(self.directory):
+            if filename.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, filename))
+
+
+def _describe_model(model):
+    """
+    Describe the equations, variables and options of a model with strings, which
+    (unlike the ids of symbols) are the same in every process.
+    """
+    return [
+        type(model).__module__,
+        type(model).__qualname__,
+        model.name,
+        getattr(model, "options", None),
+        model.convert_to_format,
+        model.use_jacobian,
+        model.use_jacobian_colouring,
+        {var.name: eqn for var, eqn in model.rhs.items()},
+        {var.name: eqn for var, eqn in model.algebraic.items()},
+        {var.name: eqn for var, eqn in model.initial_conditions.items()},
+        {
+            str(var): {side: tuple(bc) for side, bc in bcs.items()}
+            for var, bcs in model.boundary_conditions.items()
+        },
+        [(event.name, event.expression, event.event_type) for event in model.events],
+        dict(model.variables),
+    ]
+
+
+def _describe_solver(solver):
+    """
+    Describe the type and settings of a solver (and of its root-finding method).
+    """
+    settings = {
+        key: value
+        for key, value in vars(solver).items()
+        if isinstance(value, (numbers.Number, str, type(None)))
+    }
+    if isinstance(solver.root_method, pybamm.BaseSolver):
+        settings["root_method"] = _describe_solver(solver.root_method)
+    if solver.compile_functions is not None:
+        settings["compile_functions"] = [
+            solver.compile_functions.compiler,
+            solver.compile_functions.flags,
+        ]
+    return [type(solver), settings]
+
+
+class _NotFingerprintable(Exception):
+    """
+    Raised for objects whose state cannot be reliably converted to a string for
+    hashing.
+    """
+
+
+def _stable_str(obj, seen=frozenset(), memo=None):
+    """
+    Convert an object to a string that does not depend on the process (no ids or
+    memory addresses), for hashing. Raises `_NotFingerprintable` for objects whose
+    string would not capture all their state. `seen` holds the functions that are
+    being converted, to stop at recursive references, and `memo` the hashes of the
+    symbols that have already been converted.
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(obj, pybamm.Symbol):
+        return _symbol_str(obj, seen, memo)
+    elif isinstance(obj, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest()
+        return f"array({obj.shape}, {obj.dtype}, {digest})"
+    elif isinstance(obj, (dict, pybamm.ParameterValues)):
+        items = sorted(
+            f"{_stable_str(k, seen, memo)}: {_stable_str(v, seen, memo)}"
+            for k, v in obj.items()
+        )
+        return "{" + ", ".join(items) + "}"
+    elif isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(_stable_str(x, seen, memo) for x in obj) + "]"
+    elif isinstance(obj, slice):
+        return f"slice({obj.start}, {obj.stop}, {obj.step})"
+    elif issparse(obj):
+        obj = obj.tocsr()
+        data = [obj.shape, obj.data, obj.indices, obj.indptr]
+        return f"sparse({_stable_str(data, seen, memo)})"
+    elif isinstance(obj, type):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    elif isinstance(obj, pybamm.MeshGenerator):
+        return f"MeshGenerator({_stable_str(obj.submesh_type, seen, memo)}, " + (
+            f"{_stable_str(obj.submesh_params, seen, memo)})"
+        )
+    elif isinstance(obj, pybamm.SpatialMethod):
+        return f"{_stable_str(type(obj), seen, memo)}({_stable_str(obj.options, seen, memo)})"
+    elif inspect.isfunction(obj):
+        return _function_str(obj, seen, memo)
+    elif isinstance(obj, (types.BuiltinFunctionType, np.ufunc, type(np.sum))):
+        # e.g. math.exp, np.exp or np.sum, which have no state
+        return f"{type(obj).__name__}({obj.__name__})"
+    elif isinstance(obj, types.ModuleType):
+        return f"module({obj.__name__})"
+    elif isinstance(obj, (numbers.Number, str, type(None), pybamm.EventType)):
+        return repr(obj)
+    else:
+        # The string of other objects may leave out some of their state
+        raise _NotFingerprintable(type(obj).__qualname__)
+
+
+def _symbol_str(symbol, seen, memo):
+    """
+    Convert an expression tree to a string from the class, name and domains of each
+    of its nodes, along with the data that their names leave out (e.g. the entries
+    of arrays or the data of interpolants). Each node is converted to the hash of
+    its own description and of the strings of its children, which is stored in
+    `memo`, so that subtrees shared between expressions are only converted once.
+    """
+    key = id(symbol)
+    if key not in memo:
+        description = [type(symbol), symbol.name, symbol.domains]
+        description.extend(_symbol_data(symbol))
+        children = [_symbol_str(child, seen, memo) for child in symbol.children]
+        string = _stable_str([description, children], seen, memo)
+        # keep a reference to the symbol, so that its id is not reused
+        memo[key] = symbol, hashlib.sha256(string.encode()).hexdigest()
+    return f"Symbol({memo[key][1]})"
+
+
+def _symbol_data(symbol):
+    """
+    Get the data of a node of an expression tree which is not part of its name.
+    """
+    if isinstance(symbol, pybamm.Array):
+        return [symbol.entries]
+    elif isinstance(symbol, pybamm.Interpolant):
+        return [symbol.x, symbol.y, symbol.interpolator, symbol.extrapolate]
+    elif isinstance(symbol, pybamm.Function):
+        return [symbol.function]
+    elif isinstance(symbol, pybamm.Scalar):
+        return [symbol.value]
+    elif isinstance(symbol, pybamm.StateVectorBase):
+        return [symbol.y_slices, symbol.evaluation_array]
+    elif isinstance(symbol, pybamm.Index):
+        return [symbol.slice]
+    elif isinstance(symbol, pybamm.BoundaryOperator):
+        return [symbol.side]
+    elif isinstance(symbol, pybamm.SpatialVariable):
+        return [symbol.coord_sys]
+    elif isinstance(symbol, pybamm.VariableBase):
+        return [symbol.scale, symbol.reference, symbol.bounds]
+    elif isinstance(symbol, pybamm.ExplicitTimeIntegral):
+        return [symbol.initial_condition]
+    return []
+
+
+def _function_str(func, seen, memo):
+    """
+    Convert a function to a string from its source code and from the values it
+    uses: its default arguments, the contents of its closure and the globals it
+    references.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    if func in seen:
+        return name
+    seen = seen | {func}
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):  # pragma: no cover
+        source = func.__code__.co_code.hex()
+    closure = []
+    for cell in func.__closure__ or ():
+        try:
+            closure.append(cell.cell_contents)
+        except ValueError:  # pragma: no cover
+            # empty cell
+            closure.append(None)
+    global_names = [n for n in _get_names(func.__code__) if n in func.__globals__]
+    values = [
+        func.__defaults__,
+        func.__kwdefaults__,
+        closure,
+        {n: func.__globals__[n] for n in global_names},
+    ]
+    return f"{name}({source}, {_stable_str(values, seen, memo)})"
+
+
+def _get_names(code):
+    """
+    Get the names used by a code object and by the code objects nested in it (which
+    include the names of the globals they reference).
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _get_names(const)
+    return names
+
+
+def _hash(obj):
+    return hashlib.sha256(_stable_str(obj).encode()).hexdigest()
@@ -1,6 +1,7 @@
 #
 # Interface for discretisation
 #
+import copy
 import pybamm
 import numpy as np
 from collections import defaultdict, OrderedDict
@@ -63,6 +64,59 @@ class Discretisation(object):
         self.y_slices = {}
         self._discretised_symbols = {}
 
+    def remesh(self, mesh):
+        """
+        Create a discretisation with the same spatial methods on a new mesh, e.g. to
+        discretise a model again with a different number of points for a mesh
+        convergence study. The spatial methods are copied (so that this discretisation
+        can still be used), and the discretised symbols that do not depend on the mesh
+        (symbols without domains or variables, such as functions of time and input
+        parameters) are carried over.
+
+        This is only a small shortcut: processing a model with the new discretisation
+        still walks the whole expression tree of the model and discretises every
+        symbol that depends on the mesh (or on a variable) again, so the time taken
+        scales with the size of the model, not with the number of spatial operators.
+
+        Parameters
+        ----------
+        mesh : :class:`pybamm.Mesh`
+            The new mesh, with the same domains as the mesh of this discretisation
+
+        Returns
+        -------
+        :class:`pybamm.Discretisation`
+            The discretisation on the new mesh
+        """
+        # Copy each spatial method once, so that domains that shared a spatial method
+        # still share it
+        copied_methods = {}
+        spatial_methods = {}
+        for domain, method in self._spatial_methods.items():
+            if id(method) not in copied_methods:
+                copied_methods[id(method)] = copy.copy(method)
+            spatial_methods[domain] = copied_methods[id(method)]
+        disc = Discretisation(mesh, spatial_methods)
+        disc._discretised_symbols = {
+            symbol: discretised_symbol
+            for symbol, discretised_symbol in self._discretised_symbols.items()
+            if self._is_mesh_independent(symbol)
+        }
+        return disc
+
+    @staticmethod
+    def _is_mesh_independent(symbol):
+        """
+        Whether the discretisation of a symbol does not depend on the mesh, i.e.
+        whether it has no domains and no variables (whose state vector slices depend
+        on the number of points of the other variables).
+        """
+        return all(
+            not isinstance(sym, pybamm.VariableBase)
+            and all(domain == [] for domain in sym.domains.values())
+            for sym in symbol.pre_order()
+        )
+
     @property
     def mesh(self):
         return self._mesh
@@ -727,24 +781,50 @@ class Discretisation(object):
         try:
             return self._discretised_symbols[symbol]
         except KeyError:
-            discretised_symbol = self._process_symbol(symbol)
-            self._discretised_symbols[symbol] = discretised_symbol
-            discretised_symbol.test_shape()
+            # Discretise the children first, without recursion, so that discretising
+            # each symbol only recurses one level down
+            return pybamm.transform_symbol(
+                symbol,
+                self._process_and_check_symbol,
+                self._discretised_symbols,
+                expand=self._processes_children,
+            )
 
-            # Assign mesh as an attribute to the processed variable
-            if symbol.domain != []:
-                discretised_symbol.mesh = self.mesh[symbol.domain]
-            else:
-                discretised_symbol.mesh = None
+    @staticmethod
+    def _processes_children(symbol):
+        """Whether discretising a symbol always discretises all of its children."""
+        return isinstance(
+            symbol,
+            (
+                pybamm.BinaryOperator,
+                pybamm.UnaryOperator,
+                pybamm.Function,
+                pybamm.Concatenation,
+            ),
+        ) and not isinstance(
+            symbol, (pybamm._BaseAverage, pybamm.ConcatenationVariable)
+        )
 
-            # Assign secondary mesh
-            if symbol.domains["secondary"] != []:
-                discretised_symbol.secondary_mesh = self.mesh[
-                    symbol.domains["secondary"]
-                ]
-            else:
-                discretised_symbol.secondary_mesh = None
-            return discretised_symbol
+    def _process_and_check_symbol(self, symbol):
+        """
+        Discretise a symbol (see :meth:`Discretisation.process_symbol()`), check its
+        shape and assign the mesh(es) to it.
+        """
+        discretised_symbol = self._process_symbol(symbol)
+        discretised_symbol.test_shape()
+
+        # Assign mesh as an attribute to the processed variable
+        if symbol.domain != []:
+            discretised_symbol.mesh = self.mesh[symbol.domain]
+        else:
+            discretised_symbol.mesh = None
+
+        # Assign secondary mesh
+        if symbol.domains["secondary"] != []:
+            discretised_symbol.secondary_mesh = self.mesh[symbol.domains["secondary"]]
+        else:
+            discretised_symbol.secondary_mesh = None
+        return discretised_symbol
 
     def _process_symbol(self, symbol):
         """See :meth:`Discretisation.process_symbol()`."""
@@ -119,6 +119,10 @@ class Array(pybamm.Symbol):
         """See :meth:`pybamm.Symbol._base_evaluate()`."""
         return self._entries
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return self._entries.shape
+
     def is_constant(self):
         """See :meth:`pybamm.Symbol.is_constant()`."""
         return True
@@ -121,6 +121,18 @@ class BinaryOperator(pybamm.Symbol):
         right = self.children[1].evaluate_for_shape()
         return self._binary_evaluate(left, right)
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return self._binary_shape(*children_shapes)
+
+    def _binary_shape(self, left_shape, right_shape):
+        """
+        Infer the shape of the result of the binary operation from the shapes of
+        'left' and 'right'. By default, the operation is element-wise, so the shapes
+        are broadcast together.
+        """
+        return np.broadcast_shapes(left_shape, right_shape)
+
     def _binary_jac(self, left_jac, right_jac):
         """Calculate the Jacobian of a binary operator."""
         raise NotImplementedError
@@ -139,7 +151,13 @@ class BinaryOperator(pybamm.Symbol):
 
     def is_constant(self):
         """See :meth:`pybamm.Symbol.is_constant()`."""
-        return self.left.is_constant() and self.right.is_constant()
+        try:
+            return self._saved_is_constant
+        except AttributeError:
+            self._saved_is_constant = (
+                self.left.is_constant() and self.right.is_constant()
+            )
+            return self._saved_is_constant
 
     def _sympy_operator(self, left, right):
         """Apply appropriate SymPy operators."""
@@ -322,6 +340,18 @@ class MatrixMultiplication(BinaryOperator):
         """See :meth:`pybamm.BinaryOperator._binary_evaluate()`."""
         return left @ right
 
+    def _binary_shape(self, left_shape, right_shape):
+        """See :meth:`pybamm.BinaryOperator._binary_shape()`."""
+        if (
+            len(left_shape) != 2
+            or len(right_shape) != 2
+            or left_shape[1] != right_shape[0]
+        ):
+            raise ValueError(
+                f"matmul: shapes {left_shape} and {right_shape} are incompatible"
+            )
+        return (left_shape[0], right_shape[1])
+
     def _sympy_operator(self, left, right):
         """Override :meth:`pybamm.BinaryOperator._sympy_operator`"""
         sympy = have_optional_dependency("sympy")
@@ -472,6 +502,11 @@ class Equality(BinaryOperator):
         else:
             return int(left == right)
 
+    def _binary_shape(self, left_shape, right_shape):
+        """See :meth:`pybamm.BinaryOperator._binary_shape()`."""
+        # Equality always evaluates to an integer
+        return ()
+
     def _binary_new_copy(self, left, right):
         """See :meth:`pybamm.BinaryOperator._binary_new_copy()`."""
         return pybamm.Equality(left, right)
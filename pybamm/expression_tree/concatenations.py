@@ -129,9 +129,30 @@ class Concatenation(pybamm.Symbol):
                 [child.evaluate_for_shape() for child in self.children]
             )
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        if len(children_shapes) == 0:
+            return (0,)
+        if self.concatenation_function not in (None, np.concatenate):
+            raise NotImplementedError
+        # Concatenate along the first axis
+        if any(shape == () for shape in children_shapes):
+            raise ValueError("zero-dimensional arrays cannot be concatenated")
+        if len({shape[1:] for shape in children_shapes}) > 1:
+            raise ValueError(
+                "cannot concatenate children with shapes {}".format(children_shapes)
+            )
+        return (sum(shape[0] for shape in children_shapes), *children_shapes[0][1:])
+
     def is_constant(self):
         """See :meth:`pybamm.Symbol.is_constant()`."""
-        return all(child.is_constant() for child in self.children)
+        try:
+            return self._saved_is_constant
+        except AttributeError:
+            self._saved_is_constant = all(
+                child.is_constant() for child in self.children
+            )
+            return self._saved_is_constant
 
     def _sympy_operator(self, *children):
         """Apply appropriate SymPy operators."""
@@ -293,6 +314,14 @@ class DomainConcatenation(Concatenation):
 
         return vector
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        try:
+            return (self._size, 1)
+        except AttributeError:
+            # The shape is tested before the slices are created
+            raise NotImplementedError
+
     def _concatenation_jac(self, children_jacs):
         """See :meth:`pybamm.Concatenation.concatenation_jac()`."""
         # note that this assumes that the children are in the right order and only have
@@ -344,6 +373,19 @@ class SparseStack(Concatenation):
             concat_fun=concatenation_function
         )
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        # Stack vertically, treating scalars and vectors as rows
+        children_shapes = [
+            shape if len(shape) == 2 else (1, int(np.prod(shape)))
+            for shape in children_shapes
+        ]
+        if len({shape[1] for shape in children_shapes}) > 1:
+            raise ValueError(
+                "cannot stack children with shapes {}".format(children_shapes)
+            )
+        return (sum(shape[0] for shape in children_shapes), children_shapes[0][1])
+
     def _concatenation_new_copy(self, children):
         """See :meth:`pybamm.Symbol.new_copy()`."""
         return SparseStack(*children)
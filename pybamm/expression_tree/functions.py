@@ -9,6 +9,7 @@ from scipy import special
 import pybamm
 from pybamm.util import have_optional_dependency
 
+
 class Function(pybamm.Symbol):
     """
     A node in the expression tree representing an arbitrary function.
@@ -153,7 +154,13 @@ class Function(pybamm.Symbol):
 
     def is_constant(self):
         """See :meth:`pybamm.Symbol.is_constant()`."""
-        return all(child.is_constant() for child in self.children)
+        try:
+            return self._saved_is_constant
+        except AttributeError:
+            self._saved_is_constant = all(
+                child.is_constant() for child in self.children
+            )
+            return self._saved_is_constant
 
     def _evaluate_for_shape(self):
         """
@@ -166,6 +173,34 @@ class Function(pybamm.Symbol):
     def _function_evaluate(self, evaluated_children):
         return self.function(*evaluated_children)
 
+    def _infer_shape(self, children_shapes):
+        """
+        Element-wise functions have the shapes of their children broadcast together.
+        The shape of other functions is inferred by applying the function to NaN
+        arrays with the shapes of the children (rather than to the evaluated
+        children).
+        See :meth:`pybamm.Symbol._infer_shape()`
+        """
+        if self._is_elementwise():
+            return np.broadcast_shapes(*children_shapes)
+        evaluated_self = self._function_evaluate(
+            [
+                np.nan if shape == () else np.full(shape, np.nan)
+                for shape in children_shapes
+            ]
+        )
+        if isinstance(evaluated_self, numbers.Number):
+            return ()
+        else:
+            return evaluated_self.shape
+
+    def _is_elementwise(self):
+        """
+        Whether the function is applied element-wise to its children, which is only
+        known for numpy ufuncs (e.g. `np.exp`) and the specific functions.
+        """
+        return isinstance(self.function, np.ufunc)
+
     def create_copy(self):
         """See :meth:`pybamm.Symbol.new_copy()`."""
         children_copy = [child.new_copy() for child in self.children]
@@ -248,6 +283,10 @@ class SpecificFunction(Function):
         """See :meth:`pybamm.Function._function_new_copy()`"""
         return pybamm.simplify_if_constant(self.__class__(*children))
 
+    def _is_elementwise(self):
+        """See :meth:`pybamm.Function._is_elementwise()`"""
+        return True
+
     def _sympy_operator(self, child):
         """Apply appropriate SymPy operators."""
         sympy = have_optional_dependency("sympy")
@@ -408,6 +447,11 @@ class Max(SpecificFunction):
         # Max will always return a scalar
         return np.nan * np.ones((1, 1))
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        # The shape for testing is not the evaluated shape, so use evaluation
+        raise NotImplementedError
+
 
 def max(child):
     """
@@ -428,6 +472,11 @@ class Min(SpecificFunction):
         # Min will always return a scalar
         return np.nan * np.ones((1, 1))
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        # The shape for testing is not the evaluated shape, so use evaluation
+        raise NotImplementedError
+
 
 def min(child):
     """
@@ -75,6 +75,10 @@ class Time(IndependentVariable):
         """
         return 0
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return ()
+
     def to_equation(self):
         """Convert the node and its subtree into a SymPy equation."""
         sympy = have_optional_dependency("sympy")
@@ -15,8 +15,9 @@ class CasadiConverter(object):
 
     def convert(self, symbol, t, y, y_dot, inputs):
         """
-        This function recurses down the tree, converting the PyBaMM expression tree to
-        a CasADi expression tree
+        This function walks down the tree (without recursion, see
+        :func:`pybamm.transform_symbol`), converting the PyBaMM expression tree to a
+        CasADi expression tree
 
         Parameters
         ----------
@@ -41,10 +42,11 @@ class CasadiConverter(object):
         except KeyError:
             # Change inputs to empty dictionary if it's None
             inputs = inputs or {}
-            casadi_symbol = self._convert(symbol, t, y, y_dot, inputs)
-            self._casadi_symbols[symbol] = casadi_symbol
-
-            return casadi_symbol
+            return pybamm.transform_symbol(
+                symbol,
+                lambda node: self._convert(node, t, y, y_dot, inputs),
+                self._casadi_symbols,
+            )
 
     def _convert(self, symbol, t, y, y_dot, inputs):
         """See :meth:`CasadiConverter.convert()`."""
@@ -0,0 +1,92 @@
+#
+# Helper class to intern (hash-cons) the nodes of expression trees
+#
+import pybamm
+
+
+class SymbolInterner(object):
+    """
+    Helper class to intern the nodes of a (set of) expression tree(s): structurally
+    identical nodes (nodes with the same id) are replaced by a single, canonical
+    instance, so that identical subtrees built separately (e.g. by different
+    submodels) are only held in memory once.
+
+    Nodes are interned in place: the children of a node are swapped for their
+    canonical instances, which have the same id, so the id of each node (and hence
+    the result of any pass that caches by symbol) is unchanged. Variables are never
+    swapped, since they carry attributes (such as bounds) that are not part of their
+    id.
+
+    Parameters
+    ----------
+    interned_symbols : dict, optional
+        The interning table, mapping each symbol to its canonical instance. Can be
+        shared between interners to intern several trees against the same table.
+    """
+
+    def __init__(self, interned_symbols=None):
+        if interned_symbols is None:
+            interned_symbols = {}
+        self._interned_symbols = interned_symbols
+
+    def __len__(self):
+        return len(self._interned_symbols)
+
+    def intern_symbol(self, symbol):
+        """
+        Intern the nodes of a symbol's expression tree.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol to intern
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            The canonical instance of `symbol`
+        """
+        try:
+            return self._interned_symbols[symbol]
+        except KeyError:
+            pass
+
+        children = symbol.children
+        if children:
+            interned_children = [self.intern_symbol(child) for child in children]
+            if any(new is not old for new, old in zip(interned_children, children)):
+                self._replace_children(symbol, interned_children)
+
+        if not isinstance(symbol, pybamm.VariableBase):
+            self._interned_symbols[symbol] = symbol
+        return symbol
+
+    @staticmethod
+    def _replace_children(symbol, children):
+        """
+        Replace the children of a symbol by equal (same id) instances, including
+        the attributes that refer to them.
+        """
+        symbol._children = children
+        symbol._orphans = children
+        if isinstance(symbol, pybamm.UnaryOperator):
+            symbol.child = children[0]
+        elif isinstance(symbol, pybamm.BinaryOperator):
+            symbol.left, symbol.right = children
+
+    def intern_dict(self, var_eqn_dict):
+        """
+        Intern the nodes of each value of a dictionary.
+
+        Parameters
+        ----------
+        var_eqn_dict : dict
+            Equation dictionary with keys as variables (or variable names) and values
+            as equations
+
+        Returns
+        -------
+        new_var_eqn_dict : dict
+            Dictionary with the same keys and the interned equations as values
+        """
+        return {key: self.intern_symbol(eqn) for key, eqn in var_eqn_dict.items()}
@@ -24,7 +24,8 @@ class Jacobian(object):
 
     def jac(self, symbol, variable):
         """
-        This function recurses down the tree, computing the Jacobian using
+        This function walks down the tree (without recursion, see
+        :func:`pybamm.transform_symbol`), computing the Jacobian using
         the Jacobians defined in classes derived from pybamm.Symbol. E.g. the
         Jacobian of a 'pybamm.Multiplication' is computed via the product rule.
         If the Jacobian of a symbol has already been calculated, the stored value
@@ -48,9 +49,9 @@ class Jacobian(object):
         try:
             return self._known_jacs[symbol]
         except KeyError:
-            jac = self._jac(symbol, variable)
-            self._known_jacs[symbol] = jac
-            return jac
+            return pybamm.transform_symbol(
+                symbol, lambda node: self._jac(node, variable), self._known_jacs
+            )
 
     def _jac(self, symbol, variable):
         """See :meth:`Jacobian.jac()`."""
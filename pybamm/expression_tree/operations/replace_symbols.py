@@ -0,0 +1,128 @@
+#
+# Helper class to replace symbols in an expression tree
+#
+import pybamm
+
+
+class SymbolReplacer(object):
+    """
+    Helper class to replace some symbols in a (set of) symbol(s) by other symbols.
+    Only the branches of the expression tree that contain a symbol to be replaced
+    are rebuilt; all other branches are reused as they are. Uses caching to speed up
+    the process.
+
+    Parameters
+    ----------
+    symbol_replacement_map : dict of :class:`pybamm.Symbol` -> :class:`pybamm.Symbol`
+        Map of which symbols should be replaced by which
+    dependent_symbols : dict, optional
+        Cache of whether each symbol contains one of the symbols to be replaced. Can
+        be shared between replacers whose replacement maps have the same keys, so that
+        the (full) tree traversal only needs to happen once.
+    """
+
+    def __init__(self, symbol_replacement_map, dependent_symbols=None):
+        self._symbol_replacement_map = symbol_replacement_map
+        if dependent_symbols is None:
+            dependent_symbols = {}
+        self._dependent_symbols = dependent_symbols
+        self._replaced_symbols = {}
+
+    def depends_on_replaced_symbols(self, symbol):
+        """
+        Check whether a symbol contains any of the symbols to be replaced.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol to check
+
+        Returns
+        -------
+        bool
+            Whether `symbol` depends on any of the symbols to be replaced
+        """
+        try:
+            return self._dependent_symbols[symbol]
+        except KeyError:
+            if symbol in self._symbol_replacement_map:
+                dependent = True
+            else:
+                dependent = any(
+                    self.depends_on_replaced_symbols(child) for child in symbol.children
+                )
+            self._dependent_symbols[symbol] = dependent
+            return dependent
+
+    def process_symbol(self, symbol):
+        """
+        Replace the symbols in a symbol's expression tree.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol in which to replace symbols
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            The new symbol, or `symbol` itself if it doesn't contain any of the
+            symbols to be replaced
+        """
+        if not self.depends_on_replaced_symbols(symbol):
+            return symbol
+        try:
+            return self._replaced_symbols[symbol]
+        except KeyError:
+            replaced_symbol = self._process_symbol(symbol)
+            # Keep the meshes assigned to discretised symbols, which are needed to
+            # post-process variables
+            for attr in ["mesh", "secondary_mesh"]:
+                if hasattr(symbol, attr):
+                    setattr(replaced_symbol, attr, getattr(symbol, attr))
+            self._replaced_symbols[symbol] = replaced_symbol
+            return replaced_symbol
+
+    def _process_symbol(self, symbol):
+        """See :meth:`SymbolReplacer.process_symbol()`."""
+        if symbol in self._symbol_replacement_map:
+            return self._symbol_replacement_map[symbol]
+
+        new_children = [self.process_symbol(child) for child in symbol.children]
+        if isinstance(symbol, pybamm.BinaryOperator):
+            new_symbol = symbol._binary_new_copy(*new_children)
+        elif isinstance(symbol, pybamm.UnaryOperator):
+            new_symbol = symbol._unary_new_copy(*new_children)
+        elif isinstance(symbol, pybamm.Function):
+            return symbol._function_new_copy(new_children)
+        elif isinstance(symbol, pybamm.Concatenation):
+            return symbol._concatenation_new_copy(new_children)
+        else:
+            raise NotImplementedError(
+                f"Cannot replace symbols inside a symbol of type '{type(symbol)}'"
+            )
+
+        # ensure domain remains the same, without modifying a child that was returned
+        # by the simplification as it may be shared with other expressions
+        if new_symbol.domains != symbol.domains:
+            if any(new_symbol is child for child in new_children):
+                new_symbol = new_symbol.create_copy()
+            new_symbol.copy_domains(symbol)
+        return new_symbol
+
+    def process_dict(self, var_eqn_dict):
+        """
+        Replace the symbols in each value of a dictionary.
+
+        Parameters
+        ----------
+        var_eqn_dict : dict
+            Equation dictionary with keys as variables (or variable names) and values
+            as equations
+
+        Returns
+        -------
+        new_var_eqn_dict : dict
+            Dictionary with the same keys and the processed equations as values
+        """
+        return {key: self.process_symbol(eqn) for key, eqn in var_eqn_dict.items()}
@@ -0,0 +1,151 @@
+#
+# Sparse Jacobians evaluated by compressed forward passes over a column colouring
+#
+import numbers
+
+import casadi
+import numpy as np
+from scipy import sparse
+
+
+def jacobian_sparsity(symbol, n_states, inputs=None):
+    """
+    Find the structural sparsity pattern of the Jacobian of a symbol with respect to
+    the state vector, by converting the symbol to casadi and propagating the sparsity
+    through the casadi graph (no derivatives are calculated).
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The (discretised) symbol
+    n_states : int
+        The size of the state vector
+    inputs : dict, optional
+        Values of the input parameters of the symbol, used to find their sizes
+
+    Returns
+    -------
+    :class:`scipy.sparse.csc_matrix`
+        The sparsity pattern of the Jacobian, with ones at the structural nonzeros
+    """
+    inputs = inputs or {}
+    t = casadi.MX.sym("t")
+    y = casadi.MX.sym("y", n_states)
+    p = {}
+    for name, value in inputs.items():
+        if isinstance(value, numbers.Number):
+            p[name] = casadi.MX.sym(name)
+        else:
+            p[name] = casadi.MX.sym(name, value.shape[0])
+    expression = symbol.to_casadi(t, y, inputs=p)
+    pattern = casadi.jacobian_sparsity(expression, y)
+    colptrs, rows = pattern.get_ccs()
+    return sparse.csc_matrix(
+        (np.ones(len(rows)), rows, colptrs), shape=(pattern.size1(), n_states)
+    )
+
+
+def colour_columns(sparsity):
+    """
+    Colour the columns of a sparsity pattern so that no two columns with the same
+    colour have a nonzero in the same row (greedy colouring of the column
+    intersection graph, in the natural order of the columns). All the columns with
+    the same colour can then be found with a single directional derivative (or
+    finite difference), in the direction of the sum of their unit vectors.
+
+    Parameters
+    ----------
+    sparsity : :class:`scipy.sparse.spmatrix`
+        The sparsity pattern
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The colour of each column, numbered from 0
+    """
+    pattern = sparse.csc_matrix(sparsity, dtype=bool).astype(np.int8)
+    n_columns = pattern.shape[1]
+    # columns that have a nonzero in a common row must have different colours
+    intersections = sparse.csr_matrix(pattern.T @ pattern)
+    indptr, indices = intersections.indptr, intersections.indices
+    colours = np.full(n_columns, -1)
+    # forbidden[c] == j if colour c is used by a neighbour of column j; the last
+    # entry catches the neighbours that are not coloured yet (colour -1)
+    forbidden = np.full(n_columns + 1, -1)
+    n_colours = 0
+    for j in range(n_columns):
+        forbidden[colours[indices[indptr[j] : indptr[j + 1]]]] = j
+        colour = np.argmax(forbidden[: n_colours + 1] != j)
+        colours[j] = colour
+        n_colours = max(n_colours, colour + 1)
+    return colours
+
+
+class ColouredJacobian:
+    """
+    Evaluates the sparse Jacobian of a function with respect to the state vector
+    with one forward pass per colour of a column colouring of its sparsity pattern
+    (see :func:`pybamm.colour_columns`), instead of one per column. Each pass gives
+    the sum of the columns of a colour, which have no nonzero rows in common, so the
+    Jacobian can be read off from the compressed passes.
+
+    The passes are Jacobian-vector products if `jvp` is given (e.g. for jax
+    evaluators), which are exact, or forward finite differences otherwise.
+
+    Parameters
+    ----------
+    function : callable
+        The function, called as `function(t, y, inputs)`
+    sparsity : :class:`scipy.sparse.spmatrix`
+        The sparsity pattern of the Jacobian, e.g. from
+        :func:`pybamm.jacobian_sparsity`
+    jvp : callable, optional
+        The Jacobian-vector product of the function, called as
+        `jvp(t, y, v, inputs)`
+    """
+
+    def __init__(self, function, sparsity, jvp=None):
+        self._function = function
+        self._jvp = jvp
+        pattern = sparse.csr_matrix(sparsity, dtype=bool)
+        pattern.sort_indices()
+        self.shape = pattern.shape
+        self._indices = pattern.indices
+        self._indptr = pattern.indptr
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(pattern.indptr))
+
+        self.colours = colour_columns(pattern)
+        self.n_colours = self.colours.max() + 1 if self.shape[1] > 0 else 0
+        # the pass in which each nonzero is found
+        self._nonzero_colours = self.colours[self._indices]
+        self._seeds = np.zeros((self.shape[1], self.n_colours))
+        self._seeds[np.arange(self.shape[1]), self.colours] = 1
+
+    def __call__(self, t=None, y=None, inputs=None):
+        y = np.asarray(y, dtype=float).reshape(-1)
+        if self._jvp is not None:
+            compressed = np.column_stack(
+                [
+                    np.asarray(self._jvp(t, y, seed, inputs)).reshape(-1)
+                    for seed in self._seeds.T
+                ]
+            )
+            data = compressed[self._rows, self._nonzero_colours]
+        else:
+            # forward differences, with the usual step size for each state
+            steps = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y), 1)
+            f0 = self._evaluate(t, y, inputs)
+            compressed = np.empty((self.shape[0], self.n_colours))
+            for colour, seed in enumerate(self._seeds.T):
+                y_step = y + steps * seed
+                # use the step that is actually taken, after rounding
+                steps[seed == 1] = y_step[seed == 1] - y[seed == 1]
+                compressed[:, colour] = self._evaluate(t, y_step, inputs) - f0
+            data = compressed[self._rows, self._nonzero_colours] / steps[self._indices]
+        return sparse.csr_matrix((data, self._indices, self._indptr), shape=self.shape)
+
+    def _evaluate(self, t, y, inputs):
+        value = self._function(t, y, inputs)
+        if sparse.issparse(value):
+            value = value.toarray()
+        return np.asarray(value).reshape(-1)
@@ -0,0 +1,98 @@
+#
+# Iterative traversal of expression trees
+#
+
+
+def pre_order(symbol):
+    """
+    Step through the nodes of an expression tree in pre-order (each node before its
+    children, children from left to right), without recursion. A node that appears
+    several times in the tree is visited each time it appears.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The root of the expression tree
+
+    Yields
+    ------
+    :class:`pybamm.Symbol`
+        The nodes of the expression tree
+    """
+    stack = [symbol]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+def post_order(symbol, visited=None, expand=None):
+    """
+    Step through the unique nodes of an expression tree in post-order (each node
+    after its children, children from left to right), without recursion. The tree is
+    treated as a directed acyclic graph: a node that appears several times (i.e.
+    several nodes with the same id) is only visited once, the first time it appears.
+    This is the order in which a recursive pass that caches its result for each
+    symbol processes the nodes.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The root of the expression tree
+    visited : container, optional
+        Nodes that should not be visited, nor their children (e.g. the cache of a
+        pass, which holds the nodes that have already been processed). Checked as the
+        traversal goes, so nodes added to it during the traversal are skipped too.
+    expand : callable, optional
+        Function of a node that returns whether to visit the children of the node.
+        Default is to visit the children of every node.
+
+    Yields
+    ------
+    :class:`pybamm.Symbol`
+        The unique nodes of the expression tree
+    """
+    if visited is None:
+        visited = ()
+    seen = set()
+    stack = [(symbol, False)]
+    while stack:
+        node, children_visited = stack.pop()
+        if children_visited:
+            if node not in visited:
+                yield node
+        elif node not in seen and node not in visited:
+            seen.add(node)
+            stack.append((node, True))
+            if expand is None or expand(node):
+                stack.extend((child, False) for child in reversed(node.children))
+
+
+def transform_symbol(symbol, transform, cache, expand=None):
+    """
+    Apply a transformation to each unique node of an expression tree that is not
+    already in `cache`, children first, without recursion, and store the results in
+    `cache`. When a node is transformed, the results for its (expanded) children are
+    already in `cache`, so passes written recursively (calling themselves on the
+    children of a node and caching the results) only ever recurse one level deep.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The root of the expression tree
+    transform : callable
+        Function of a node that returns the transformed node
+    cache : dict
+        The transformed nodes, keyed by node. Updated in place.
+    expand : callable, optional
+        Function of a node that returns whether to transform the children of the node
+        before the node itself. Default is to transform the children of every node.
+
+    Returns
+    -------
+    object
+        The transformed `symbol`
+    """
+    for node in post_order(symbol, cache, expand):
+        cache[node] = transform(node)
+    return cache[symbol]
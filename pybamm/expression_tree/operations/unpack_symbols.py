@@ -1,6 +1,7 @@
 #
 # Helper function to unpack a symbol
 #
+import pybamm
 
 
 class SymbolUnpacker(object):
@@ -43,7 +44,8 @@ class SymbolUnpacker(object):
 
     def unpack_symbol(self, symbol):
         """
-        This function recurses down the tree, unpacking the symbols and saving the ones
+        This function walks down the tree (without recursion, see
+        :func:`pybamm.transform_symbol`), unpacking the symbols and saving the ones
         that have a class in `self.classes_to_find`.
 
         Parameters
@@ -60,9 +62,13 @@ class SymbolUnpacker(object):
         try:
             return self._unpacked_symbols[symbol]
         except KeyError:
-            unpacked = self._unpack(symbol)
-            self._unpacked_symbols[symbol] = unpacked
-            return unpacked
+            return pybamm.transform_symbol(
+                symbol, self._unpack, self._unpacked_symbols, expand=self._expand
+            )
+
+    def _expand(self, symbol):
+        # no need to look inside the symbols of the right class
+        return not isinstance(symbol, self.classes_to_find)
 
     def _unpack(self, symbol):
         """See :meth:`SymbolUnpacker.unpack()`."""
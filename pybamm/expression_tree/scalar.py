@@ -6,6 +6,7 @@ import numpy as np
 import pybamm
 from pybamm.util import have_optional_dependency
 
+
 class Scalar(pybamm.Symbol):
     """
     A node in the expression tree representing a scalar value.
@@ -55,6 +56,10 @@ class Scalar(pybamm.Symbol):
         """See :meth:`pybamm.Symbol._base_evaluate()`."""
         return self._value
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return ()
+
     def _jac(self, variable):
         """See :meth:`pybamm.Symbol._jac()`."""
         return pybamm.Scalar(0)
@@ -194,6 +194,10 @@ class StateVectorBase(pybamm.Symbol):
         """
         return np.nan * np.ones((self.size, 1))
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return (self.size, 1)
+
 
 class StateVector(StateVectorBase):
     """
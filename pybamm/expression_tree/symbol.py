@@ -509,7 +509,8 @@ class Symbol:
 
     def pre_order(self):
         """
-        returns an iterable that steps through the tree in pre-order fashion.
+        returns an iterable that steps through the tree in pre-order fashion
+        (see :func:`pybamm.pre_order`).
 
         Examples
         --------
@@ -523,8 +524,7 @@ class Symbol:
         a
         b
         """
-        anytree = have_optional_dependency("anytree")
-        return anytree.PreOrderIter(self)
+        return pybamm.pre_order(self)
 
     def __str__(self):
         """return a string representation of the node and its children."""
@@ -912,7 +912,22 @@ class Symbol:
     @cached_property
     def shape(self):
         """
-        Shape of an object, found by evaluating it with appropriate t and y.
+        Shape of an object, inferred from the shapes of its children where possible
+        (see :meth:`Symbol._infer_shape`) and otherwise found by evaluating it with
+        appropriate t and y. In debug mode, inferred shapes are checked against the
+        evaluated shapes.
+        """
+        try:
+            shape = self._infer_shape([child.shape for child in self.children])
+        except NotImplementedError:
+            return self._evaluate_shape()
+        if pybamm.settings.debug_mode is True:
+            self._check_inferred_shape(shape, self._evaluate_shape())
+        return shape
+
+    def _evaluate_shape(self):
+        """
+        Find the shape of an object by evaluating it with appropriate t and y.
         """
         # Default behaviour is to try to evaluate the object directly
         # Try with some large y, to avoid having to unpack (slow)
@@ -936,6 +951,27 @@ class Symbol:
         else:
             return evaluated_self.shape
 
+    def _infer_shape(self, children_shapes):
+        """
+        Infer the shape of the object from the shapes of its children, without
+        evaluating it. Raises NotImplementedError if the shape cannot be inferred, in
+        which case it is found by evaluation instead.
+
+        Parameters
+        ----------
+        children_shapes : list of tuple
+            The shapes of the children of the object
+        """
+        raise NotImplementedError
+
+    def _check_inferred_shape(self, inferred_shape, evaluated_shape):
+        """Check that an inferred shape matches the shape found by evaluation."""
+        if tuple(inferred_shape) != tuple(evaluated_shape):
+            raise pybamm.ShapeError(
+                f"Inferred shape {inferred_shape} of {self!r} does not match its "
+                f"evaluated shape {evaluated_shape}"
+            )
+
     @property
     def size_for_testing(self):
         """Size of an object, based on shape for testing."""
@@ -946,8 +982,27 @@ class Symbol:
         """
         Shape of an object for cases where it cannot be evaluated directly. If a symbol
         cannot be evaluated directly (e.g. it is a `Variable` or `Parameter`), it is
-        instead given an arbitrary domain-dependent shape.
+        instead given an arbitrary domain-dependent shape. The shape is inferred from
+        the shapes of the children where possible (see :meth:`Symbol._infer_shape`).
         """
+        try:
+            return self._saved_shape_for_testing
+        except AttributeError:
+            pass
+        try:
+            shape = self._infer_shape(
+                [child.shape_for_testing for child in self.children]
+            )
+        except NotImplementedError:
+            shape = self._evaluate_shape_for_testing()
+        else:
+            if pybamm.settings.debug_mode is True:
+                self._check_inferred_shape(shape, self._evaluate_shape_for_testing())
+        self._saved_shape_for_testing = shape
+        return shape
+
+    def _evaluate_shape_for_testing(self):
+        """Find the shape for testing by evaluating the object for shape."""
         evaluated_self = self.evaluate_for_shape()
         if isinstance(evaluated_self, numbers.Number):
             return ()
@@ -55,6 +55,17 @@ class UnaryOperator(pybamm.Symbol):
             f"{self.__class__} does not implement _unary_evaluate."
         )
 
+    def _infer_shape(self, children_shapes):
+        """See :meth:`pybamm.Symbol._infer_shape()`."""
+        return self._unary_shape(children_shapes[0])
+
+    def _unary_shape(self, child_shape):
+        """
+        Infer the shape of the result of the unary operation from the shape of the
+        child. By default, the operation is element-wise, so the shape is unchanged.
+        """
+        return child_shape
+
     def evaluate(self, t=None, y=None, y_dot=None, inputs=None):
         """See :meth:`pybamm.Symbol.evaluate()`."""
         child = self.child.evaluate(t, y, y_dot, inputs)
@@ -73,7 +84,11 @@ class UnaryOperator(pybamm.Symbol):
 
     def is_constant(self):
         """See :meth:`pybamm.Symbol.is_constant()`."""
-        return self.child.is_constant()
+        try:
+            return self._saved_is_constant
+        except AttributeError:
+            self._saved_is_constant = self.child.is_constant()
+            return self._saved_is_constant
 
     def _sympy_operator(self, child):
         """Apply appropriate SymPy operators."""
@@ -311,6 +326,13 @@ class Index(UnaryOperator):
     def _evaluate_for_shape(self):
         return self._unary_evaluate(self.children[0].evaluate_for_shape())
 
+    def _unary_shape(self, child_shape):
+        """See :meth:`pybamm.UnaryOperator._unary_shape()`."""
+        if len(child_shape) == 0:
+            raise NotImplementedError
+        size = len(range(*self.slice.indices(child_shape[0])))
+        return (size, *child_shape[1:])
+
     def _evaluates_on_edges(self, dimension):
         """See :meth:`pybamm.Symbol._evaluates_on_edges()`."""
         return False
@@ -338,6 +360,11 @@ class SpatialOperator(UnaryOperator):
     def __init__(self, name, child, domains=None):
         super().__init__(name, child, domains)
 
+    def _unary_shape(self, child_shape):
+        """See :meth:`pybamm.UnaryOperator._unary_shape()`."""
+        # The shape depends on the discretisation
+        raise NotImplementedError
+
 
 class Gradient(SpatialOperator):
     """
@@ -921,6 +948,10 @@ class ExplicitTimeIntegral(UnaryOperator):
     def _unary_new_copy(self, child):
         return self.__class__(child, self.initial_condition)
 
+    def _unary_shape(self, child_shape):
+        """See :meth:`pybamm.UnaryOperator._unary_shape()`."""
+        raise NotImplementedError
+
     def is_constant(self):
         return False
 
@@ -75,6 +75,12 @@ class BaseModel:
         solver set up.
     use_jacobian : bool
         Whether to use the Jacobian when solving the model (default is True).
+    use_jacobian_colouring : bool
+        Whether to evaluate the Jacobian of a model converted to python or jax from
+        its sparsity pattern, with one forward pass per colour of a column colouring
+        (see :class:`pybamm.ColouredJacobian`), instead of building it symbolically
+        (python) or densely (jax). Faster to build and to evaluate for large meshes.
+        The python passes are finite differences. Default is False.
     convert_to_format : str
         Whether to convert the expression trees representing the rhs and
         algebraic equations, Jacobain (if using) and events into a different format:
@@ -88,6 +94,10 @@ class BaseModel:
         Default is "casadi".
     """
 
+    # Orders in which the coupled variables of the submodels were found, for each
+    # model class, set of options and set of submodels (see `build_coupled_variables`)
+    _coupled_variables_orders = {}
+
     def __init__(self, name="Unnamed model"):
         self.name = name
         self._options = {}
@@ -117,6 +127,7 @@ class BaseModel:
 
         # Default behaviour is to use the jacobian
         self.use_jacobian = True
+        self.use_jacobian_colouring = False
         self.convert_to_format = "casadi"
 
         # Model is not initially discretised
@@ -421,6 +432,45 @@ class BaseModel:
         new_model._variables_casadi = self._variables_casadi.copy()
         return new_model
 
+    def intern_symbols(self, interner=None):
+        """
+        Intern the expression trees of the model in place, so that structurally
+        identical subtrees (e.g. built separately by different submodels) are held in
+        memory only once. See :class:`pybamm.SymbolInterner`.
+
+        Parameters
+        ----------
+        interner : :class:`pybamm.SymbolInterner`, optional
+            The interner to use, e.g. to share the interning table between models.
+            Default is a new interner.
+        """
+        if interner is None:
+            interner = pybamm.SymbolInterner()
+        self.rhs = interner.intern_dict(self.rhs)
+        self.algebraic = interner.intern_dict(self.algebraic)
+        self.initial_conditions = interner.intern_dict(self.initial_conditions)
+        self.boundary_conditions = {
+            var: {
+                side: (interner.intern_symbol(eqn), typ)
+                for side, (eqn, typ) in bcs.items()
+            }
+            for var, bcs in self.boundary_conditions.items()
+        }
+        self.variables = interner.intern_dict(self.variables)
+        self.events = [
+            pybamm.Event(
+                event.name, interner.intern_symbol(event.expression), event.event_type
+            )
+            for event in self.events
+        ]
+        for attr in [
+            "_concatenated_rhs",
+            "_concatenated_algebraic",
+            "_concatenated_initial_conditions",
+        ]:
+            if getattr(self, attr) is not None:
+                setattr(self, attr, interner.intern_symbol(getattr(self, attr)))
+
     def update(self, *submodels):
         """
         Update model to add new physics from submodels
@@ -460,15 +510,22 @@ class BaseModel:
         # order they are set by the user. If this fails for a particular submodel,
         # return to it later and try again. If setting coupled variables fails and
         # there are no more submodels to try, raise an error.
-        submodels = list(self.submodels.keys())
+        # The order in which the submodels succeed is an order of their dependencies
+        # on each other's variables, which is cached so that models with the same
+        # class, options and submodels get the coupled variables in a single pass.
+        key = self._coupled_variables_order_key()
+        order = self._coupled_variables_orders.get(key, list(self.submodels.keys()))
+        submodels = list(order)
+        found = []
         count = 0
         # For this part the FuzzyDict of variables is briefly converted back into a
         # normal dictionary for speed with KeyErrors
         self._variables = dict(self._variables)
         while len(submodels) > 0:
             count += 1
-            for submodel_name, submodel in self.submodels.items():
+            for submodel_name in order:
                 if submodel_name in submodels:
+                    submodel = self.submodels[submodel_name]
                     pybamm.logger.debug(
                         "Getting coupled variables for {} submodel ({})".format(
                             submodel_name, self.name
@@ -479,12 +536,13 @@ class BaseModel:
                             submodel.get_coupled_variables(self.variables)
                         )
                         submodels.remove(submodel_name)
-                    except KeyError as key:
+                        found.append(submodel_name)
+                    except KeyError as missing:
                         if len(submodels) == 1 or count == 100:
                             # no more submodels to try
                             raise pybamm.ModelError(
                                 "Missing variable for submodel '{}': {}.\n".format(
-                                    submodel_name, key
+                                    submodel_name, missing
                                 )
                                 + "Check the selected "
                                 "submodels provide all of the required variables."
@@ -493,12 +551,33 @@ class BaseModel:
                             # try setting coupled variables on next loop through
                             pybamm.logger.debug(
                                 "Can't find {}, trying other submodels first".format(
-                                    key
+                                    missing
                                 )
                             )
+        if key is not None:
+            self._coupled_variables_orders[key] = found
         # Convert variables back into FuzzyDict
         self.variables = pybamm.FuzzyDict(self._variables)
 
+    def _coupled_variables_order_key(self):
+        """
+        Return the key of the cached order of the submodels for the coupled
+        variables, or None if the options cannot be hashed.
+        """
+        options = self.options
+        if isinstance(options, dict):
+            options = tuple(options.items())
+        key = (
+            type(self),
+            options,
+            tuple((name, type(submodel)) for name, submodel in self.submodels.items()),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def build_model_equations(self):
         # Set model equations
         for submodel_name, submodel in self.submodels.items():
@@ -1003,12 +1003,21 @@ def theoretical_energy_integral(parameter_values, inputs, points=100):
     y = pybamm.standard_spatial_vars.y
     z = pybamm.standard_spatial_vars.z
     T = pybamm.yz_average(param.T_amb(y, z, 0))
+    # Process the OCV once with the stoichiometries as inputs, rather than for each
+    # stoichiometry, so that the same symbols are processed (and cached) every call.
+    # The names of the inputs are specific to this function, so that they cannot
+    # be confused with the input parameters of a model.
+    sto_n_name = "Negative electrode stoichiometry (theoretical energy)"
+    sto_p_name = "Positive electrode stoichiometry (theoretical energy)"
+    sto_n = pybamm.InputParameter(sto_n_name)
+    sto_p = pybamm.InputParameter(sto_p_name)
+    ocv = parameter_values.process_symbol(
+        param.p.prim.U(sto_p, T) - param.n.prim.U(sto_n, T)
+    )
     Vs = np.empty(x_vals.shape)
     for i in range(x_vals.size):
-        Vs[i] = (
-            parameter_values.evaluate(param.p.prim.U(y_vals[i], T)).item()
-            - parameter_values.evaluate(param.n.prim.U(x_vals[i], T)).item()
-        )
+        inputs = {sto_n_name: x_vals[i], sto_p_name: y_vals[i]}
+        Vs[i] = ocv.evaluate(inputs=inputs).item()
     # Calculate dQ
     Q = Q_p * (y_0 - y_100)
     dQ = Q / (points - 1)
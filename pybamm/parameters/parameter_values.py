@@ -588,10 +588,27 @@ class ParameterValues:
         try:
             return self._processed_symbols[symbol]
         except KeyError:
-            processed_symbol = self._process_symbol(symbol)
-            self._processed_symbols[symbol] = processed_symbol
+            # Process the children first, without recursion, so that processing each
+            # symbol only recurses one level down
+            return pybamm.transform_symbol(
+                symbol,
+                self._process_symbol,
+                self._processed_symbols,
+                expand=self._processes_children,
+            )
 
-            return processed_symbol
+    @staticmethod
+    def _processes_children(symbol):
+        """Whether processing a symbol always processes all of its children."""
+        return isinstance(
+            symbol,
+            (
+                pybamm.BinaryOperator,
+                pybamm.UnaryOperator,
+                pybamm.Function,
+                pybamm.Concatenation,
+            ),
+        )
 
     def _process_symbol(self, symbol):
         """See :meth:`ParameterValues.process_symbol()`."""
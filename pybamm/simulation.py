@@ -1,16 +1,44 @@
 #
 # Simulation class
 #
+import copy
 import pickle
+import numbers
 import pybamm
 import numpy as np
 import warnings
 import sys
 from functools import lru_cache
+from itertools import product
 from datetime import timedelta
 from pybamm.util import have_optional_dependency
 
 
+def _experiment_step_placeholder(name):
+    """
+    Input parameter standing in for a parameter whose value changes between
+    experiment steps that share the same model structure.
+    """
+    return pybamm.InputParameter(f"{name} [experiment step]")
+
+
+def _get_sweep_inputs(parameters, permutations):
+    """
+    Get the inputs for each solve of a parameter sweep (see
+    :meth:`Simulation.sweep`), as a list of dictionaries.
+    """
+    names = list(parameters)
+    values = [list(np.atleast_1d(parameters[name])) for name in names]
+    if permutations:
+        return [dict(zip(names, values_i)) for values_i in product(*values)]
+    if len({len(values_i) for values_i in values}) > 1:
+        raise ValueError(
+            "All the swept parameters must be given the same number of values if "
+            "permutations=False"
+        )
+    return [dict(zip(names, values_i)) for values_i in zip(*values)]
+
+
 def is_notebook():
     try:
         shell = get_ipython().__class__.__name__
@@ -58,6 +86,26 @@ class Simulation:
         A list of variables to plot automatically
     C_rate: float (optional)
         The C-rate at which you would like to run a constant current (dis)charge.
+    share_experiment_structure: bool (optional)
+        Whether to parameterise and discretise the model once for each type of
+        experiment step (current, voltage or power control), and derive the model for
+        each unique step by only replacing the step value, temperatures and events.
+        This makes building experiments with many distinct steps much faster.
+        Falls back to processing each step separately if the step values or
+        temperatures are not scalars. Default is False.
+    generic_experiment_steps: bool (optional)
+        Whether to keep the step value, temperatures and termination thresholds of
+        the experiment steps as input parameters, so that all the steps with the same
+        type (current, voltage or power control) and the same kind of termination
+        events share one built model and one solver, which only need to be set up
+        once. Steps whose value is not a scalar (e.g. drive cycles) get their own
+        model. Implies `share_experiment_structure`. Default is False.
+    build_cache: :class:`pybamm.BuildCache` or str (optional)
+        An on-disk cache (or the directory of a cache) of built models. If given,
+        the built model (and, once solved, the solver set-up) is loaded from the
+        cache when another simulation with the same model, parameter values, mesh
+        and spatial methods has already been built, and saved to the cache
+        otherwise. Only used for simulations without an experiment. Default is None.
     """
 
     def __init__(
@@ -72,6 +120,9 @@ class Simulation:
         solver=None,
         output_variables=None,
         C_rate=None,
+        share_experiment_structure=False,
+        generic_experiment_steps=False,
+        build_cache=None,
     ):
         self._parameter_values = parameter_values or model.default_parameter_values
         self._unprocessed_parameter_values = self._parameter_values
@@ -121,6 +172,11 @@ class Simulation:
         self._spatial_methods = spatial_methods or self._model.default_spatial_methods
         self._solver = solver or self._model.default_solver
         self._output_variables = output_variables
+        self._share_experiment_structure = share_experiment_structure
+        self._generic_experiment_steps = generic_experiment_steps
+        if isinstance(build_cache, str):
+            build_cache = pybamm.BuildCache(build_cache)
+        self._build_cache = build_cache
 
         # Initialize empty built states
         self._model_with_set_params = None
@@ -128,8 +184,12 @@ class Simulation:
         self._built_initial_soc = None
         self.op_conds_to_built_models = None
         self.op_conds_to_built_solvers = None
+        self.op_conds_to_step_inputs = None
+        self._experiment_template_models = None
         self._mesh = None
         self._disc = None
+        self._build_cache_key = None
+        self._build_cache_set_up_key = None
         self._solution = None
         self.quick_plot = None
 
@@ -205,46 +265,25 @@ class Simulation:
 
         This increases set-up time since several models to be processed, but
         reduces simulation time since the model formulation is efficient.
+
+        If the structure of the model is shared between steps (see
+        `share_experiment_structure`), only one model is created and parameterised
+        for each type of step, and the models for each step are derived from it after
+        discretisation in :meth:`Simulation.build_for_experiment`.
         """
         self.experiment_unique_steps_to_model = {}
-        for op_number, op in enumerate(self.experiment.unique_steps):
-            new_model = self._model.new_copy()
-            new_parameter_values = self._parameter_values.copy()
+        self._original_temperature = self._parameter_values["Ambient temperature [K]"]
+        if (
+            self._share_experiment_structure or self._generic_experiment_steps
+        ) and self._can_share_experiment_structure():
+            self.set_up_and_parameterise_template_models_for_experiment()
+            return
 
-            if op.type != "current":
-                # Voltage or power control
-                # Create a new model where the current density is now a variable
-                # To do so, we replace all instances of the current density in the
-                # model with a current density variable, which is obtained from the
-                # FunctionControl submodel
-                # check which kind of external circuit model we need (differential
-                # or algebraic)
-                if op.type == "voltage":
-                    submodel_class = pybamm.external_circuit.VoltageFunctionControl
-                elif op.type == "power":
-                    submodel_class = pybamm.external_circuit.PowerFunctionControl
-
-                # Build the new submodel and update the model with it
-                submodel = submodel_class(new_model.param, new_model.options)
-                variables = new_model.variables
-                submodel.variables = submodel.get_fundamental_variables()
-                variables.update(submodel.variables)
-                submodel.variables.update(submodel.get_coupled_variables(variables))
-                variables.update(submodel.variables)
-                submodel.set_rhs(variables)
-                submodel.set_algebraic(variables)
-                submodel.set_initial_conditions(variables)
-                new_model.rhs.update(submodel.rhs)
-                new_model.algebraic.update(submodel.algebraic)
-                new_model.initial_conditions.update(submodel.initial_conditions)
-
-                # Set the "current function" to be the variable defined in the submodel
-                new_parameter_values["Current function [A]"] = submodel.variables[
-                    "Current [A]"
-                ]
+        self._experiment_template_models = None
+        for op_number, op in enumerate(self.experiment.unique_steps):
+            new_model, new_parameter_values = self._new_model_for_step_type(op.type)
             self.update_new_model_events(new_model, op)
             # Update parameter values
-            self._original_temperature = new_parameter_values["Ambient temperature [K]"]
             experiment_parameter_values = self.get_experiment_parameter_values(
                 op, op_number
             )
@@ -261,7 +300,6 @@ class Simulation:
             new_model = self._model.new_copy()
             # Update parameter values
             new_parameter_values = self._parameter_values.copy()
-            self._original_temperature = new_parameter_values["Ambient temperature [K]"]
             new_parameter_values.update(
                 {"Current function [A]": 0, "Ambient temperature [K]": "[input]"},
                 check_already_exists=False,
@@ -273,13 +311,132 @@ class Simulation:
                 "Rest for padding"
             ] = parameterised_model
 
-    def update_new_model_events(self, new_model, op):
+    def set_up_and_parameterise_template_models_for_experiment(self):
+        """
+        Create and parameterise one template model for each type of step in the
+        experiment. The parameters that vary between steps (the step value and the
+        temperatures) are replaced by placeholder input parameters, which are
+        replaced by the values for each step once the template has been discretised.
+        """
+        step_types = {op.type: op.unit for op in self.experiment.unique_steps}
+        if self.experiment.initial_start_time:
+            # The rest model used for padding is derived from the current template
+            step_types["current"] = "[A]"
+
+        self._experiment_template_models = {}
+        for step_type, unit in step_types.items():
+            new_model, new_parameter_values = self._new_model_for_step_type(step_type)
+            new_parameter_values.update(
+                {
+                    name: _experiment_step_placeholder(name)
+                    for name in self._get_experiment_step_parameter_names(
+                        step_type, unit
+                    )
+                },
+                check_already_exists=False,
+            )
+            parameterised_model = new_parameter_values.process_model(
+                new_model, inplace=False
+            )
+            self._experiment_template_models[step_type] = (
+                parameterised_model,
+                self._get_experiment_step_parameter_names(step_type, unit),
+            )
+
+    def _new_model_for_step_type(self, step_type):
+        """
+        Create a copy of the model and parameter values for a given type of step
+        ("current", "voltage" or "power"), with the external circuit submodel required
+        for voltage or power control.
+        """
+        new_model = self._model.new_copy()
+        new_parameter_values = self._parameter_values.copy()
+
+        if step_type != "current":
+            # Voltage or power control
+            # Create a new model where the current density is now a variable
+            # To do so, we replace all instances of the current density in the
+            # model with a current density variable, which is obtained from the
+            # FunctionControl submodel
+            # check which kind of external circuit model we need (differential
+            # or algebraic)
+            if step_type == "voltage":
+                submodel_class = pybamm.external_circuit.VoltageFunctionControl
+            elif step_type == "power":
+                submodel_class = pybamm.external_circuit.PowerFunctionControl
+
+            # Build the new submodel and update the model with it
+            submodel = submodel_class(new_model.param, new_model.options)
+            variables = new_model.variables
+            submodel.variables = submodel.get_fundamental_variables()
+            variables.update(submodel.variables)
+            submodel.variables.update(submodel.get_coupled_variables(variables))
+            variables.update(submodel.variables)
+            submodel.set_rhs(variables)
+            submodel.set_algebraic(variables)
+            submodel.set_initial_conditions(variables)
+            new_model.rhs.update(submodel.rhs)
+            new_model.algebraic.update(submodel.algebraic)
+            new_model.initial_conditions.update(submodel.initial_conditions)
+
+            # Set the "current function" to be the variable defined in the submodel
+            new_parameter_values["Current function [A]"] = submodel.variables[
+                "Current [A]"
+            ]
+        return new_model, new_parameter_values
+
+    def _get_experiment_step_parameter_names(self, step_type, unit):
+        """
+        Names of the parameters whose values can differ between steps of a given
+        type.
+        """
+        names = [
+            f"{step_type.capitalize()} function {unit}",
+            "Ambient temperature [K]",
+        ]
+        first_op = next(iter(self.experiment.unique_steps))
+        if first_op.type == step_type and first_op.temperature is not None:
+            names.append("Initial temperature [K]")
+        return names
+
+    def _can_share_experiment_structure(self):
+        """
+        Check whether the models for all steps can be derived from shared templates,
+        i.e. whether all the values that are replaced between steps are scalars.
+        """
+        values = [self._original_temperature]
+        for op in self.experiment.unique_steps:
+            values.append(op.value)
+        if next(iter(self.experiment.unique_steps)).temperature is not None:
+            values.append(self._parameter_values["Initial temperature [K]"])
+
+        for value in values:
+            if isinstance(value, numbers.Number):
+                continue
+            if not isinstance(value, pybamm.Symbol) or value.domain != []:
+                return False
+            if value.has_symbol_of_classes(
+                (pybamm.SpatialVariable, pybamm.Variable, pybamm.StateVector)
+            ):
+                return False
+        return True
+
+    def update_new_model_events(self, new_model, op, generic=False):
+        """
+        Add the termination events of an experiment step to a model. If `generic` is
+        True, the thresholds of the events are input parameters instead of the values
+        given in the step.
+        """
         for term in op.termination:
             if term["type"] == "current":
+                if generic:
+                    value = _experiment_step_placeholder("Current cut-off [A]")
+                else:
+                    value = term["value"]
                 new_model.events.append(
                     pybamm.Event(
                         "Current cut-off [A] [experiment]",
-                        abs(new_model.variables["Current [A]"]) - term["value"],
+                        abs(new_model.variables["Current [A]"]) - value,
                     )
                 )
 
@@ -302,17 +459,17 @@ class Simulation:
                     name = "Discharge"
                 else:
                     name = "Charge"
+                if generic:
+                    value = _experiment_step_placeholder("Voltage cut-off [V]")
+                else:
+                    value = term["value"]
                 if sign != 0:
                     # Event should be positive at initial conditions for both
                     # charge and discharge
                     new_model.events.append(
                         pybamm.Event(
                             f"{name} voltage cut-off [V] [experiment]",
-                            sign
-                            * (
-                                new_model.variables["Battery voltage [V]"]
-                                - term["value"]
-                            ),
+                            sign * (new_model.variables["Battery voltage [V]"] - value),
                         )
                     )
 
@@ -370,6 +527,7 @@ class Simulation:
             self._built_model = None
             self.op_conds_to_built_models = None
             self.op_conds_to_built_solvers = None
+            self.op_conds_to_step_inputs = None
 
         options = self.model.options
         param = self._model.param
@@ -421,15 +579,111 @@ class Simulation:
         elif self._model.is_discretised:
             self._model_with_set_params = self._model
             self._built_model = self._model
+        elif self._load_from_build_cache():
+            # loaded model so clear solver setup
+            self._solver._model_set_up = {}
         else:
             self.set_parameters()
             self._mesh = pybamm.Mesh(self._geometry, self._submesh_types, self._var_pts)
-            self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
+            if self._disc is None:
+                self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
+            else:
+                # Keep the discretised symbols that do not depend on the mesh
+                self._disc = self._disc.remesh(self._mesh)
             self._built_model = self._disc.process_model(
                 self._model_with_set_params, inplace=False, check_model=check_model
             )
             # rebuilt model so clear solver setup
             self._solver._model_set_up = {}
+            if self._build_cache_key is not None:
+                self._save_to_build_cache(set_up_key=None)
+
+    def remesh(self, var_pts=None, submesh_types=None):
+        """
+        Create a simulation of the same model on a new mesh, e.g. for a mesh
+        convergence study. The new simulation reuses the model with set parameters and
+        the processed geometry of this simulation, so that building it skips setting
+        the parameters, but still creates the new mesh and discretises the whole
+        model again, apart from the few symbols that do not depend on the mesh (see
+        :meth:`pybamm.Discretisation.remesh`). Simulations with an experiment are
+        built from scratch.
+
+        Parameters
+        ----------
+        var_pts : dict, optional
+            The number of points used by each spatial variable. Default is the points
+            of this simulation.
+        submesh_types : dict, optional
+            The types of submesh to use on each subdomain. Default is the submesh
+            types of this simulation.
+
+        Returns
+        -------
+        :class:`pybamm.Simulation`
+            The (unbuilt) simulation on the new mesh
+        """
+        if self._model.is_discretised:
+            raise pybamm.ModelError(
+                "Cannot remesh a simulation of a model that is already discretised"
+            )
+        if self.operating_mode != "with experiment":
+            self.set_parameters()
+        new_sim = copy.copy(self)
+        new_sim._var_pts = var_pts or self._var_pts
+        new_sim._submesh_types = submesh_types or self._submesh_types
+        new_sim._solver = self._solver.copy()
+        if self.operating_mode == "with experiment":
+            new_sim.experiment = self.experiment.copy()
+            new_sim._disc = None
+            new_sim._model_with_set_params = None
+            new_sim._experiment_template_models = None
+        # Reset the built states
+        new_sim._built_model = None
+        new_sim.op_conds_to_built_models = None
+        new_sim.op_conds_to_built_solvers = None
+        new_sim.op_conds_to_step_inputs = None
+        new_sim._mesh = None
+        new_sim._build_cache_key = None
+        new_sim._build_cache_set_up_key = None
+        new_sim._solution = None
+        new_sim.quick_plot = None
+        return new_sim
+
+    def _load_from_build_cache(self):
+        """
+        Load the built model and mesh from the build cache, if there is an entry for
+        this simulation. Returns whether an entry was loaded.
+        """
+        self._build_cache_key = None
+        # Models in the python format cannot be pickled
+        if self._build_cache is None or self._model.convert_to_format != "casadi":
+            return False
+        self._build_cache_key = self._build_cache.get_simulation_key(self)
+        if self._build_cache_key is None:
+            return False
+        entry = self._build_cache.load(self._build_cache_key)
+        if entry is None:
+            return False
+        self._parameter_values.process_geometry(self._geometry)
+        self._built_model = entry["built_model"]
+        self._mesh = entry["mesh"]
+        self._build_cache_set_up_key = entry["set_up_key"]
+        return True
+
+    def _save_to_build_cache(self, set_up_key):
+        """
+        Save the built model and mesh to the build cache, along with the key of the
+        solver set-up stored on the built model (if any).
+        """
+        self._build_cache_set_up_key = set_up_key
+        self._build_cache.save(
+            self._build_cache_key,
+            {
+                "built_model": self._built_model,
+                "mesh": self._mesh,
+                "set_up_key": set_up_key,
+            },
+        )
 
     def build_for_experiment(self, check_model=True, initial_soc=None):
         """
@@ -453,19 +707,201 @@ class Simulation:
             # Process all the different models
             self.op_conds_to_built_models = {}
             self.op_conds_to_built_solvers = {}
+            self.op_conds_to_step_inputs = {}
+            if self._experiment_template_models is not None:
+                self.build_experiment_steps_from_templates(check_model=check_model)
+            # Steps that share a (generic) model also share a solver
+            solvers = {}
             for (
                 op_cond,
                 model_with_set_params,
             ) in self.experiment_unique_steps_to_model.items():
-                # It's ok to modify the model with set parameters in place as it's
-                # not returned anywhere
-                built_model = self._disc.process_model(
-                    model_with_set_params, inplace=True, check_model=check_model
-                )
-                solver = self._solver.copy()
-                self.op_conds_to_built_solvers[op_cond] = solver
+                if model_with_set_params.is_discretised:
+                    # Already derived from a discretised template
+                    built_model = model_with_set_params
+                else:
+                    # It's ok to modify the model with set parameters in place as
+                    # it's not returned anywhere
+                    built_model = self._disc.process_model(
+                        model_with_set_params, inplace=True, check_model=check_model
+                    )
+                if id(built_model) not in solvers:
+                    solvers[id(built_model)] = self._solver.copy()
+                self.op_conds_to_built_solvers[op_cond] = solvers[id(built_model)]
                 self.op_conds_to_built_models[op_cond] = built_model
 
+    def build_experiment_steps_from_templates(self, check_model=True):
+        """
+        Discretise the template model for each type of experiment step once, and
+        derive the built model for each unique step by replacing the placeholder
+        parameters in the discretised template with the values for that step and
+        adding the events for that step. The derived models are added to
+        `experiment_unique_steps_to_model`.
+
+        If the experiment steps are generic (see `generic_experiment_steps`), steps
+        with scalar values keep the placeholders (and the termination thresholds) as
+        input parameters, so that all the steps with the same type and termination
+        events share one model, whose inputs are stored in `op_conds_to_step_inputs`.
+        """
+        for step_type, (template, names) in self._experiment_template_models.items():
+            built_template = self._disc.process_model(
+                template, inplace=True, check_model=check_model
+            )
+            # Finding which symbols depend on the placeholders requires a traversal
+            # of the whole model, which is shared between all the derived models
+            dependent_symbols = {}
+            generic_models = {}
+            for op_number, op in enumerate(self.experiment.unique_steps):
+                if op.type != step_type:
+                    continue
+                step_values = self._get_experiment_step_values(
+                    names, self.get_experiment_parameter_values(op, op_number)
+                )
+                if self._generic_experiment_steps and all(
+                    isinstance(value, numbers.Number) for value in step_values.values()
+                ):
+                    # Generic step: share the model with all the similar steps
+                    key = self._get_generic_step_key(op)
+                    if key not in generic_models:
+                        generic_model = built_template.new_copy()
+                        generic_model._input_parameters = None
+                        generic_model.__dict__.pop("_variables_and_events", None)
+                        self.update_new_model_events(generic_model, op, generic=True)
+                        generic_models[key] = generic_model
+                    step_model = generic_models[key]
+                    step_inputs = self._get_generic_step_inputs(op, step_values)
+                else:
+                    step_model = self._derive_experiment_step_model(
+                        built_template, step_values, dependent_symbols
+                    )
+                    self.update_new_model_events(step_model, op)
+                    step_inputs = {}
+                self.experiment_unique_steps_to_model[op.basic_repr()] = step_model
+                self.op_conds_to_step_inputs[op.basic_repr()] = step_inputs
+
+            if step_type == "current" and self.experiment.initial_start_time:
+                step_values = self._get_experiment_step_values(
+                    names,
+                    {
+                        "Current function [A]": 0,
+                        "Ambient temperature [K]": pybamm.InputParameter(
+                            "Ambient temperature [K]"
+                        ),
+                    },
+                )
+                self.experiment_unique_steps_to_model[
+                    "Rest for padding"
+                ] = self._derive_experiment_step_model(
+                    built_template, step_values, dependent_symbols
+                )
+
+    def _get_experiment_step_values(self, names, step_parameter_values):
+        """
+        Values of the parameters that replace the placeholders of a template model,
+        taken from the step's parameter values or the original parameter values.
+        """
+        step_values = {}
+        for name in names:
+            if name in step_parameter_values:
+                step_values[name] = step_parameter_values[name]
+            else:
+                step_values[name] = self._parameter_values[name]
+        return step_values
+
+    def _get_generic_step_key(self, op):
+        """
+        Key identifying the steps that can share a generic model: steps of the same
+        type whose termination events have the same type and direction.
+        """
+        termination = []
+        for term in op.termination:
+            if term["type"] == "voltage":
+                termination.append((term["type"], np.sign(op.value)))
+            else:
+                termination.append((term["type"],))
+        return (op.type, tuple(termination))
+
+    def _get_generic_step_inputs(self, op, step_values):
+        """
+        Inputs for a generic step: the values of the placeholders and of the
+        termination thresholds.
+        """
+        step_inputs = {
+            f"{name} [experiment step]": value for name, value in step_values.items()
+        }
+        for term in op.termination:
+            if term["type"] == "current":
+                step_inputs["Current cut-off [A] [experiment step]"] = term["value"]
+            elif term["type"] == "voltage":
+                step_inputs["Voltage cut-off [V] [experiment step]"] = term["value"]
+        return step_inputs
+
+    def _derive_experiment_step_model(
+        self, built_template, step_values, dependent_symbols
+    ):
+        """
+        Create the built model for a step from a discretised template model, by
+        replacing the placeholders with the (discretised) parameter values for the
+        step. Only the equations, variables and events that depend on the
+        placeholders are rebuilt.
+        """
+        replacements = {}
+        for name, value in step_values.items():
+            if isinstance(value, numbers.Number):
+                value = pybamm.Scalar(value)
+            else:
+                value = self._disc.process_symbol(
+                    self._parameter_values.process_symbol(value)
+                )
+            replacements[_experiment_step_placeholder(name)] = value
+        replacer = pybamm.SymbolReplacer(replacements, dependent_symbols)
+
+        step_model = copy.copy(built_template)
+        step_model.rhs = replacer.process_dict(built_template.rhs)
+        step_model.algebraic = replacer.process_dict(built_template.algebraic)
+        step_model.initial_conditions = replacer.process_dict(
+            built_template.initial_conditions
+        )
+        step_model.concatenated_rhs = replacer.process_symbol(
+            built_template.concatenated_rhs
+        )
+        step_model.concatenated_algebraic = replacer.process_symbol(
+            built_template.concatenated_algebraic
+        )
+        step_model.concatenated_initial_conditions = replacer.process_symbol(
+            built_template.concatenated_initial_conditions
+        )
+        step_model.variables = replacer.process_dict(built_template.variables)
+        step_model.events = [
+            pybamm.Event(
+                event.name,
+                replacer.process_symbol(event.expression),
+                event.event_type,
+            )
+            for event in built_template.events
+        ]
+        step_model.boundary_conditions = {
+            var: {
+                side: (replacer.process_symbol(bc), typ)
+                for side, (bc, typ) in bcs.items()
+            }
+            for var, bcs in built_template.boundary_conditions.items()
+        }
+        step_model.bcs = {
+            var: {
+                side: (replacer.process_symbol(bc), typ)
+                for side, (bc, typ) in bcs.items()
+            }
+            for var, bcs in built_template.bcs.items()
+        }
+        # Reset the attributes that are cached from the template's equations
+        step_model._parameters = None
+        step_model._input_parameters = None
+        step_model._parameter_info = None
+        step_model._variables_casadi = {}
+        step_model.__dict__.pop("_variables_and_events", None)
+        return step_model
+
     def solve(
         self,
         t_eval=None,
@@ -477,6 +913,7 @@ class Simulation:
         initial_soc=None,
         callbacks=None,
         showprogress=False,
+        sink=None,
         **kwargs,
     ):
         """
@@ -528,6 +965,13 @@ class Simulation:
             Whether to show a progress bar for cycling. If true, shows a progress bar
             for cycles. Has no effect when not used with an experiment.
             Default is False.
+        sink : :class:`pybamm.SolutionSink`, optional
+            A sink to which each cycle of an experiment is written as soon as it
+            finishes (see e.g. :class:`pybamm.NpzSolutionSink`). Written cycles are
+            not kept in memory: the returned solution only contains the last cycle,
+            and its `cycles` and `all_first_states` are None for the written cycles.
+            The summary variables are still kept. Cannot be used with
+            `save_at_cycles`.
         **kwargs
             Additional key-word arguments passed to `solver.solve`.
             See :meth:`pybamm.BaseSolver.solve`.
@@ -546,6 +990,8 @@ class Simulation:
                     "'save_at_cycles' option can only be used if simulating an "
                     "Experiment "
                 )
+            if sink is not None:
+                raise ValueError("'sink' can only be used if simulating an Experiment")
             if starting_solution is not None:
                 raise ValueError(
                     "starting_solution can only be provided if simulating an Experiment"
@@ -611,9 +1057,34 @@ class Simulation:
                             pybamm.SolverWarning,
                         )
 
+            set_up_key = None
+            if self._build_cache_key is not None:
+                set_up_key = self._build_cache.get_set_up_key(
+                    solver, self.built_model, t_eval, kwargs.get("inputs")
+                )
+                if (
+                    set_up_key is not None
+                    and set_up_key == self._build_cache_set_up_key
+                    and not solver._model_set_up
+                ):
+                    # The built model was loaded from the cache along with the
+                    # functions created by the set-up of an identical solver
+                    solver._model_set_up = {
+                        self.built_model: {
+                            "initial conditions": (
+                                self.built_model.concatenated_initial_conditions
+                            )
+                        }
+                    }
+
             self._solution = solver.solve(self.built_model, t_eval, **kwargs)
 
+            if set_up_key is not None and set_up_key != self._build_cache_set_up_key:
+                self._save_to_build_cache(set_up_key)
+
         elif self.operating_mode == "with experiment":
+            if sink is not None and save_at_cycles is not None:
+                raise ValueError("'sink' and 'save_at_cycles' cannot both be given")
             callbacks.on_experiment_start(logs)
             self.build_for_experiment(check_model=check_model, initial_soc=initial_soc)
             if t_eval is not None:
@@ -800,6 +1271,7 @@ class Simulation:
 
                     kwargs["inputs"] = {
                         **user_inputs,
+                        **self.op_conds_to_step_inputs.get(op_conds.basic_repr(), {}),
                         "start time": start_time,
                     }
                     # Make sure we take at least 2 timesteps
@@ -862,7 +1334,12 @@ class Simulation:
 
                     steps.append(step_solution)
 
-                    cycle_solution = cycle_solution + step_solution
+                    # Append in place (once cycle_solution is a copy owned by this
+                    # loop) to avoid copying the whole cycle at every step
+                    if isinstance(cycle_solution, pybamm.Solution):
+                        cycle_solution.append(step_solution)
+                    else:
+                        cycle_solution = cycle_solution + step_solution
                     current_solution = cycle_solution
 
                     callbacks.on_step_end(logs)
@@ -881,8 +1358,20 @@ class Simulation:
                     # Increment index for next iteration
                     idx += 1
 
-                if save_this_cycle or feasible is False:
-                    self._solution = self._solution + cycle_solution
+                if sink is not None:
+                    # Only the last cycle is kept in memory, the others are streamed
+                    # to the sink
+                    self._solution = cycle_solution
+                elif save_this_cycle or feasible is False:
+                    # The starting solution must not be modified, so it is only
+                    # added to (creating a new solution) and not appended to
+                    if (
+                        isinstance(self._solution, pybamm.Solution)
+                        and self._solution is not starting_solution
+                    ):
+                        self._solution.append(cycle_solution)
+                    else:
+                        self._solution = self._solution + cycle_solution
 
                 # At the final step of the inner loop we save the cycle
                 if len(steps) > 0:
@@ -912,6 +1401,11 @@ class Simulation:
                         steps, esoh_solver=esoh_solver, save_this_cycle=save_this_cycle
                     )
                     cycle_solution, cycle_sum_vars, cycle_first_state = cycle_sol
+                    if sink is not None:
+                        sink.write_cycle(
+                            cycle_num + cycle_offset, cycle_solution, cycle_sum_vars
+                        )
+                        cycle_solution = cycle_first_state = None
                     all_cycle_solutions.append(cycle_solution)
                     all_summary_variables.append(cycle_sum_vars)
                     all_first_states.append(cycle_first_state)
@@ -953,6 +1447,9 @@ class Simulation:
                 if feasible is False:
                     break
 
+            if sink is not None:
+                sink.close()
+
             if self.solution is not None and len(all_cycle_solutions) > 0:
                 self.solution.cycles = all_cycle_solutions
                 self.solution.set_summary_variables(all_summary_variables)
@@ -965,6 +1462,119 @@ class Simulation:
 
         return self.solution
 
+    def sweep(
+        self,
+        parameters,
+        t_eval=None,
+        solver=None,
+        check_model=True,
+        permutations=False,
+        **kwargs,
+    ):
+        """
+        Solve the model for several values of some of its parameters. The swept
+        parameters are made input parameters of the simulation (see
+        :meth:`Simulation.set_input_parameters`), so that the model is only
+        parameterised, discretised and set up once, and all the values are then
+        passed to the solver together (see the `inputs` argument of
+        :meth:`pybamm.BaseSolver.solve`), instead of building a new simulation for
+        each value. Simulations with an experiment are solved for each set of values
+        in turn, again without building them again.
+
+        The swept parameters must not change the geometry or the mesh.
+
+        Parameters
+        ----------
+        parameters : dict
+            The values of each swept parameter, e.g.
+            `{"Negative electrode diffusivity [m2.s-1]": [1e-14, 2e-14, 4e-14]}`
+        t_eval : numeric type, optional
+            The times at which to compute the solution (see :meth:`Simulation.solve`)
+        solver : :class:`pybamm.BaseSolver`, optional
+            The solver to use to solve the model. If None, Simulation.solver is used
+        check_model : bool, optional
+            If True, model checks are performed after discretisation (see
+            :meth:`pybamm.Discretisation.process_model`). Default is True.
+        permutations : bool, optional
+            If False, the model is solved with the first value of each parameter,
+            then with the second value of each parameter etc., so all the parameters
+            must be given the same number of values. If True, the model is solved
+            for the cartesian product of the values of the parameters. Default is
+            False.
+        **kwargs
+            Additional key-word arguments passed to :meth:`Simulation.solve`. Any
+            `inputs` are passed to the solver along with each set of values of the
+            swept parameters.
+
+        Returns
+        -------
+        list of :class:`pybamm.Solution`
+            The solution for each set of values of the swept parameters
+        """
+        sweep_inputs = _get_sweep_inputs(parameters, permutations)
+        self.set_input_parameters(list(parameters))
+        user_inputs = kwargs.pop("inputs", None) or {}
+        inputs = [{**user_inputs, **values} for values in sweep_inputs]
+
+        if self.operating_mode == "with experiment":
+            solutions = [
+                self.solve(t_eval, solver, check_model, inputs=inputs_i, **kwargs)
+                for inputs_i in inputs
+            ]
+            self._solution = solutions
+        else:
+            solutions = self.solve(t_eval, solver, check_model, inputs=inputs, **kwargs)
+        return solutions
+
+    def set_input_parameters(self, names):
+        """
+        Make some of the parameters of the simulation input parameters, whose values
+        are then passed to :meth:`Simulation.solve` with the `inputs` argument. The
+        simulation is built again (if it has already been built) the next time it is
+        solved.
+
+        Parameters
+        ----------
+        names : list of str
+            The names of the parameters
+        """
+        names = [
+            name
+            for name in names
+            if not isinstance(
+                self._unprocessed_parameter_values.get(name), pybamm.InputParameter
+            )
+        ]
+        if not names:
+            return
+        if self._unprocessed_model.is_discretised:
+            raise pybamm.ModelError(
+                "Cannot set the input parameters of a simulation of a model that is "
+                "already discretised"
+            )
+        new_values = {name: "[input]" for name in names}
+        unprocessed_parameter_values = self._unprocessed_parameter_values.copy()
+        unprocessed_parameter_values.update(new_values)
+        if self._parameter_values is self._unprocessed_parameter_values:
+            self._parameter_values = unprocessed_parameter_values
+        else:
+            # e.g. the initial concentrations were set from the initial SOC
+            self._parameter_values = self._parameter_values.copy()
+            self._parameter_values.update(new_values)
+        self._unprocessed_parameter_values = unprocessed_parameter_values
+
+        # Reset the built states
+        self._model = self._unprocessed_model
+        self._model_with_set_params = None
+        self._built_model = None
+        self.op_conds_to_built_models = None
+        self.op_conds_to_built_solvers = None
+        self.op_conds_to_step_inputs = None
+        self._experiment_template_models = None
+        self._build_cache_key = None
+        self._build_cache_set_up_key = None
+        self._solution = None
+
     def run_padding_rest(self, kwargs, rest_time, step_solution):
         model = self.op_conds_to_built_models["Rest for padding"]
         solver = self.op_conds_to_built_solvers["Rest for padding"]
@@ -1149,7 +1759,16 @@ class Simulation:
                 Set model.convert_to_format = 'casadi' instead.
                 """
             )
-        # Clear solver problem (not pickle-able, will automatically be recomputed)
+        self._clear_solver_problems()
+
+        with open(filename, "wb") as f:
+            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+
+    def _clear_solver_problems(self):
+        """
+        Clear the solver problems, which cannot be pickled (and will automatically
+        be recomputed).
+        """
         if (
             isinstance(self._solver, pybamm.CasadiSolver)
             and self._solver.integrator_specs != {}
@@ -1164,9 +1783,6 @@ class Simulation:
                 ):
                     solver.integrator_specs = {}
 
-        with open(filename, "wb") as f:
-            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
-
 
 def load_sim(filename):
     """Load a saved simulation"""
@@ -8,6 +8,7 @@ import multiprocessing as mp
 import numbers
 import sys
 import warnings
+import weakref
 
 import casadi
 import numpy as np
@@ -41,6 +42,30 @@ class BaseSolver(object):
     output_variables : list[str], optional
         List of variables to calculate and return. If none are specified then
         the complete state vector is returned (can be very large) (default is [])
+    compile_functions : bool or :class:`pybamm.CasadiFunctionCompiler`, optional
+        Whether to compile the casadi functions evaluated by the solver (e.g. the
+        right-hand side, the Jacobian and the events) to native code, with the
+        given compiler (or a default one if True), for solvers that support it.
+        Only used for models converted to casadi, and not when calculating
+        sensitivities. Default is False.
+    expand_functions : bool, optional
+        Whether to expand the casadi functions evaluated by the solver from MX
+        (graphs of matrix operations) to SX (graphs of scalar operations), which are
+        faster to evaluate for small and medium-sized models, but slower to build and
+        larger in memory for large models. Functions that cannot be expanded (e.g.
+        functions that call external code) are left as MX. Only used for models
+        converted to casadi. Default is False.
+    natural_steps : bool, optional
+        Whether to return the solution at the steps taken by the integrator, instead
+        of at the times in `t_eval`, for solvers that support it. `t_eval` then only
+        sets the start and end times of the solve (and the discontinuities are still
+        stepped over), so the size of the solution grows with the number of steps
+        needed to resolve it rather than with the sampling rate. Default is False.
+    natural_steps_tol : float, optional
+        If given, the natural steps are thinned: a step is dropped if the states
+        there are given by linear interpolation between the kept steps around it to
+        within this relative tolerance (and the absolute tolerance of the solver).
+        Default is None, which keeps all the steps.
     """
 
     def __init__(
@@ -52,6 +77,10 @@ class BaseSolver(object):
         root_tol=1e-6,
         extrap_tol=None,
         output_variables=[],
+        compile_functions=False,
+        expand_functions=False,
+        natural_steps=False,
+        natural_steps_tol=None,
     ):
         self.method = method
         self.rtol = rtol
@@ -60,7 +89,12 @@ class BaseSolver(object):
         self.root_method = root_method
         self.extrap_tol = extrap_tol or -1e-10
         self.output_variables = output_variables
+        self.compile_functions = compile_functions
+        self.expand_functions = expand_functions
+        self.natural_steps = natural_steps
+        self.natural_steps_tol = natural_steps_tol
         self._model_set_up = {}
+        self._pool = None
 
         # Defaults, can be overwritten by specific solver
         self.name = "Base solver"
@@ -68,6 +102,7 @@ class BaseSolver(object):
         self.algebraic_solver = False
         self._on_extrapolation = "warn"
         self.computed_var_fcns = {}
+        self.supports_natural_steps = False
 
     @property
     def root_method(self):
@@ -89,13 +124,70 @@ class BaseSolver(object):
             raise pybamm.SolverError("Root method must be an algebraic solver")
         self._root_method = method
 
+    @property
+    def compile_functions(self):
+        return self._compile_functions
+
+    @compile_functions.setter
+    def compile_functions(self, compiler):
+        if compiler is True:
+            compiler = pybamm.CasadiFunctionCompiler()
+        elif compiler is False:
+            compiler = None
+        elif not (
+            compiler is None or isinstance(compiler, pybamm.CasadiFunctionCompiler)
+        ):
+            raise pybamm.SolverError(
+                "compile_functions must be a bool or a CasadiFunctionCompiler"
+            )
+        self._compile_functions = compiler
+
+    def _compile(self, model, functions, with_jacobian=False):
+        """
+        Compile casadi functions if the solver compiles functions (see
+        :class:`pybamm.CasadiFunctionCompiler`), otherwise return them unchanged.
+        Functions are not compiled for models with sensitivities, which may need
+        higher derivatives of the functions.
+        """
+        if (
+            self.compile_functions is None
+            or model.convert_to_format != "casadi"
+            or model.calculate_sensitivities
+        ):
+            return functions
+        return self.compile_functions.compile(functions, with_jacobian)
+
+    def _compile_casadi_functions(self, model):
+        """
+        Compile the casadi functions of a model which are used by the solver, after
+        they are created in :meth:`set_up` (see :meth:`_compile`). By default, no
+        functions are compiled here.
+        """
+
+    def _expand(self, model, functions):
+        """
+        Expand casadi functions to SX if the solver expands functions (see
+        `expand_functions`), otherwise return them unchanged.
+        """
+        if not self.expand_functions or model.convert_to_format != "casadi":
+            return functions
+        return [expand_casadi_function(function) for function in functions]
+
     def copy(self):
         """Returns a copy of the solver"""
         new_solver = copy.copy(self)
-        # clear _model_set_up
+        # clear _model_set_up and the pool of worker processes
         new_solver._model_set_up = {}
+        new_solver._pool = None
         return new_solver
 
+    def __getstate__(self):
+        # the pool of worker processes cannot be pickled
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state.pop("_pool_finalizer", None)
+        return state
+
     def set_up(self, model, inputs=None, t_eval=None, ics_only=False):
         """Unpack model, perform checks, and calculate jacobian.
 
@@ -250,11 +342,13 @@ class BaseSolver(object):
                 model.casadi_rhs = casadi.Function(
                     "rhs", [t_casadi, y_and_S, p_casadi_stacked], [explicit_rhs]
                 )
+                (model.casadi_rhs,) = self._expand(model, [model.casadi_rhs])
             model.casadi_switch_events = casadi_switch_events
             model.casadi_algebraic = algebraic
             model.casadi_sensitivities = jacp_rhs_algebraic
             model.casadi_sensitivities_rhs = jacp_rhs
             model.casadi_sensitivities_algebraic = jacp_algebraic
+            self._compile_casadi_functions(model)
 
             # if output_variables specified then convert functions to casadi
             # expressions for evaluation within the respective solver
@@ -365,6 +459,7 @@ class BaseSolver(object):
         vars_for_processing = {
             "model": model,
             "calculate_sensitivities_explicit": calculate_sensitivities_explicit,
+            "expand_functions": self.expand_functions,
         }
 
         if model.convert_to_format != "casadi":
@@ -372,7 +467,7 @@ class BaseSolver(object):
             y = pybamm.StateVector(slice(0, model.len_rhs_and_alg))
             # set up Jacobian object, for re-use of dict
             jacobian = pybamm.Jacobian()
-            vars_for_processing.update({"y": y, "jacobian": jacobian})
+            vars_for_processing.update({"y": y, "jacobian": jacobian, "inputs": inputs})
             return vars_for_processing
 
         else:
@@ -705,6 +800,7 @@ class BaseSolver(object):
         initial_conditions=None,
         nproc=None,
         calculate_sensitivities=False,
+        chunksize=None,
     ):
         """
         Execute the solver setup and calculate the solution of the model at
@@ -727,11 +823,19 @@ class BaseSolver(object):
             of size `len(model.rhs) + len(model.algebraic)`.
         nproc : int, optional
             Number of processes to use when solving for more than one set of input
-            parameters. Defaults to value returned by "os.cpu_count()".
+            parameters. Defaults to value returned by "os.cpu_count()". The pool of
+            processes is kept by the solver and reused by later calls with the same
+            model and `nproc` (see :meth:`BaseSolver.close_pool`). Solvers that
+            solve for several sets of input parameters in one call (e.g. the
+            :class:`pybamm.IDAKLUSolver` with a casadi model) use `nproc` threads
+            instead.
         calculate_sensitivites : list of str or bool
             If true, solver calculates sensitivities of all input parameters.
             If only a subset of sensitivities are required, can also pass a
             list of input parameter names
+        chunksize : int, optional
+            Number of sets of input parameters sent to a process at a time when
+            solving for more than one set of input parameters. Default is 1.
 
         Returns
         -------
@@ -792,6 +896,11 @@ class BaseSolver(object):
         if (np.diff(t_eval) < 0).any():
             raise pybamm.SolverError("t_eval must increase monotonically")
 
+        if self.natural_steps and not self.supports_natural_steps:
+            raise pybamm.SolverError(
+                f"{self.name} cannot return the solution at its natural steps"
+            )
+
         # Set up inputs
         #
         # Argument "inputs" can be either a list of input dicts or
@@ -833,6 +942,7 @@ class BaseSolver(object):
             # not depend on input parameters. Thefore only `model_inputs[0]`
             # is passed to `set_up`.
             # See https://github.com/pybamm-team/PyBaMM/pull/1261
+            self.close_pool()
             self.set_up(model, model_inputs_list[0], t_eval)
             self._model_set_up.update(
                 {model: {"initial conditions": model.concatenated_initial_conditions}}
@@ -849,6 +959,7 @@ class BaseSolver(object):
                 else:
                     # If the new initial conditions are different
                     # and cannot be evaluated directly, set up again
+                    self.close_pool()
                     self.set_up(model, model_inputs_list[0], t_eval, ics_only=True)
                 self._model_set_up[model][
                     "initial conditions"
@@ -871,7 +982,9 @@ class BaseSolver(object):
             initial_conditions_node_names = set(
                 [it.name for it in model.concatenated_initial_conditions.pre_order()]
             )
-            if all_inputs_names.issubset(initial_conditions_node_names):
+            if all_inputs_names and all_inputs_names.issubset(
+                initial_conditions_node_names
+            ):
                 raise pybamm.SolverError(
                     "Input parameters cannot appear in expression "
                     "for initial conditions."
@@ -912,25 +1025,13 @@ class BaseSolver(object):
                 )
                 new_solutions = [new_solution]
             else:
-                if model.convert_to_format == "jax":
-                    # Jax can parallelize over the inputs efficiently
-                    new_solutions = self._integrate(
-                        model,
-                        t_eval[start_index:end_index],
-                        model_inputs_list,
-                    )
-                else:
-                    with mp.Pool(processes=nproc) as p:
-                        new_solutions = p.starmap(
-                            self._integrate,
-                            zip(
-                                [model] * ninputs,
-                                [t_eval[start_index:end_index]] * ninputs,
-                                model_inputs_list,
-                            ),
-                        )
-                        p.close()
-                        p.join()
+                new_solutions = self._integrate_batch(
+                    model,
+                    t_eval[start_index:end_index],
+                    model_inputs_list,
+                    nproc,
+                    chunksize,
+                )
             # Setting the solve time for each segment.
             # pybamm.Solution.__add__ assumes attribute solve_time.
             solve_time = timer.time()
@@ -1016,6 +1117,82 @@ class BaseSolver(object):
         else:
             return solutions
 
+    def _integrate_batch(self, model, t_eval, inputs_list, nproc, chunksize):
+        """
+        Solve the model for each set of inputs in `inputs_list`, returning the
+        solutions in the same order. By default the solves are shared out between a
+        pool of worker processes (see :meth:`BaseSolver._integrate_in_pool`); solvers
+        that can solve for several sets of inputs at once override this method.
+        """
+        if model.convert_to_format == "jax":
+            # Jax can parallelize over the inputs efficiently
+            return self._integrate(model, t_eval, inputs_list)
+        return self._integrate_in_pool(model, t_eval, inputs_list, nproc, chunksize)
+
+    def _integrate_in_pool(self, model, t_eval, inputs_list, nproc, chunksize):
+        """
+        Solve the model for each set of inputs in `inputs_list`, in a pool of worker
+        processes. Each worker receives the solver and the model once, when the pool
+        is created, after which only the inputs and initial state are sent for each
+        solve. The pool is created again if the model, `nproc` or the settings of the
+        solver (e.g. the tolerances) have changed since. Solutions are collected as
+        they finish and returned in the same order as `inputs_list`.
+        """
+        pool_args = (model, nproc, self._get_settings())
+        if self._pool is None or self._pool_args != pool_args:
+            self.close_pool()
+            # The workers are given a (shallow) copy of the solver, so that the pool
+            # does not keep a reference to the solver itself
+            self._pool = mp.Pool(
+                processes=nproc,
+                initializer=_set_up_worker,
+                initargs=(copy.copy(self), model),
+            )
+            self._pool_args = pool_args
+            # Make sure the workers are stopped if the solver is garbage collected
+            # (or at exit) without the pool having been closed
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+
+        tasks = (
+            (idx, t_eval, model.y0, inputs) for idx, inputs in enumerate(inputs_list)
+        )
+        solutions = [None] * len(inputs_list)
+        for idx, solution in self._pool.imap_unordered(
+            _integrate_in_worker, tasks, chunksize=chunksize or 1
+        ):
+            # The model is not sent back with the solution
+            _replace_solution_models(solution, model)
+            solutions[idx] = solution
+        return solutions
+
+    def _get_settings(self):
+        """
+        Return the settings of the solver (the attributes with values such as numbers,
+        strings, arrays, and lists and dictionaries of them, but not the functions and
+        integrators created by the set-up), in a form that can be compared.
+        """
+        settings = {}
+        for name, value in vars(self).items():
+            if name in ["_pool", "_pool_args", "_pool_finalizer"]:
+                continue
+            try:
+                settings[name] = _freeze_setting(value)
+            except TypeError:
+                continue
+        return settings
+
+    def close_pool(self):
+        """
+        Close the pool of worker processes used to solve for more than one set of
+        input parameters, if there is one. A new pool is created the next time it is
+        needed.
+        """
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
     def _get_discontinuity_start_end_indices(self, model, inputs, t_eval):
         if model.discontinuity_events_eval == []:
             pybamm.logger.verbose("No discontinuity events found")
@@ -1105,6 +1282,194 @@ class BaseSolver(object):
                 f"Events {event_names} are non-positive at initial conditions"
             )
 
+    def solve_adjoint(self, model, t_eval, functional, output_variables, inputs=None):
+        """
+        Calculate a scalar functional of output variables of a model (e.g. the
+        root-mean-square error between the voltage and data) and its gradient with
+        respect to all the input parameters, using adjoint sensitivities. The gradient
+        is found by integrating the adjoint (backward) problem with CVODES or IDAS,
+        through casadi, so its cost does not grow with the number of inputs, unlike
+        forward sensitivities (see the `calculate_sensitivities` argument of
+        :meth:`BaseSolver.solve`), which add one block of states per input.
+
+        The model is integrated over the whole of `t_eval` (events are ignored) with
+        the tolerances of the solver, whichever solver this is, and must be converted
+        to casadi and have differential equations (not only algebraic equations).
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model to solve
+        t_eval : numeric type
+            The times (in seconds) at which the output variables are evaluated
+        functional : callable
+            Function of a dictionary of output variables, with the names of the
+            variables as keys and casadi expressions of size (size of the variable,
+            number of times) as values, that returns the functional as a scalar
+            casadi expression, e.g.
+            `lambda v: casadi.sumsqr(v["Voltage [V]"] - data.reshape(1, -1))`
+        output_variables : list of str
+            The names of the variables passed to `functional`
+        inputs : dict, optional
+            The values of the input parameters
+
+        Returns
+        -------
+        value : float
+            The value of the functional
+        gradient : dict
+            The gradient of the functional with respect to each input parameter
+        """
+        if model.convert_to_format != "casadi":
+            raise pybamm.SolverError(
+                "Adjoint sensitivities require model.convert_to_format = 'casadi'"
+            )
+        if len(model.rhs) == 0:
+            raise pybamm.SolverError(
+                "Cannot calculate adjoint sensitivities for a purely algebraic model"
+            )
+        if not hasattr(model, "calculate_sensitivities"):
+            model.calculate_sensitivities = []
+        if model.calculate_sensitivities:
+            raise pybamm.SolverError(
+                "Cannot calculate adjoint sensitivities for a model set up with "
+                "forward sensitivities"
+            )
+        t_eval = np.asarray(t_eval, dtype=float)
+        if t_eval.size < 2:
+            raise pybamm.SolverError("t_eval must contain at least two times")
+        inputs = self._set_up_model_inputs(model, inputs)
+
+        if model not in self._model_set_up:
+            self.set_up(model, inputs, t_eval)
+            self._model_set_up.update(
+                {model: {"initial conditions": model.concatenated_initial_conditions}}
+            )
+        if "adjoint problem" not in self._model_set_up[model]:
+            self._model_set_up[model]["adjoint problem"] = self._create_adjoint_problem(
+                model, inputs
+            )
+        integrator, rootfinder = self._model_set_up[model]["adjoint problem"]
+
+        # symbolic inputs, stacked in the same order as for the model functions
+        p_stacked = casadi.MX.sym("p", sum(np.size(v) for v in inputs.values()))
+        p = {}
+        start = 0
+        for name, value in inputs.items():
+            p[name] = p_stacked[start : start + np.size(value)]
+            start += np.size(value)
+
+        # Integrate one output interval at a time, so that the only adjoint seeds of
+        # each integration are on its final states, and find the algebraic states
+        # at each output time from the differential states, since the adjoint
+        # problem of IDAS does not handle seeds on the algebraic states
+        y0 = model.initial_conditions_eval(
+            t_eval[0], casadi.DM.zeros(model.len_rhs_and_alg), p_stacked
+        )
+        x = y0[: model.len_rhs]
+        if model.len_alg > 0:
+            z = rootfinder(y0[model.len_rhs :], t_eval[0], x, p_stacked)
+        else:
+            z = casadi.MX(0, 1)
+        y = [casadi.vertcat(x, z)]
+        for t_min, t_max in zip(t_eval[:-1], t_eval[1:]):
+            solution = integrator(x0=x, z0=z, p=casadi.vertcat(p_stacked, t_min, t_max))
+            x = solution["xf"]
+            if model.len_alg > 0:
+                z = rootfinder(solution["zf"], t_max, x, p_stacked)
+            y.append(casadi.vertcat(x, z))
+        y = casadi.horzcat(*y)
+
+        t_casadi = casadi.MX.sym("t")
+        y_casadi = casadi.MX.sym("y", model.len_rhs_and_alg)
+        outputs = {}
+        for name in output_variables:
+            variable = model.variables_and_events[name].to_casadi(
+                t_casadi, y_casadi, inputs=p
+            )
+            variable_fn = casadi.Function(
+                "variable", [t_casadi, y_casadi, p_stacked], [variable]
+            ).map(t_eval.size)
+            outputs[name] = variable_fn(
+                t_eval.reshape(1, -1), y, casadi.repmat(p_stacked, 1, t_eval.size)
+            )
+
+        functional_fn = casadi.Function(
+            "functional", [p_stacked], [functional(outputs)]
+        )
+        # reverse mode, so that the gradient is found with an adjoint integration
+        gradient_fn = functional_fn.reverse(1)
+        p_values = casadi.vertcat(*[casadi.DM(v) for v in inputs.values()])
+        try:
+            value = functional_fn(p_values)
+            gradient_values = gradient_fn(p_values, value, 1).full().flatten()
+        except RuntimeError as error:
+            raise pybamm.SolverError(error.args[0])
+
+        gradient = {}
+        start = 0
+        for name, value_p in inputs.items():
+            size = np.size(value_p)
+            gradient[name] = gradient_values[start : start + size]
+            if isinstance(value_p, numbers.Number):
+                gradient[name] = gradient[name][0]
+            start += size
+        return float(value), gradient
+
+    def _create_adjoint_problem(self, model, inputs):
+        """
+        Create the casadi integrator over one output interval, with the start and end
+        times as parameters, and the rootfinder for the algebraic states, used by
+        :meth:`BaseSolver.solve_adjoint`.
+        """
+        t = casadi.MX.sym("t")
+        p = casadi.MX.sym("p", sum(np.size(v) for v in inputs.values()))
+        t_min = casadi.MX.sym("t_min")
+        t_max = casadi.MX.sym("t_max")
+        y_diff = casadi.MX.sym("y_diff", model.len_rhs)
+        y_alg = casadi.MX.sym("y_alg", model.len_alg)
+        y_full = casadi.vertcat(y_diff, y_alg)
+        # rescale time so that each interval is [0, 1]
+        t_scaled = t_min + (t_max - t_min) * t
+        mass_matrix_inv = casadi.DM(model.mass_matrix_inv.entries)
+        problem = {
+            "t": t,
+            "x": y_diff,
+            "p": casadi.vertcat(p, t_min, t_max),
+            "ode": (t_max - t_min)
+            * (mass_matrix_inv @ model.rhs_eval(t_scaled, y_full, p)),
+        }
+        options = {
+            "show_eval_warnings": False,
+            "reltol": self.rtol,
+            "abstol": self.atol,
+        }
+        if model.len_alg == 0:
+            method = "cvodes"
+            rootfinder = None
+        else:
+            method = "idas"
+            problem.update(
+                {"z": y_alg, "alg": model.algebraic_eval(t_scaled, y_full, p)}
+            )
+            algebraic = casadi.Function(
+                "algebraic",
+                [y_alg, t, y_diff, p],
+                [model.algebraic_eval(t, y_full, p)],
+            )
+            rootfinder = casadi.rootfinder(
+                "algebraic_states", "newton", algebraic, {"abstol": self.root_tol}
+            )
+        try:
+            # the backward problem is much faster to solve with the problem expanded
+            # to SX, when it can be
+            integrator = casadi.integrator(
+                "F", method, problem, 0, 1, {**options, "expand": True}
+            )
+        except RuntimeError:
+            integrator = casadi.integrator("F", method, problem, 0, 1, options)
+        return integrator, rootfinder
+
     def step(
         self,
         old_solution,
@@ -1348,6 +1713,40 @@ class BaseSolver(object):
             pybamm.logger.debug("Finish post-processing events")
             return solution, solution.termination
 
+    def _thin_natural_steps(self, t, y):
+        """
+        Return the indices of the natural steps to keep, thinning them with
+        `natural_steps_tol` (all the steps are kept if it is None). The steps are
+        scanned in order, and a step is dropped if all the steps since the last kept
+        step are given by linear interpolation between the last kept step and the
+        next step, to within the tolerance. The first and last steps are always kept.
+
+        Parameters
+        ----------
+        t : :class:`numpy.ndarray`
+            The times of the steps
+        y : :class:`numpy.ndarray`
+            The values at the steps, with one column per step
+        """
+        n = len(t)
+        if self.natural_steps_tol is None or n <= 2:
+            return np.arange(n)
+        rtol = self.natural_steps_tol
+        atol = np.min(self.atol) if np.ndim(self.atol) else self.atol
+        y = np.asarray(y).reshape(-1, n)
+        keep = [0]
+        i = 0
+        for k in range(1, n - 1):
+            # can the steps between i and k + 1 be interpolated?
+            w = (t[i + 1 : k + 1] - t[i]) / (t[k + 1] - t[i])
+            y_interp = y[:, i : i + 1] * (1 - w) + y[:, k + 1 : k + 2] * w
+            y_steps = y[:, i + 1 : k + 1]
+            if np.any(np.abs(y_steps - y_interp) > rtol * np.abs(y_steps) + atol):
+                keep.append(k)
+                i = k
+        keep.append(n - 1)
+        return np.array(keep)
+
     def check_extrapolation(self, solution, events):
         """
         Check if extrapolation occurred for any of the interpolants. Note that with the
@@ -1421,6 +1820,52 @@ class BaseSolver(object):
         return ordered_inputs
 
 
+# Solver and model held by each worker process of a solver's pool (see
+# BaseSolver._integrate_in_pool), so that they are only sent to each worker once
+_worker_solver = None
+_worker_model = None
+
+
+def _set_up_worker(solver, model):
+    global _worker_solver, _worker_model
+    _worker_solver = solver
+    _worker_model = model
+
+
+def _integrate_in_worker(task):
+    idx, t_eval, y0, inputs = task
+    _worker_model.y0 = y0
+    solution = _worker_solver._integrate(_worker_model, t_eval, inputs)
+    # Don't send the model back with the solution
+    _replace_solution_models(solution, None)
+    return idx, solution
+
+
+def _freeze_setting(value):
+    """
+    Convert the value of a solver setting to a form that can be compared with `==`,
+    raising a TypeError if it is not a setting.
+    """
+    if isinstance(value, (numbers.Number, str, type(None))):
+        return value
+    elif isinstance(value, np.ndarray):
+        return (value.shape, tuple(value.ravel().tolist()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze_setting(v) for v in value)
+    elif isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return tuple(sorted((k, _freeze_setting(v)) for k, v in value.items()))
+    elif isinstance(value, BaseSolver):
+        return (type(value), value._get_settings())
+    raise TypeError(f"{type(value)} is not a setting")
+
+
+def _replace_solution_models(solution, model):
+    for sol in [solution, *solution.sub_solutions]:
+        sol._all_models = [model] * len(sol.all_models)
+        sol.__dict__.pop("first_state", None)
+        sol.__dict__.pop("last_state", None)
+
+
 def process(
     symbol, name, vars_for_processing, use_jacobian=None, return_jacp_stacked=None
 ):
@@ -1486,8 +1931,15 @@ def process(
             )
             jacp = func.get_sensitivities()
         if use_jacobian:
-            report(f"Calculating jacobian for {name} using jax")
-            jac = func.get_jacobian()
+            if model.use_jacobian_colouring:
+                report(f"Calculating coloured sparse jacobian for {name} using jax")
+                sparsity = pybamm.jacobian_sparsity(
+                    symbol, model.len_rhs_and_alg, vars_for_processing["inputs"]
+                )
+                jac = pybamm.ColouredJacobian(func, sparsity, jvp=func.jvp)
+            else:
+                report(f"Calculating jacobian for {name} using jax")
+                jac = func.get_jacobian()
             jac_action = func.get_jacobian_action()
         else:
             jac = None
@@ -1522,20 +1974,27 @@ def process(
         else:
             jacp = None
 
+        report(f"Converting {name} to python")
+        func = pybamm.EvaluatorPython(symbol)
+
         if use_jacobian:
-            report(f"Calculating jacobian for {name}")
-            jac = jacobian.jac(symbol, y)
-            report(f"Converting jacobian for {name} to python")
-            jac = pybamm.EvaluatorPython(jac)
+            if model.use_jacobian_colouring:
+                report(f"Calculating coloured sparse jacobian for {name}")
+                sparsity = pybamm.jacobian_sparsity(
+                    symbol, model.len_rhs_and_alg, vars_for_processing["inputs"]
+                )
+                jac = pybamm.ColouredJacobian(func, sparsity)
+            else:
+                report(f"Calculating jacobian for {name}")
+                jac = jacobian.jac(symbol, y)
+                report(f"Converting jacobian for {name} to python")
+                jac = pybamm.EvaluatorPython(jac)
             # cannot do jacobian action efficiently for now
             jac_action = None
         else:
             jac = None
             jac_action = None
 
-        report(f"Converting {name} to python")
-        func = pybamm.EvaluatorPython(symbol)
-
     else:
         t_casadi = vars_for_processing["t_casadi"]
         y_casadi = vars_for_processing["y_casadi"]
@@ -1664,4 +2123,43 @@ def process(
             name, [t_casadi, y_and_S, p_casadi_stacked], [casadi_expression]
         )
 
+        if vars_for_processing.get("expand_functions", False):
+            func, jac, jacp, jac_action = (
+                None if function is None else expand_casadi_function(function)
+                for function in (func, jac, jacp, jac_action)
+            )
+
     return func, jac, jacp, jac_action
+
+
+def expand_casadi_function(function):
+    """
+    Expand a casadi function from MX (a graph of matrix operations) to SX (a graph
+    of scalar operations), which has no overhead per operation and is faster to
+    evaluate, unless the graph is very large. Functions that cannot be expanded (e.g.
+    functions calling external code) are returned unchanged. The time taken to
+    expand the function is logged, as expanding large functions can be slow.
+
+    Parameters
+    ----------
+    function : :class:`casadi.Function`
+        The function to expand
+
+    Returns
+    -------
+    :class:`casadi.Function`
+        The expanded function, or `function` if it cannot be expanded
+    """
+    timer = pybamm.Timer()
+    try:
+        expanded = function.expand()
+    except RuntimeError as error:
+        pybamm.logger.verbose(
+            f"Could not expand {function.name()} to SX, keeping MX: {error}"
+        )
+        return function
+    pybamm.logger.verbose(
+        f"Expanded {function.name()} to SX ({expanded.n_instructions()} "
+        f"instructions, was {function.n_instructions()}) in {timer.time()}"
+    )
+    return expanded
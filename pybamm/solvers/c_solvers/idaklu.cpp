@@ -54,6 +54,10 @@ PYBIND11_MODULE(idaklu, m)
     py::arg("y0"),
     py::arg("yp0"),
     py::arg("inputs"),
+    py::return_value_policy::take_ownership)
+  .def("clone", &CasadiSolver::clone,
+    "return an independent copy of the solver, that can solve at the same "
+    "time as the original in another thread",
     py::return_value_policy::take_ownership);
 
   //py::bind_vector<std::vector<Function>>(m, "VectorFunction");
@@ -85,6 +89,15 @@ PYBIND11_MODULE(idaklu, m)
     py::arg("options"),
     py::return_value_policy::take_ownership);
 
+  m.def("solve_batch", &solve_batch,
+    "Solve for a batch of input parameter sets in parallel threads",
+    py::arg("solvers"),
+    py::arg("t"),
+    py::arg("y0"),
+    py::arg("yp0"),
+    py::arg("inputs"),
+    py::return_value_policy::take_ownership);
+
   m.def("generate_function", &generate_function,
     "Generate a casadi function",
     py::arg("string"),
@@ -96,5 +109,7 @@ PYBIND11_MODULE(idaklu, m)
   .def_readwrite("t", &Solution::t)
   .def_readwrite("y", &Solution::y)
   .def_readwrite("yS", &Solution::yS)
-  .def_readwrite("flag", &Solution::flag);
+  .def_readwrite("flag", &Solution::flag)
+  .def_readwrite("stats", &Solution::stats)
+  .def_readwrite("integration_time", &Solution::integration_time);
 }
@@ -33,11 +33,40 @@ public:
    * @brief Abstract solver method that returns a Solution class
    */
   virtual Solution solve(
-    np_array t_np,
-    np_array y0_np,
-    np_array yp0_np,
+    np_array_dense t_np,
+    np_array_dense y0_np,
+    np_array_dense yp0_np,
     np_array_dense inputs) = 0;
 
+  /**
+   * Solve from raw data pointers, without using any Python objects, so that
+   * it can be called without holding the GIL.
+   * @brief Abstract solver method that returns a SolutionData class
+   * @param t Times at which to return the solution
+   * @param number_of_timesteps Length of t
+   * @param y0 Initial state (including sensitivities)
+   * @param yp0 Initial time derivative of the state (including sensitivities)
+   * @param y0_size Length of y0 and yp0
+   * @param inputs First element of the input parameters
+   * @param inputs_stride Distance between consecutive input parameters
+   */
+  virtual SolutionData solve_data(
+    const realtype *t,
+    int number_of_timesteps,
+    const realtype *y0,
+    const realtype *yp0,
+    int y0_size,
+    const realtype *inputs,
+    int inputs_stride) = 0;
+
+  /**
+   * The copy shares the (read-only) casadi functions of the model, but has its
+   * own integrator memory and work buffers, so that the copy and the original
+   * can solve at the same time in different threads.
+   * @brief Abstract method that returns an independent copy of the solver
+   */
+  virtual CasadiSolver *clone() const = 0;
+
   /**
    * Abstract method to initialize the solver, once vectors and solver classes
    * are set
@@ -1,4 +1,5 @@
 #include "CasadiSolverOpenMP.hpp"
+#include "casadi_solver.hpp"
 #include "casadi_sundials_functions.hpp"
 #include <casadi/casadi.hpp>
 #include <casadi/core/function.hpp>
@@ -186,6 +187,10 @@ CasadiSolverOpenMP::~CasadiSolverOpenMP()
     N_VDestroyVectorArray(ypS, number_of_parameters);
   }
 
+  delete[] res;
+  delete[] res_dvar_dy;
+  delete[] res_dvar_dp;
+
   IDAFree(&ida_mem);
   SUNContext_Free(&sunctx);
 }
@@ -248,35 +253,95 @@ void CasadiSolverOpenMP::CalcVarsSensitivities(
 }
 
 Solution CasadiSolverOpenMP::solve(
-    np_array t_np,
-    np_array y0_np,
-    np_array yp0_np,
+    np_array_dense t_np,
+    np_array_dense y0_np,
+    np_array_dense yp0_np,
     np_array_dense inputs
 )
 {
   DEBUG("CasadiSolver::solve");
 
-  int number_of_timesteps = t_np.request().size;
   auto t = t_np.unchecked<1>();
-  realtype t0 = RCONST(t(0));
   auto y0 = y0_np.unchecked<1>();
   auto yp0 = yp0_np.unchecked<1>();
-  auto n_coeffs = number_of_states + number_of_parameters * number_of_states;
+  auto p_inputs = inputs.unchecked<2>();
 
-  if (y0.size() != n_coeffs)
+  if (yp0.size() != y0.size())
     throw std::domain_error(
-      "y0 has wrong size. Expected " + std::to_string(n_coeffs) +
-      " but got " + std::to_string(y0.size()));
+      "yp0 has wrong size. Expected " + std::to_string(y0.size()) +
+      " but got " + std::to_string(yp0.size()));
+
+  const realtype *t_data = t.data(0);
+  const int number_of_timesteps = t_np.request().size;
+  const realtype *y0_data = y0.data(0);
+  const realtype *yp0_data = yp0.data(0);
+  const int y0_size = y0.size();
+  const realtype *inputs_data = p_inputs.data(0, 0);
+  const int inputs_stride = p_inputs.shape(1);
+
+  SolutionData sol_data;
+  {
+    // The numpy arrays are kept alive by the caller, so the solve can run
+    // without holding the GIL
+    py::gil_scoped_release release;
+
+    // inputs are stored as a (number of inputs, number of input sets) array,
+    // of which only the first column is used
+    sol_data = solve_data(
+      t_data,
+      number_of_timesteps,
+      y0_data,
+      yp0_data,
+      y0_size,
+      inputs_data,
+      inputs_stride
+    );
+  }
+  return sol_data.generate_solution();
+}
+
+CasadiSolver *CasadiSolverOpenMP::clone() const
+{
+  DEBUG("CasadiSolverOpenMP::clone");
+  // copying the functions copies their work buffers, but not the casadi
+  // functions themselves
+  return new_casadi_solver(
+    atol_np,
+    rtol,
+    rhs_alg_id,
+    number_of_parameters,
+    number_of_events,
+    jac_times_cjmass_nnz,
+    jac_bandwidth_lower,
+    jac_bandwidth_upper,
+    std::make_unique<CasadiFunctions>(*functions),
+    options
+  );
+}
+
+SolutionData CasadiSolverOpenMP::solve_data(
+    const realtype *t,
+    int number_of_timesteps,
+    const realtype *y0,
+    const realtype *yp0,
+    int y0_size,
+    const realtype *inputs,
+    int inputs_stride
+)
+{
+  DEBUG("CasadiSolver::solve_data");
 
-  if (yp0.size() != n_coeffs)
+  realtype t0 = RCONST(t[0]);
+  auto n_coeffs = number_of_states + number_of_parameters * number_of_states;
+
+  if (y0_size != n_coeffs)
     throw std::domain_error(
-      "yp0 has wrong size. Expected " + std::to_string(n_coeffs) +
-      " but got " + std::to_string(yp0.size()));
+      "y0 has wrong size. Expected " + std::to_string(n_coeffs) +
+      " but got " + std::to_string(y0_size));
 
   // set inputs
-  auto p_inputs = inputs.unchecked<2>();
   for (int i = 0; i < functions->inputs.size(); i++)
-    functions->inputs[i] = p_inputs(i, 0);
+    functions->inputs[i] = inputs[i * inputs_stride];
 
   // set initial conditions
   realtype *yval = N_VGetArrayPointer(yy);
@@ -298,18 +363,21 @@ Solution CasadiSolverOpenMP::solve(
     ypval[i] = yp0[i];
   }
 
+  functions->residual_time = 0;
+  functions->jacobian_time = 0;
+
   IDAReInit(ida_mem, t0, yy, yp);
   if (number_of_parameters > 0)
     IDASensReInit(ida_mem, IDA_SIMULTANEOUS, yyS, ypS);
 
   // correct initial values
   DEBUG("IDACalcIC");
-  IDACalcIC(ida_mem, IDA_YA_YDP_INIT, t(1));
+  IDACalcIC(ida_mem, IDA_YA_YDP_INIT, t[1]);
   if (number_of_parameters > 0)
     IDAGetSens(ida_mem, &t0, yyS);
 
   realtype tret;
-  realtype t_final = t(number_of_timesteps - 1);
+  realtype t_final = t[number_of_timesteps - 1];
 
   // set return vectors
   int length_of_return_vector = 0;
@@ -329,54 +397,42 @@ Solution CasadiSolverOpenMP::solve(
     // Return full y state-vector
     length_of_return_vector = number_of_states;
   }
-  realtype *t_return = new realtype[number_of_timesteps];
-  realtype *y_return = new realtype[number_of_timesteps *
-                                    length_of_return_vector];
-  realtype *yS_return = new realtype[number_of_parameters *
-                                     number_of_timesteps *
-                                     length_of_return_vector];
-
+  // With natural steps, the number of returned steps is not known in advance,
+  // so the return vectors grow as the steps are taken (and the sensitivities of
+  // the state vector are stored time-major, and reordered at the end)
+  int capacity = number_of_timesteps;
+  std::vector<realtype> t_return(capacity);
+  std::vector<realtype> y_return(capacity * length_of_return_vector);
+  std::vector<realtype> yS_return(number_of_parameters *
+                                  capacity *
+                                  length_of_return_vector);
+  const int yS_time_stride = options.natural_steps ?
+    number_of_parameters * number_of_states : number_of_states;
+  const int yS_param_stride = options.natural_steps ?
+    number_of_states : number_of_timesteps * number_of_states;
+
+  delete[] res;
+  delete[] res_dvar_dy;
+  delete[] res_dvar_dp;
   res = new realtype[max_res_size];
   res_dvar_dy = new realtype[max_res_dvar_dy];
   res_dvar_dp = new realtype[max_res_dvar_dp];
 
-  py::capsule free_t_when_done(
-    t_return,
-    [](void *f) {
-      realtype *vect = reinterpret_cast<realtype *>(f);
-      delete[] vect;
-    }
-  );
-  py::capsule free_y_when_done(
-    y_return,
-    [](void *f) {
-      realtype *vect = reinterpret_cast<realtype *>(f);
-      delete[] vect;
-    }
-  );
-  py::capsule free_yS_when_done(
-    yS_return,
-    [](void *f) {
-      realtype *vect = reinterpret_cast<realtype *>(f);
-      delete[] vect;
-    }
-  );
-
   // Initial state (t_i=0)
   int t_i = 0;
   size_t ySk = 0;
-  t_return[t_i] = t(t_i);
+  t_return[t_i] = t[t_i];
   if (functions->var_casadi_fcns.size() > 0) {
     // Evaluate casadi functions for each requested variable and store
-    CalcVars(y_return, length_of_return_vector, t_i,
-             &tret, yval, ySval, yS_return, &ySk);
+    CalcVars(y_return.data(), length_of_return_vector, t_i,
+             &tret, yval, ySval, yS_return.data(), &ySk);
   } else {
     // Retain complete copy of the state vector
     for (int j = 0; j < number_of_states; j++)
       y_return[j] = yval[j];
     for (int j = 0; j < number_of_parameters; j++)
     {
-      const int base_index = j * number_of_timesteps * number_of_states;
+      const int base_index = j * yS_param_stride;
       for (int k = 0; k < number_of_states; k++)
         yS_return[base_index + k] = ySval[j][k];
     }
@@ -385,12 +441,30 @@ Solution CasadiSolverOpenMP::solve(
   // Subsequent states (t_i>0)
   int retval;
   t_i = 1;
+  if (options.natural_steps || options.dense_output)
+  {
+    // Only stop at the final time (the end of the window, since the windows are
+    // split at the discontinuities), and interpolate the solution at the
+    // requested times from the steps that IDA takes
+    IDASetStopTime(ida_mem, t_final);
+  }
   while (true)
   {
-    realtype t_next = t(t_i);
-    IDASetStopTime(ida_mem, t_next);
     DEBUG("IDASolve");
-    retval = IDASolve(ida_mem, t_final, &tret, yy, yp, IDA_NORMAL);
+    if (options.natural_steps)
+    {
+      // Return after each step that IDA takes
+      retval = IDASolve(ida_mem, t_final, &tret, yy, yp, IDA_ONE_STEP);
+    }
+    else if (options.dense_output)
+    {
+      retval = IDASolve(ida_mem, t[t_i], &tret, yy, yp, IDA_NORMAL);
+    }
+    else
+    {
+      IDASetStopTime(ida_mem, t[t_i]);
+      retval = IDASolve(ida_mem, t_final, &tret, yy, yp, IDA_NORMAL);
+    }
 
     if (retval == IDA_TSTOP_RETURN ||
         retval == IDA_SUCCESS ||
@@ -399,31 +473,50 @@ Solution CasadiSolverOpenMP::solve(
       if (number_of_parameters > 0)
         IDAGetSens(ida_mem, &tret, yyS);
 
+      if (t_i == capacity)
+      {
+        capacity *= 2;
+        t_return.resize(capacity);
+        y_return.resize(capacity * length_of_return_vector);
+        yS_return.resize(
+          number_of_parameters * capacity * length_of_return_vector);
+      }
+
       // Evaluate and store results for the time step
       t_return[t_i] = tret;
       if (functions->var_casadi_fcns.size() > 0) {
         // Evaluate casadi functions for each requested variable and store
         // NOTE: Indexing of yS_return is (time:var:param)
-        CalcVars(y_return, length_of_return_vector, t_i,
-                 &tret, yval, ySval, yS_return, &ySk);
+        CalcVars(y_return.data(), length_of_return_vector, t_i,
+                 &tret, yval, ySval, yS_return.data(), &ySk);
       } else {
         // Retain complete copy of the state vector
         for (int j = 0; j < number_of_states; j++)
           y_return[t_i * number_of_states + j] = yval[j];
         for (int j = 0; j < number_of_parameters; j++)
         {
-          const int base_index =
-            j * number_of_timesteps * number_of_states +
-            t_i * number_of_states;
+          const int base_index = j * yS_param_stride + t_i * yS_time_stride;
           for (int k = 0; k < number_of_states; k++)
-            // NOTE: Indexing of yS_return is (time:param:yvec)
+            // NOTE: Indexing of yS_return is (param:time:yvec)
             yS_return[base_index + k] = ySval[j][k];
         }
       }
       t_i += 1;
 
-      if (retval == IDA_SUCCESS ||
-          retval == IDA_ROOT_RETURN)
+      if (options.natural_steps)
+      {
+        if (retval == IDA_ROOT_RETURN)
+          break;
+        if (retval == IDA_TSTOP_RETURN)
+        {
+          // Reached the final time
+          retval = IDA_SUCCESS;
+          break;
+        }
+      }
+      else if (retval == IDA_ROOT_RETURN ||
+               t_i == number_of_timesteps ||
+               (!options.dense_output && retval == IDA_SUCCESS))
         break;
     }
     else
@@ -433,86 +526,114 @@ Solution CasadiSolverOpenMP::solve(
     }
   }
 
-  np_array t_ret = np_array(
-    t_i,
-    &t_return[0],
-    free_t_when_done
-  );
-  np_array y_ret = np_array(
-    t_i * length_of_return_vector,
-    &y_return[0],
-    free_y_when_done
-  );
-  // Note: Ordering of vector is differnet if computing variables vs returning
-  // the complete state vector
-  np_array yS_ret;
-  if (functions->var_casadi_fcns.size() > 0) {
-    yS_ret = np_array(
-      std::vector<ptrdiff_t> {
-        number_of_timesteps,
-        length_of_return_vector,
-        number_of_parameters
-      },
-      &yS_return[0],
-      free_yS_when_done
-    );
-  } else {
-    yS_ret = np_array(
-      std::vector<ptrdiff_t> {
-        number_of_parameters,
-        number_of_timesteps,
-        length_of_return_vector
-      },
-      &yS_return[0],
-      free_yS_when_done
-    );
+  // Only the returned time steps are kept
+  t_return.resize(t_i);
+  y_return.resize(t_i * length_of_return_vector);
+  if (options.natural_steps)
+  {
+    // The returned steps are the time steps of the solution
+    number_of_timesteps = t_i;
+    if (functions->var_casadi_fcns.size() > 0)
+      yS_return.resize(number_of_parameters * t_i * length_of_return_vector);
+    else
+    {
+      // Reorder the sensitivities from (time:param:yvec) to (param:time:yvec)
+      std::vector<realtype> yS_steps(std::move(yS_return));
+      yS_return.assign(number_of_parameters * t_i * number_of_states, 0);
+      for (int i = 0; i < t_i; i++)
+        for (int j = 0; j < number_of_parameters; j++)
+          for (int k = 0; k < number_of_states; k++)
+            yS_return[(j * t_i + i) * number_of_states + k] =
+              yS_steps[i * yS_time_stride + j * yS_param_stride + k];
+    }
   }
 
-  Solution sol(retval, t_ret, y_ret, yS_ret);
-
   if (options.print_stats)
   {
-    long nsteps, nrevals, nlinsetups, netfails;
-    int klast, kcur;
-    realtype hinused, hlast, hcur, tcur;
-
-    IDAGetIntegratorStats(
-      ida_mem,
-      &nsteps,
-      &nrevals,
-      &nlinsetups,
-      &netfails,
-      &klast,
-      &kcur,
-      &hinused,
-      &hlast,
-      &hcur,
-      &tcur
-    );
-
-    long nniters, nncfails;
-    IDAGetNonlinSolvStats(ida_mem, &nniters, &nncfails);
-
-    long int ngevalsBBDP = 0;
-    if (options.using_iterative_solver)
-      IDABBDPrecGetNumGfnEvals(ida_mem, &ngevalsBBDP);
-
-    py::print("Solver Stats:");
-    py::print("\tNumber of steps =", nsteps);
-    py::print("\tNumber of calls to residual function =", nrevals);
-    py::print("\tNumber of calls to residual function in preconditioner =",
-              ngevalsBBDP);
-    py::print("\tNumber of linear solver setup calls =", nlinsetups);
-    py::print("\tNumber of error test failures =", netfails);
-    py::print("\tMethod order used on last step =", klast);
-    py::print("\tMethod order used on next step =", kcur);
-    py::print("\tInitial step size =", hinused);
-    py::print("\tStep size on last step =", hlast);
-    py::print("\tStep size on next step =", hcur);
-    py::print("\tCurrent internal time reached =", tcur);
-    py::print("\tNumber of nonlinear iterations performed =", nniters);
-    py::print("\tNumber of nonlinear convergence failures =", nncfails);
+    py::gil_scoped_acquire acquire;
+    PrintStats();
   }
 
-  return sol;
+  SolutionData sol_data(
+    retval,
+    number_of_timesteps,
+    t_i,
+    length_of_return_vector,
+    number_of_parameters,
+    functions->var_casadi_fcns.size() > 0,
+    std::move(t_return),
+    std::move(y_return),
+    std::move(yS_return)
+  );
+  sol_data.stats = GetStats();
+  return sol_data;
+}
+
+std::map<std::string, realtype> CasadiSolverOpenMP::GetStats()
+{
+  long nsteps, nrevals, nlinsetups, netfails, nniters, nncfails, ngevals;
+  long njevals;
+  IDAGetNumSteps(ida_mem, &nsteps);
+  IDAGetNumResEvals(ida_mem, &nrevals);
+  IDAGetNumLinSolvSetups(ida_mem, &nlinsetups);
+  IDAGetNumErrTestFails(ida_mem, &netfails);
+  IDAGetNonlinSolvStats(ida_mem, &nniters, &nncfails);
+  IDAGetNumGEvals(ida_mem, &ngevals);
+  IDAGetNumJacEvals(ida_mem, &njevals);
+
+  return {
+    {"number_of_steps", nsteps},
+    {"number_of_residual_evaluations", nrevals},
+    {"number_of_jacobian_evaluations", njevals},
+    {"number_of_linear_solver_setups", nlinsetups},
+    {"number_of_nonlinear_iterations", nniters},
+    {"number_of_error_test_failures", netfails},
+    {"number_of_root_function_calls", ngevals},
+    {"residual_time", functions->residual_time},
+    {"jacobian_time", functions->jacobian_time}
+  };
+}
+
+void CasadiSolverOpenMP::PrintStats()
+{
+  long nsteps, nrevals, nlinsetups, netfails;
+  int klast, kcur;
+  realtype hinused, hlast, hcur, tcur;
+
+  IDAGetIntegratorStats(
+    ida_mem,
+    &nsteps,
+    &nrevals,
+    &nlinsetups,
+    &netfails,
+    &klast,
+    &kcur,
+    &hinused,
+    &hlast,
+    &hcur,
+    &tcur
+  );
+
+  long nniters, nncfails;
+  IDAGetNonlinSolvStats(ida_mem, &nniters, &nncfails);
+
+  long int ngevalsBBDP = 0;
+  if (options.using_iterative_solver)
+    IDABBDPrecGetNumGfnEvals(ida_mem, &ngevalsBBDP);
+
+  py::print("Solver Stats:");
+  py::print("\tNumber of steps =", nsteps);
+  py::print("\tNumber of calls to residual function =", nrevals);
+  py::print("\tNumber of calls to residual function in preconditioner =",
+            ngevalsBBDP);
+  py::print("\tNumber of linear solver setup calls =", nlinsetups);
+  py::print("\tNumber of error test failures =", netfails);
+  py::print("\tMethod order used on last step =", klast);
+  py::print("\tMethod order used on next step =", kcur);
+  py::print("\tInitial step size =", hinused);
+  py::print("\tStep size on last step =", hlast);
+  py::print("\tStep size on next step =", hcur);
+  py::print("\tCurrent internal time reached =", tcur);
+  py::print("\tNumber of nonlinear iterations performed =", nniters);
+  py::print("\tNumber of nonlinear convergence failures =", nncfails);
 }
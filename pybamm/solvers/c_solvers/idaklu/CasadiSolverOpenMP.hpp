@@ -123,11 +123,38 @@ public:
    * @brief The main solve method that solves for each variable and time step
    */
   Solution solve(
-    np_array t_np,
-    np_array y0_np,
-    np_array yp0_np,
+    np_array_dense t_np,
+    np_array_dense y0_np,
+    np_array_dense yp0_np,
     np_array_dense inputs) override;
 
+  /**
+   * @brief The solve method that works on raw data and can run without the GIL
+   */
+  SolutionData solve_data(
+    const realtype *t,
+    int number_of_timesteps,
+    const realtype *y0,
+    const realtype *yp0,
+    int y0_size,
+    const realtype *inputs,
+    int inputs_stride) override;
+
+  /**
+   * @brief Return an independent copy of the solver, with the same linear solver
+   */
+  CasadiSolver *clone() const override;
+
+  /**
+   * @brief Return the statistics of the last solve, by name
+   */
+  std::map<std::string, realtype> GetStats();
+
+  /**
+   * @brief Print the statistics of the last solve
+   */
+  void PrintStats();
+
   /**
    * @brief Concrete implementation of initialization method
    */
@@ -149,6 +149,10 @@ public:
 
   Options options;
 
+  // time spent in the residual and jacobian functions since the last reset
+  realtype residual_time = 0;
+  realtype jacobian_time = 0;
+
   realtype *get_tmp_state_vector();
   realtype *get_tmp_sparse_jacobian_data();
 
@@ -4,7 +4,11 @@
 #include "casadi_sundials_functions.hpp"
 #include "common.hpp"
 #include <idas/idas.h>
+#include <algorithm>
+#include <chrono>
+#include <exception>
 #include <memory>
+#include <thread>
 
 CasadiSolver *create_casadi_solver(
   int number_of_states,
@@ -53,6 +57,32 @@ CasadiSolver *create_casadi_solver(
     options_cpp
   );
 
+  return new_casadi_solver(
+    atol_np,
+    rel_tol,
+    rhs_alg_id,
+    number_of_parameters,
+    number_of_events,
+    jac_times_cjmass_nnz,
+    jac_bandwidth_lower,
+    jac_bandwidth_upper,
+    std::move(functions),
+    options_cpp
+  );
+}
+
+CasadiSolver *new_casadi_solver(
+  np_array atol_np,
+  double rel_tol,
+  np_array rhs_alg_id,
+  int number_of_parameters,
+  int number_of_events,
+  int jac_times_cjmass_nnz,
+  int jac_bandwidth_lower,
+  int jac_bandwidth_upper,
+  std::unique_ptr<CasadiFunctions> functions,
+  const Options &options_cpp
+) {
   CasadiSolver *casadiSolver = nullptr;
 
   // Instantiate solver class
@@ -175,3 +205,84 @@ CasadiSolver *create_casadi_solver(
 
   return casadiSolver;
 }
+
+std::vector<Solution> solve_batch(
+  const std::vector<CasadiSolver*>& solvers,
+  np_array_dense t_np,
+  np_array_dense y0_np,
+  np_array_dense yp0_np,
+  np_array_dense inputs
+) {
+  DEBUG("solve_batch");
+
+  if (solvers.empty())
+    throw std::invalid_argument("At least one solver is required");
+
+  auto t = t_np.unchecked<1>();
+  auto y0 = y0_np.unchecked<1>();
+  auto yp0 = yp0_np.unchecked<1>();
+  auto p_inputs = inputs.unchecked<2>();
+
+  if (yp0.size() != y0.size())
+    throw std::domain_error(
+      "yp0 has wrong size. Expected " + std::to_string(y0.size()) +
+      " but got " + std::to_string(yp0.size()));
+
+  const realtype *t_data = t.data(0);
+  const int number_of_timesteps = t_np.request().size;
+  const realtype *y0_data = y0.data(0);
+  const realtype *yp0_data = yp0.data(0);
+  const int y0_size = y0.size();
+  // inputs are stored as a (number of inputs, number of input sets) array
+  const realtype *inputs_data = p_inputs.data(0, 0);
+  const int number_of_input_sets = p_inputs.shape(1);
+  const int number_of_threads = std::min(
+    int(solvers.size()), std::max(number_of_input_sets, 1));
+
+  std::vector<SolutionData> sol_data(number_of_input_sets);
+  std::vector<std::exception_ptr> errors(number_of_threads);
+  {
+    // The numpy arrays are kept alive by the caller, so their data can be
+    // read by the worker threads without holding the GIL
+    py::gil_scoped_release release;
+
+    auto solve_share = [&](int thread_k) {
+      try {
+        for (int i = thread_k; i < number_of_input_sets; i += number_of_threads) {
+          // time each solve on its own, as the solves run concurrently
+          auto start = std::chrono::steady_clock::now();
+          sol_data[i] = solvers[thread_k]->solve_data(
+            t_data,
+            number_of_timesteps,
+            y0_data,
+            yp0_data,
+            y0_size,
+            inputs_data + i,
+            number_of_input_sets
+          );
+          sol_data[i].integration_time = std::chrono::duration<realtype>(
+            std::chrono::steady_clock::now() - start).count();
+        }
+      } catch (...) {
+        errors[thread_k] = std::current_exception();
+      }
+    };
+
+    std::vector<std::thread> threads;
+    for (int thread_k = 1; thread_k < number_of_threads; thread_k++)
+      threads.emplace_back(solve_share, thread_k);
+    solve_share(0);
+    for (auto &thread : threads)
+      thread.join();
+  }
+
+  for (auto &error : errors)
+    if (error)
+      std::rethrow_exception(error);
+
+  std::vector<Solution> solutions;
+  solutions.reserve(number_of_input_sets);
+  for (auto &data : sol_data)
+    solutions.push_back(data.generate_solution());
+  return solutions;
+}
@@ -33,4 +33,39 @@ CasadiSolver *create_casadi_solver(
   py::dict options
 );
 
+/**
+ * Creates a concrete casadi solver for the given casadi functions, with the
+ * linear solver specified in options_cpp.linear_solver. Used both to create a
+ * solver and to clone one (see CasadiSolver::clone).
+ * @brief Create a concrete casadi solver from a set of casadi functions
+ */
+CasadiSolver *new_casadi_solver(
+  np_array atol_np,
+  double rel_tol,
+  np_array rhs_alg_id,
+  int number_of_parameters,
+  int number_of_events,
+  int jac_times_cjmass_nnz,
+  int jac_bandwidth_lower,
+  int jac_bandwidth_upper,
+  std::unique_ptr<CasadiFunctions> functions,
+  const Options &options_cpp
+);
+
+/**
+ * Solves the same model for each column of `inputs`, starting from the same
+ * initial conditions. The input sets are shared out between the solvers, each
+ * of which solves its share in a separate thread without holding the GIL, so
+ * the number of solvers sets the number of threads. The solvers must have been
+ * created for the same model.
+ * @brief Solve for a batch of input parameter sets in parallel threads
+ */
+std::vector<Solution> solve_batch(
+  const std::vector<CasadiSolver*>& solvers,
+  np_array_dense t_np,
+  np_array_dense y0_np,
+  np_array_dense yp0_np,
+  np_array_dense inputs
+);
+
 #endif // PYBAMM_IDAKLU_CREATE_CASADI_SOLVER_HPP
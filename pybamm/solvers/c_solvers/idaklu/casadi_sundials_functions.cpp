@@ -1,6 +1,7 @@
 #include "casadi_sundials_functions.hpp"
 #include "casadi_functions.hpp"
 #include "common.hpp"
+#include <chrono>
 #include <type_traits>
 
 #define NV_DATA NV_DATA_OMP  // Serial: NV_DATA_S
@@ -11,6 +12,7 @@ int residual_casadi(realtype tres, N_Vector yy, N_Vector yp, N_Vector rr,
   DEBUG("residual_casadi");
   CasadiFunctions *p_python_functions =
       static_cast<CasadiFunctions *>(user_data);
+  const auto start = std::chrono::steady_clock::now();
 
   p_python_functions->rhs_alg.m_arg[0] = &tres;
   p_python_functions->rhs_alg.m_arg[1] = NV_DATA(yy);
@@ -32,6 +34,8 @@ int residual_casadi(realtype tres, N_Vector yy, N_Vector yp, N_Vector rr,
   //DEBUG_VECTOR(rr);
 
   // now rr has rhs_alg(t, y) - mass_matrix * yp
+  p_python_functions->residual_time += std::chrono::duration<realtype>(
+    std::chrono::steady_clock::now() - start).count();
   return 0;
 }
 
@@ -149,6 +153,7 @@ int jacobian_casadi(realtype tt, realtype cj, N_Vector yy, N_Vector yp,
 
   CasadiFunctions *p_python_functions =
       static_cast<CasadiFunctions *>(user_data);
+  const auto start = std::chrono::steady_clock::now();
 
   // create pointer to jac data, column pointers, and row values
   realtype *jac_data;
@@ -250,6 +255,8 @@ int jacobian_casadi(realtype tt, realtype cj, N_Vector yy, N_Vector yp,
       throw std::runtime_error("Unknown matrix format detected (Expected CSC or CSR)");
   }
 
+  p_python_functions->jacobian_time += std::chrono::duration<realtype>(
+    std::chrono::steady_clock::now() - start).count();
   return (0);
 }
 
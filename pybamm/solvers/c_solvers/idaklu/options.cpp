@@ -7,6 +7,8 @@ using namespace std::string_literals;
 
 Options::Options(py::dict options)
     : print_stats(options["print_stats"].cast<bool>()),
+      dense_output(options["dense_output"].cast<bool>()),
+      natural_steps(options["natural_steps"].cast<bool>()),
       jacobian(options["jacobian"].cast<std::string>()),
       preconditioner(options["preconditioner"].cast<std::string>()),
       linsol_max_iterations(options["linsol_max_iterations"].cast<int>()),
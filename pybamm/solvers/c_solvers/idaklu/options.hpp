@@ -8,6 +8,8 @@
  */
 struct Options {
   bool print_stats;
+  bool dense_output;
+  bool natural_steps;
   bool using_sparse_matrix;
   bool using_banded_matrix;
   bool using_iterative_solver;
@@ -0,0 +1,59 @@
+#include "solution.hpp"
+
+/**
+ * @brief Move a vector to the heap and wrap it in a numpy array that owns it
+ */
+np_array vector_to_np_array(
+  std::vector<realtype> &vect,
+  const std::vector<ptrdiff_t> &shape
+)
+{
+  auto *vect_ptr = new std::vector<realtype>(std::move(vect));
+  py::capsule free_when_done(
+    vect_ptr,
+    [](void *f) {
+      delete reinterpret_cast<std::vector<realtype> *>(f);
+    }
+  );
+  return np_array(shape, vect_ptr->data(), free_when_done);
+}
+
+Solution SolutionData::generate_solution()
+{
+  np_array t_ret = vector_to_np_array(
+    t_return,
+    std::vector<ptrdiff_t> {number_of_returned_timesteps}
+  );
+  np_array y_ret = vector_to_np_array(
+    y_return,
+    std::vector<ptrdiff_t> {
+      number_of_returned_timesteps * length_of_return_vector
+    }
+  );
+  // Note: Ordering of vector is different if computing variables vs returning
+  // the complete state vector
+  np_array yS_ret;
+  if (computed_variables) {
+    yS_ret = vector_to_np_array(
+      yS_return,
+      std::vector<ptrdiff_t> {
+        number_of_timesteps,
+        length_of_return_vector,
+        number_of_parameters
+      }
+    );
+  } else {
+    yS_ret = vector_to_np_array(
+      yS_return,
+      std::vector<ptrdiff_t> {
+        number_of_parameters,
+        number_of_timesteps,
+        length_of_return_vector
+      }
+    );
+  }
+  Solution solution(flag, t_ret, y_ret, yS_ret);
+  solution.stats = std::move(stats);
+  solution.integration_time = integration_time;
+  return solution;
+}
@@ -2,6 +2,9 @@
 #define PYBAMM_IDAKLU_SOLUTION_HPP
 
 #include "common.hpp"
+#include <map>
+#include <string>
+#include <vector>
 
 /**
  * @brief Solution class
@@ -21,6 +24,66 @@ public:
   np_array t;
   np_array y;
   np_array yS;
+  std::map<std::string, realtype> stats;
+  realtype integration_time = 0;  // wall time of the solve (batched solves only)
 };
 
-#endif // PYBAMM_IDAKLU_COMMON_HPP
+/**
+ * Holds the results of a solve in plain C++ containers, so that it can be
+ * filled without holding the Python GIL (e.g. by the worker threads of a
+ * batched solve). The numpy arrays are only created when the Solution is
+ * generated, without copying the data.
+ * @brief Solution data that does not depend on Python objects
+ */
+class SolutionData
+{
+public:
+  /**
+   * @brief Default constructor
+   */
+  SolutionData() = default;
+
+  /**
+   * @brief Constructor
+   */
+  SolutionData(
+    int flag,
+    int number_of_timesteps,
+    int number_of_returned_timesteps,
+    int length_of_return_vector,
+    int number_of_parameters,
+    bool computed_variables,
+    std::vector<realtype> t_return,
+    std::vector<realtype> y_return,
+    std::vector<realtype> yS_return)
+      : flag(flag),
+        number_of_timesteps(number_of_timesteps),
+        number_of_returned_timesteps(number_of_returned_timesteps),
+        length_of_return_vector(length_of_return_vector),
+        number_of_parameters(number_of_parameters),
+        computed_variables(computed_variables),
+        t_return(std::move(t_return)),
+        y_return(std::move(y_return)),
+        yS_return(std::move(yS_return))
+  {
+  }
+
+  /**
+   * @brief Create a Solution, handing over the data (requires the GIL)
+   */
+  Solution generate_solution();
+
+  int flag;
+  int number_of_timesteps;
+  int number_of_returned_timesteps;
+  int length_of_return_vector;
+  int number_of_parameters;
+  bool computed_variables;
+  std::vector<realtype> t_return;
+  std::vector<realtype> y_return;
+  std::vector<realtype> yS_return;
+  std::map<std::string, realtype> stats;
+  realtype integration_time = 0;  // wall time of the solve (batched solves only)
+};
+
+#endif // PYBAMM_IDAKLU_SOLUTION_HPP
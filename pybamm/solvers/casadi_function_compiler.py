@@ -0,0 +1,130 @@
+#
+# Compile casadi functions to native code
+#
+import hashlib
+import os
+import subprocess
+import tempfile
+
+import casadi
+
+import pybamm
+
+
+class CasadiFunctionCompiler:
+    """
+    Compiles casadi functions to native code: the C code of the functions is
+    generated by casadi, compiled into a shared library with the system C compiler,
+    and loaded back in as external casadi functions. The shared libraries are cached
+    on disk under a hash of the generated code (and of the compiler settings), so a
+    function that has already been compiled, in this process or another one, is
+    loaded without compiling it again.
+
+    Pass a compiler (or True) as the `compile_functions` argument of a solver to
+    compile the functions evaluated by the solver.
+
+    **EXPERIMENTAL** - this class is experimental, and requires a C compiler.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory in which to store the shared libraries. Created if it does not
+        exist. Default is a "pybamm-compiled-functions" directory in the temporary
+        directory of the system.
+    compiler : str, optional
+        The C compiler. Default is the value of the "CC" environment variable, or
+        "cc" if it is not set.
+    flags : list of str, optional
+        The flags passed to the compiler, in addition to those needed to build a
+        shared library. Default is ["-O1"], which compiles the (large) functions of
+        battery models much faster than higher optimisation levels, for similar
+        performance.
+    """
+
+    def __init__(self, directory=None, compiler=None, flags=None):
+        if directory is None:
+            directory = os.path.join(tempfile.gettempdir(), "pybamm-compiled-functions")
+        self.directory = directory
+        self.compiler = compiler or os.environ.get("CC", "cc")
+        self.flags = ["-O1"] if flags is None else list(flags)
+        os.makedirs(directory, exist_ok=True)
+
+    def compile(self, functions, with_jacobian=False):
+        """
+        Compile casadi functions into a single shared library (or load the library
+        from the cache), and return the compiled functions.
+
+        Parameters
+        ----------
+        functions : :class:`casadi.Function` or list of :class:`casadi.Function`
+            The function(s) to compile
+        with_jacobian : bool, optional
+            Whether to also compile the Jacobians of the functions, so that the
+            compiled functions can be differentiated (once), e.g. inside a casadi
+            integrator. Default is False.
+
+        Returns
+        -------
+        :class:`casadi.Function` or list of :class:`casadi.Function`
+            The compiled function(s), with the same inputs and outputs as `functions`
+        """
+        if isinstance(functions, casadi.Function):
+            return self.compile([functions], with_jacobian)[0]
+
+        # Wrap the functions so that their names in the library are unique and valid
+        # C identifiers
+        names = [f"pybamm_function_{i}" for i in range(len(functions))]
+        generator = casadi.CodeGenerator("pybamm_functions", {"with_header": False})
+        for name, function in zip(names, functions):
+            inputs = function.mx_in()
+            wrapped = casadi.Function(name, inputs, function.call(inputs))
+            generator.add(wrapped)
+            if with_jacobian:
+                # casadi looks for the Jacobian of an external function "f" as "jac_f"
+                generator.add(wrapped.jacobian())
+        source = generator.dump()
+
+        filename = self._get_filename(source)
+        if not os.path.exists(filename):
+            self._build(source, filename)
+        return [casadi.external(name, filename) for name in names]
+
+    def _get_filename(self, source):
+        key = hashlib.sha256(
+            "\n".join([casadi.__version__, self.compiler, *self.flags, source]).encode()
+        ).hexdigest()
+        extension = ".dll" if os.name == "nt" else ".so"
+        return os.path.join(self.directory, key + extension)
+
+    def _build(self, source, filename):
+        """
+        Compile the C code into a shared library. The library is first built under a
+        temporary name, which then replaces any existing library, so that other
+        processes never load a partly written library.
+        """
+        pybamm.logger.verbose(f"Compiling casadi functions into {filename}")
+        with tempfile.TemporaryDirectory() as build_directory:
+            c_filename = os.path.join(build_directory, "pybamm_functions.c")
+            with open(c_filename, "w") as f:
+                f.write(source)
+            fd, temporary_filename = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            command = [
+                self.compiler,
+                "-shared",
+                "-fPIC",
+                *self.flags,
+                c_filename,
+                "-o",
+                temporary_filename,
+            ]
+            try:
+                subprocess.run(command, check=True, capture_output=True, text=True)
+                os.replace(temporary_filename, filename)
+            except (OSError, subprocess.CalledProcessError) as error:
+                os.remove(temporary_filename)
+                message = getattr(error, "stderr", None) or str(error)
+                raise pybamm.SolverError(
+                    f"Could not compile casadi functions with '{self.compiler}': "
+                    f"{message}"
+                ) from error
@@ -57,6 +57,12 @@ class CasadiSolver(pybamm.BaseSolver):
         - "max_num_steps": Maximum number of integrator steps
         - "print_stats": Print out statistics after integration
 
+        The integrators integrate over time rescaled to [0, 1] (see
+        :meth:`create_integrator`), so the options which are times ("max_step_size",
+        "min_step_size" and "step0") are given in seconds and rescaled for each
+        window. In "safe without grid" mode, where the integrator is called for each
+        time step, they are instead relative to the length of each step.
+
     extra_options_call : dict, optional
         Any options to pass to the CasADi integrator when calling the integrator.
         Please consult `CasADi documentation <https://tinyurl.com/y5rk76os>`_ for
@@ -72,8 +78,21 @@ class CasadiSolver(pybamm.BaseSolver):
         The maximum number of integrators that the solver will retain before
         ejecting past integrators using an LRU methodology. A value of 0 or
         None leaves the number of integrators unbound. Default is 100.
+    compile_functions : bool or :class:`pybamm.CasadiFunctionCompiler`, optional
+        Whether to compile the right-hand side and algebraic functions (with their
+        Jacobians) and the events to native code, with the given compiler (or a
+        default one if True). Default is False.
+    expand_functions : bool, optional
+        Whether to expand the right-hand side, algebraic, Jacobian and event
+        functions from MX to SX, which are faster to evaluate for small and
+        medium-sized models. Functions that cannot be expanded are left as MX.
+        Default is False.
     """
 
+    # Options of the casadi integrators which are times, and so need to be rescaled
+    # along with time
+    _time_options = ("max_step_size", "min_step_size", "step0")
+
     def __init__(
         self,
         mode="safe",
@@ -89,6 +108,8 @@ class CasadiSolver(pybamm.BaseSolver):
         return_solution_if_failed_early=False,
         perturb_algebraic_initial_conditions=None,
         integrators_maxcount=100,
+        compile_functions=False,
+        expand_functions=False,
     ):
         super().__init__(
             "problem dependent",
@@ -97,6 +118,8 @@ class CasadiSolver(pybamm.BaseSolver):
             root_method,
             root_tol,
             extrap_tol,
+            compile_functions=compile_functions,
+            expand_functions=expand_functions,
         )
         if mode in ["safe", "fast", "fast with events", "safe without grid"]:
             self.mode = mode
@@ -486,44 +509,49 @@ class CasadiSolver(pybamm.BaseSolver):
         solution.integration_time = (
             coarse_solution.integration_time + dense_step_sol.integration_time
         )
+        solution.solver_stats = (
+            coarse_solution.solver_stats + dense_step_sol.solver_stats
+        )
 
         solution.closest_event_idx = closest_event_idx
 
         return solution
 
+    def _compile_casadi_functions(self, model):
+        """See :meth:`pybamm.BaseSolver._compile_casadi_functions`"""
+        # the integrator differentiates the rhs and algebraic functions, so their
+        # Jacobians are compiled too
+        if len(model.rhs) > 0:
+            model.casadi_rhs, model.casadi_algebraic = self._compile(
+                model,
+                [model.casadi_rhs, model.casadi_algebraic],
+                with_jacobian=True,
+            )
+        if model.terminate_events_eval:
+            model.terminate_events_eval = self._compile(
+                model, model.terminate_events_eval
+            )
+
     def create_integrator(self, model, inputs, t_eval=None, use_event_switch=False):
         """
         Method to create a casadi integrator object.
         If t_eval is provided, the integrator uses t_eval to make the grid.
         Otherwise, the integrator has grid [0,1].
+
+        Time is rescaled so that every integrator of a model integrates from 0 to 1,
+        with the start and end times of the window as parameters. An integrator can
+        therefore be reused for any window with the same grid relative to the
+        window, e.g. for all the windows with the same number of equally spaced
+        points, whatever their start time and length. If some of the options which
+        are times are given in `extra_options_setup`, they are rescaled by the
+        length of the window, so the integrator is only reused for windows of the
+        same length.
         """
         pybamm.logger.debug("Creating CasADi integrator")
 
-        # Use grid if t_eval is given
-        use_grid = t_eval is not None
-        if use_grid is True:
-            t_eval_shifted = t_eval - t_eval[0]
-            t_eval_shifted_rounded = np.round(t_eval_shifted, decimals=12).tobytes()
+        grid_key, grid = self._get_grid(t_eval)
         # Only set up problem once
-        if model in self.integrators:
-            # If we're not using the grid, we don't need to change the integrator
-            if use_grid is False:
-                return self.integrators[model]["no grid"]
-            # Otherwise, create new integrator with an updated grid
-            # We don't need to update the grid if reusing the same t_eval
-            # (up to a shift by a constant)
-            else:
-                if t_eval_shifted_rounded in self.integrators[model]:
-                    return self.integrators[model][t_eval_shifted_rounded]
-                else:
-                    method, problem, options, time_args = self.integrator_specs[model]
-                    time_args = [t_eval_shifted[0], t_eval_shifted[1:]]
-                    integrator = casadi.integrator(
-                        "F", method, problem, *time_args, options
-                    )
-                    self.integrators[model][t_eval_shifted_rounded] = integrator
-                    return integrator
-        else:
+        if model not in self.integrators:
             rhs = model.casadi_rhs
             algebraic = model.casadi_algebraic
 
@@ -543,23 +571,13 @@ class CasadiSolver(pybamm.BaseSolver):
             y_alg = casadi.MX.sym("y_alg", algebraic(0, y0, p).shape[0])
             y_full = casadi.vertcat(y_diff, y_alg)
 
-            if use_grid is False:
-                time_args = []
-                # rescale time
-                t_min = casadi.MX.sym("t_min")
-                t_max = casadi.MX.sym("t_max")
-                t_max_minus_t_min = t_max - t_min
-                t_scaled = t_min + (t_max - t_min) * t
-                # add time limits as inputs
-                p_with_tlims = casadi.vertcat(p, t_min, t_max)
-            else:
-                time_args = [t_eval_shifted[0], t_eval_shifted[1:]]
-                # rescale time
-                t_min = casadi.MX.sym("t_min")
-                # Set dummy parameters for consistency with rescaled time
-                t_max_minus_t_min = 1
-                t_scaled = t_min + t
-                p_with_tlims = casadi.vertcat(p, t_min)
+            # rescale time
+            t_min = casadi.MX.sym("t_min")
+            t_max = casadi.MX.sym("t_max")
+            t_max_minus_t_min = t_max - t_min
+            t_scaled = t_min + (t_max - t_min) * t
+            # add time limits as inputs
+            p_with_tlims = casadi.vertcat(p, t_min, t_max)
 
             # define the event switch as the point when an event is crossed
             # we don't do this for ODE models
@@ -586,14 +604,56 @@ class CasadiSolver(pybamm.BaseSolver):
                         "alg": algebraic(t_scaled, y_full, p),
                     }
                 )
-            integrator = casadi.integrator("F", method, problem, *time_args, options)
-            self.integrator_specs[model] = method, problem, options, time_args
-            if use_grid is False:
-                self.integrators[model] = {"no grid": integrator}
+            self.integrator_specs[model] = method, problem, options
+            self.integrators[model] = {}
+
+        integrators = self.integrators[model]
+        if grid_key not in integrators:
+            method, problem, options = self.integrator_specs[model]
+            if grid is None:
+                time_args = []
             else:
-                self.integrators[model] = {t_eval_shifted_rounded: integrator}
+                time_args = [0, grid[1:]]
+                t_window = t_eval[-1] - t_eval[0]
+                if t_window > 0:
+                    options = self._rescale_time_options(options, t_window)
+            integrators[grid_key] = casadi.integrator(
+                "F", method, problem, *time_args, options
+            )
+        return integrators[grid_key]
+
+    def _get_grid(self, t_eval):
+        """
+        Get the key under which the integrator for a window is stored, and the grid
+        of the integrator (the times of the window rescaled to [0, 1]). Windows with
+        equally spaced times (or a single time) share the same exact grid, so that
+        rounding errors in the times do not lead to new integrators. If some options are times, the
+        key also includes the length of the window, by which they are rescaled.
+        """
+        if t_eval is None:
+            return "no grid", None
+        t_eval = np.asarray(t_eval, dtype=float)
+        n_intervals = len(t_eval) - 1
+        dt = np.diff(t_eval)
+        if n_intervals < 1 or np.allclose(dt, dt[0], rtol=1e-10, atol=0):
+            grid_key = n_intervals
+            grid = np.linspace(0, 1, n_intervals + 1)
+        else:
+            grid = (t_eval - t_eval[0]) / (t_eval[-1] - t_eval[0])
+            grid_key = np.round(grid, decimals=12).tobytes()
+        if any(name in self.extra_options_setup for name in self._time_options):
+            grid_key = (grid_key, float(f"{t_eval[-1] - t_eval[0]:.10g}"))
+        return grid_key, grid
 
-            return integrator
+    def _rescale_time_options(self, options, t_window):
+        """
+        Rescale the options of an integrator which are times, from seconds to the
+        time rescaled to [0, 1] over a window of length `t_window`.
+        """
+        return {
+            name: value / t_window if name in self._time_options else value
+            for name, value in options.items()
+        }
 
     def _run_integrator(
         self,
@@ -640,11 +700,7 @@ class CasadiSolver(pybamm.BaseSolver):
             extract_sensitivities_in_solution = explicit_sensitivities
 
         if use_grid is True:
-            pybamm.logger.spam("Calculating t_eval_shifted")
-            t_eval_shifted = t_eval - t_eval[0]
-            t_eval_shifted_rounded = np.round(t_eval_shifted, decimals=12).tobytes()
-            pybamm.logger.spam("Finished calculating t_eval_shifted")
-            integrator = self.integrators[model][t_eval_shifted_rounded]
+            integrator = self.integrators[model][self._get_grid(t_eval)[0]]
         else:
             integrator = self.integrators[model]["no grid"]
 
@@ -672,14 +728,16 @@ class CasadiSolver(pybamm.BaseSolver):
         # Solve
         # Try solving
         if use_grid is True:
-            t_min = t_eval[0]
-            inputs_with_tmin = casadi.vertcat(inputs, t_min)
+            inputs_with_tlims = casadi.vertcat(inputs, t_eval[0], t_eval[-1])
             # Call the integrator once, with the grid
             timer = pybamm.Timer()
             pybamm.logger.debug("Calling casadi integrator")
             try:
                 casadi_sol = integrator(
-                    x0=y0_diff, z0=y0_alg, p=inputs_with_tmin, **self.extra_options_call
+                    x0=y0_diff,
+                    z0=y0_alg,
+                    p=inputs_with_tlims,
+                    **self.extra_options_call,
                 )
             except RuntimeError as error:
                 # If it doesn't work raise error
@@ -687,6 +745,7 @@ class CasadiSolver(pybamm.BaseSolver):
                 raise pybamm.SolverError(error.args[0])
             pybamm.logger.debug("Finished casadi integrator")
             integration_time = timer.time()
+            solver_stats = self._get_integrator_stats(integrator)
             # Manually add initial conditions and concatenate
             x_sol = casadi.horzcat(y0_diff, casadi_sol["xf"])
             if len_alg > 0:
@@ -703,6 +762,7 @@ class CasadiSolver(pybamm.BaseSolver):
                 check_solution=False,
             )
             sol.integration_time = integration_time
+            sol.solver_stats = solver_stats
             return sol
         else:
             # Repeated calls to the integrator
@@ -710,6 +770,7 @@ class CasadiSolver(pybamm.BaseSolver):
             z = y0_alg_exact
             y_diff = x
             y_alg = z
+            solver_stats = pybamm.SolverStats()
             for i in range(len(t_eval) - 1):
                 t_min = t_eval[i]
                 t_max = t_eval[i + 1]
@@ -724,6 +785,7 @@ class CasadiSolver(pybamm.BaseSolver):
                     pybamm.logger.debug(f"Casadi integrator failed with error {error}")
                     raise pybamm.SolverError(error.args[0])
                 integration_time = timer.time()
+                solver_stats += self._get_integrator_stats(integrator)
                 x = casadi_sol["xf"]
                 z = casadi_sol["zf"]
                 y_diff = casadi.horzcat(y_diff, x)
@@ -743,4 +805,22 @@ class CasadiSolver(pybamm.BaseSolver):
                 check_solution=False,
             )
             sol.integration_time = integration_time
+            sol.solver_stats = solver_stats
             return sol
+
+    @staticmethod
+    def _get_integrator_stats(integrator):
+        """
+        Return the statistics of the last call to a casadi integrator.
+        """
+        stats = integrator.stats()
+        return pybamm.SolverStats(
+            number_of_steps=stats.get("nsteps"),
+            number_of_residual_evaluations=stats.get("nfevals"),
+            number_of_jacobian_evaluations=stats.get("n_call_jacF"),
+            number_of_linear_solver_setups=stats.get("nlinsetups"),
+            number_of_nonlinear_iterations=stats.get("nniters"),
+            number_of_error_test_failures=stats.get("netfails"),
+            residual_time=stats.get("t_wall_daeF"),
+            jacobian_time=stats.get("t_wall_jacF"),
+        )
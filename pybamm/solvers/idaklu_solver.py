@@ -5,7 +5,9 @@ import casadi
 import pybamm
 import numpy as np
 import numbers
+import os
 import scipy.sparse as sparse
+import threading
 
 import importlib
 
@@ -22,10 +24,22 @@ def have_idaklu():
     return idaklu_spec is not None
 
 
+# Lock for the counts of the solves that are running (see `IDAKLUSolver.solve`)
+_active_solves_lock = threading.Lock()
+
+
 class IDAKLUSolver(pybamm.BaseSolver):
     """
     Solve a discretised model, using sundials with the KLU sparse linear solver.
 
+    A model that has been solved once can be solved from several threads at the
+    same time (e.g. with a :class:`concurrent.futures.ThreadPoolExecutor`), each
+    with its own clone of the compiled solver, as long as its initial state does
+    not depend on the input parameters. The initial state of each solve is stored
+    on the model (`model.y0`), which is shared by the threads, so concurrent solves
+    of models whose initial conditions or consistent algebraic states depend on
+    the inputs, or that are restarted at discontinuities, raise a SolverError.
+
     Parameters
     ----------
     rtol : float, optional
@@ -73,10 +87,30 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 "precon_half_bandwidth_keep": 5,
                 # Number of threads available for OpenMP
                 "num_threads": 1,
+                # let IDA take its natural steps, and interpolate the solution at
+                # the times in t_eval, instead of stopping at each of them
+                "dense_output": False,
             }
 
         Note: These options only have an effect if model.convert_to_format == 'casadi'
 
+    compile_functions : bool or :class:`pybamm.CasadiFunctionCompiler`, optional
+        Whether to compile the residual, Jacobian, Jacobian action and event
+        functions to native code, with the given compiler (or a default one if
+        True). Only used if model.convert_to_format == 'casadi', and not when
+        calculating sensitivities. Default is False.
+    expand_functions : bool, optional
+        Whether to expand the residual, Jacobian, Jacobian action and event
+        functions from MX to SX, which are faster to evaluate for small and
+        medium-sized models. Functions that cannot be expanded are left as MX. Only
+        used if model.convert_to_format == 'casadi'. Default is False.
+    natural_steps : bool, optional
+        Whether to return the solution at the steps taken by IDA, instead of at the
+        times in `t_eval` (see :class:`pybamm.BaseSolver`). Only supported if
+        model.convert_to_format == 'casadi'. Default is False.
+    natural_steps_tol : float, optional
+        The tolerance to thin the natural steps with (see
+        :class:`pybamm.BaseSolver`). Default is None, which keeps all the steps.
 
     """
 
@@ -89,6 +123,10 @@ class IDAKLUSolver(pybamm.BaseSolver):
         extrap_tol=None,
         output_variables=[],
         options=None,
+        compile_functions=False,
+        expand_functions=False,
+        natural_steps=False,
+        natural_steps_tol=None,
     ):
         # set default options,
         # (only if user does not supply)
@@ -101,6 +139,7 @@ class IDAKLUSolver(pybamm.BaseSolver):
             "precon_half_bandwidth": 5,
             "precon_half_bandwidth_keep": 5,
             "num_threads": 1,
+            "dense_output": False,
         }
         if options is None:
             options = default_options
@@ -123,8 +162,15 @@ class IDAKLUSolver(pybamm.BaseSolver):
             root_tol,
             extrap_tol,
             output_variables,
+            compile_functions,
+            expand_functions,
+            natural_steps,
+            natural_steps_tol,
         )
         self.name = "IDA KLU solver"
+        self.supports_natural_steps = True
+        # number of solves of each model that are running (in different threads)
+        self._active_solves = {}
 
         pybamm.citations.register("Hindmarsh2000")
         pybamm.citations.register("Hindmarsh2005")
@@ -281,10 +327,14 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 # Convert derivative functions for sensitivities
                 if (len(inputs) > 0) and (model.calculate_sensitivities):
                     self.dvar_dy_idaklu_fcns.append(
-                        idaklu.generate_function(self.computed_dvar_dy_fcns[key].serialize())
+                        idaklu.generate_function(
+                            self.computed_dvar_dy_fcns[key].serialize()
+                        )
                     )
                     self.dvar_dp_idaklu_fcns.append(
-                        idaklu.generate_function(self.computed_dvar_dp_fcns[key].serialize())
+                        idaklu.generate_function(
+                            self.computed_dvar_dp_fcns[key].serialize()
+                        )
                     )
 
         else:
@@ -432,6 +482,18 @@ class IDAKLUSolver(pybamm.BaseSolver):
         atol = self._check_atol_type(atol, y0.size)
 
         if model.convert_to_format == "casadi":
+            # the residual and Jacobian action were expanded when they were processed
+            jac_times_cjmass, rootfn = self._expand(model, [jac_times_cjmass, rootfn])
+            (
+                rhs_algebraic,
+                jac_times_cjmass,
+                jac_rhs_algebraic_action,
+                rootfn,
+            ) = self._compile(
+                model,
+                [rhs_algebraic, jac_times_cjmass, jac_rhs_algebraic_action, rootfn],
+            )
+
             rhs_algebraic = idaklu.generate_function(rhs_algebraic.serialize())
             jac_times_cjmass = idaklu.generate_function(jac_times_cjmass.serialize())
             jac_rhs_algebraic_action = idaklu.generate_function(
@@ -462,34 +524,18 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 "var_idaklu_fcns": self.var_idaklu_fcns,
                 "dvar_dy_idaklu_fcns": self.dvar_dy_idaklu_fcns,
                 "dvar_dp_idaklu_fcns": self.dvar_dp_idaklu_fcns,
+                "number_of_states": len(y0),
+                "inputs_length": len(inputs),
+                "atol": atol,
+                "rtol": rtol,
             }
 
-            solver = idaklu.create_casadi_solver(
-                number_of_states=len(y0),
-                number_of_parameters=self._setup["number_of_sensitivity_parameters"],
-                rhs_alg=self._setup["rhs_algebraic"],
-                jac_times_cjmass=self._setup["jac_times_cjmass"],
-                jac_times_cjmass_colptrs=self._setup["jac_times_cjmass_colptrs"],
-                jac_times_cjmass_rowvals=self._setup["jac_times_cjmass_rowvals"],
-                jac_times_cjmass_nnz=self._setup["jac_times_cjmass_nnz"],
-                jac_bandwidth_lower=jac_bw_lower,
-                jac_bandwidth_upper=jac_bw_upper,
-                jac_action=self._setup["jac_rhs_algebraic_action"],
-                mass_action=self._setup["mass_action"],
-                sens=self._setup["sensfn"],
-                events=self._setup["rootfn"],
-                number_of_events=self._setup["num_of_events"],
-                rhs_alg_id=self._setup["ids"],
-                atol=atol,
-                rtol=rtol,
-                inputs=len(inputs),
-                var_casadi_fcns=self._setup["var_idaklu_fcns"],
-                dvar_dy_fcns=self._setup["dvar_dy_idaklu_fcns"],
-                dvar_dp_fcns=self._setup["dvar_dp_idaklu_fcns"],
-                options=self._options,
-            )
-
-            self._setup["solver"] = solver
+            self._setup["solver"] = self._create_casadi_solver()
+            # solvers used by the threads of batched solves (see `_integrate_batch`)
+            self._setup["batch_solvers"] = [self._setup["solver"]]
+            # solvers used by the threads that call `solve` (see `_integrate`)
+            self._setup["thread_solvers"] = threading.local()
+            self._setup["thread_solvers"].solver = self._setup["solver"]
         else:
             self._setup = {
                 "resfn": resfn,
@@ -505,27 +551,129 @@ class IDAKLUSolver(pybamm.BaseSolver):
 
         return base_set_up_return
 
-    def _integrate(self, model, t_eval, inputs_dict=None):
+    def _create_casadi_solver(self):
         """
-        Solve a DAE model defined by residuals with initial conditions y0.
+        Create a compiled casadi solver from the functions in `self._setup`.
+        """
+        return idaklu.create_casadi_solver(
+            number_of_states=self._setup["number_of_states"],
+            number_of_parameters=self._setup["number_of_sensitivity_parameters"],
+            rhs_alg=self._setup["rhs_algebraic"],
+            jac_times_cjmass=self._setup["jac_times_cjmass"],
+            jac_times_cjmass_colptrs=self._setup["jac_times_cjmass_colptrs"],
+            jac_times_cjmass_rowvals=self._setup["jac_times_cjmass_rowvals"],
+            jac_times_cjmass_nnz=self._setup["jac_times_cjmass_nnz"],
+            jac_bandwidth_lower=self._setup["jac_bandwidth_lower"],
+            jac_bandwidth_upper=self._setup["jac_bandwidth_upper"],
+            jac_action=self._setup["jac_rhs_algebraic_action"],
+            mass_action=self._setup["mass_action"],
+            sens=self._setup["sensfn"],
+            events=self._setup["rootfn"],
+            number_of_events=self._setup["num_of_events"],
+            rhs_alg_id=self._setup["ids"],
+            atol=self._setup["atol"],
+            rtol=self._setup["rtol"],
+            inputs=self._setup["inputs_length"],
+            var_casadi_fcns=self._setup["var_idaklu_fcns"],
+            dvar_dy_fcns=self._setup["dvar_dy_idaklu_fcns"],
+            dvar_dp_fcns=self._setup["dvar_dp_idaklu_fcns"],
+            options={**self._options, "natural_steps": self.natural_steps},
+        )
 
-        Parameters
-        ----------
-        model : :class:`pybamm.BaseModel`
-            The model whose solution to calculate.
-        t_eval : numeric type
-            The times at which to compute the solution
-        inputs_dict : dict, optional
-            Any input parameters to pass to the model when solving
+    def _stack_inputs(self, inputs_dict):
+        """
+        Stack a dictionary of inputs into a column vector.
         """
-        inputs_dict = inputs_dict or {}
-        # stack inputs
         if inputs_dict:
             arrays_to_stack = [np.array(x).reshape(-1, 1) for x in inputs_dict.values()]
-            inputs = np.vstack(arrays_to_stack)
+            return np.vstack(arrays_to_stack)
         else:
-            inputs = np.array([[]])
+            return np.array([[]])
+
+    @staticmethod
+    def _get_solver_stats(sol):
+        """
+        Return the statistics recorded by the compiled solver for a solve (only
+        recorded for casadi models).
+        """
+        stats = {
+            name: int(value) if name.startswith("number_of") else value
+            for name, value in sol.stats.items()
+        }
+        return pybamm.SolverStats(**stats)
+
+    def copy(self):
+        """Returns a copy of the solver"""
+        new_solver = super().copy()
+        new_solver._active_solves = {}
+        return new_solver
+
+    def solve(self, model, *args, **kwargs):
+        """
+        See :meth:`pybamm.BaseSolver.solve`. Raises a SolverError if the model is
+        being solved in another thread, unless it has been set up and its initial
+        state does not depend on the input parameters (see
+        :class:`pybamm.IDAKLUSolver`).
+        """
+        with _active_solves_lock:
+            concurrent = self._active_solves.get(model, 0) > 0
+            if concurrent and not self._can_solve_concurrently(model):
+                raise pybamm.SolverError(
+                    "The IDAKLU solver can only solve a model from several threads "
+                    "at once after it has been set up (solved once), and if its "
+                    "initial state does not depend on the input parameters"
+                )
+            self._active_solves[model] = self._active_solves.get(model, 0) + 1
+        try:
+            return super().solve(model, *args, **kwargs)
+        finally:
+            with _active_solves_lock:
+                self._active_solves[model] -= 1
+                if self._active_solves[model] == 0:
+                    del self._active_solves[model]
+
+    def _can_solve_concurrently(self, model):
+        """
+        Whether the model can be solved in several threads at once: it must have
+        been set up, and the initial state that `solve` stores on the model must be
+        the same for every solve, i.e. not depend on the input parameters (through
+        the initial conditions or the consistent algebraic states) or be reset at
+        discontinuities.
+        """
+        if model not in self._model_set_up:
+            return False
+        if "state_depends_on_inputs" not in self._setup:
+            symbols = [model.concatenated_initial_conditions]
+            if model.len_alg > 0:
+                symbols.append(model.concatenated_algebraic)
+            has_inputs = any(
+                isinstance(node, pybamm.InputParameter)
+                for symbol in symbols
+                for node in symbol.pre_order()
+            )
+            has_discontinuities = len(model.discontinuity_events_eval) > 0
+            self._setup["state_depends_on_inputs"] = has_inputs or has_discontinuities
+        return not self._setup["state_depends_on_inputs"]
 
+    def _get_thread_solver(self):
+        """
+        Return the compiled solver of the current thread, which is cloned from the
+        compiled solver of the model the first time a thread solves. The compiled
+        solvers release the GIL while they integrate, so threads (e.g. of a
+        :class:`concurrent.futures.ThreadPoolExecutor`) can solve at the same time,
+        each with its own integrator memory and work buffers. The clones are
+        thread-local, so they are freed when their thread ends.
+        """
+        thread_solvers = self._setup["thread_solvers"]
+        if not hasattr(thread_solvers, "solver"):
+            thread_solvers.solver = self._setup["solver"].clone()
+        return thread_solvers.solver
+
+    def _get_initial_state(self, model):
+        """
+        Return the initial state of the model and its time derivative (which the
+        solver sets to zero), including the sensitivities if there are any.
+        """
         # do this here cause y0 is set after set_up (calc consistent conditions)
         y0 = model.y0
         if isinstance(y0, casadi.DM):
@@ -552,6 +700,60 @@ class IDAKLUSolver(pybamm.BaseSolver):
         else:
             y0full = y0
             ydot0full = ydot0
+        return y0, ydot0, y0full, ydot0full
+
+    def _integrate_batch(self, model, t_eval, inputs_list, nproc, chunksize):
+        """
+        Solve a casadi model for each set of inputs in `inputs_list` in a single call
+        to the compiled solver, which shares the input sets out between `nproc`
+        threads (default is the number of CPUs). The integration time of each
+        solution is the time taken by its own solve, not by the whole batch. Other
+        models are solved as in :meth:`pybamm.BaseSolver._integrate_batch`.
+        """
+        if model.convert_to_format != "casadi":
+            return super()._integrate_batch(
+                model, t_eval, inputs_list, nproc, chunksize
+            )
+
+        # each thread needs its own compiled solver
+        number_of_threads = min(nproc or os.cpu_count(), len(inputs_list))
+        solvers = self._setup["batch_solvers"]
+        while len(solvers) < number_of_threads:
+            solvers.append(self._setup["solver"].clone())
+
+        # inputs are passed as a (number of inputs, number of input sets) array
+        inputs = np.hstack([self._stack_inputs(d) for d in inputs_list])
+        if inputs.size == 0:
+            inputs = np.zeros((0, len(inputs_list)))
+        _, _, y0full, ydot0full = self._get_initial_state(model)
+
+        sols = idaklu.solve_batch(
+            solvers[:number_of_threads], t_eval, y0full, ydot0full, inputs
+        )
+
+        return [
+            self._post_process_solution(
+                sol, model, pybamm.TimerTime(sol.integration_time), inputs_dict
+            )
+            for sol, inputs_dict in zip(sols, inputs_list)
+        ]
+
+    def _integrate(self, model, t_eval, inputs_dict=None):
+        """
+        Solve a DAE model defined by residuals with initial conditions y0.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : numeric type
+            The times at which to compute the solution
+        inputs_dict : dict, optional
+            Any input parameters to pass to the model when solving
+        """
+        inputs_dict = inputs_dict or {}
+        inputs = self._stack_inputs(inputs_dict)
+        y0, ydot0, y0full, ydot0full = self._get_initial_state(model)
 
         try:
             atol = model.atol
@@ -563,13 +765,18 @@ class IDAKLUSolver(pybamm.BaseSolver):
 
         timer = pybamm.Timer()
         if model.convert_to_format == "casadi":
-            sol = self._setup["solver"].solve(
+            sol = self._get_thread_solver().solve(
                 t_eval,
                 y0full,
                 ydot0full,
                 inputs,
             )
         else:
+            if self.natural_steps:
+                raise pybamm.SolverError(
+                    "The IDAKLU solver can only return the solution at its natural "
+                    "steps for models converted to casadi"
+                )
             sol = idaklu.solve_python(
                 t_eval,
                 y0,
@@ -592,13 +799,40 @@ class IDAKLUSolver(pybamm.BaseSolver):
             )
         integration_time = timer.time()
 
+        return self._post_process_solution(sol, model, integration_time, inputs_dict)
+
+    def _thin_solution_steps(self, sol):
+        """
+        Thin the natural steps of a solution returned by the compiled solver, in
+        place (see :meth:`pybamm.BaseSolver._thin_natural_steps`).
+        """
+        y = sol.y.reshape((sol.t.size, -1))
+        keep = self._thin_natural_steps(sol.t, y.T)
+        if len(keep) == sol.t.size:
+            return
+        sol.t = sol.t[keep]
+        sol.y = y[keep].reshape(-1)
+        # the sensitivities are (time, variable, parameter) if output variables are
+        # computed, and (parameter, time, state) otherwise
+        if self.output_variables:
+            sol.yS = sol.yS[keep]
+        else:
+            sol.yS = sol.yS[:, keep]
+
+    def _post_process_solution(self, sol, model, integration_time, inputs_dict):
+        """
+        Convert a solution returned by the compiled solver to a
+        :class:`pybamm.Solution`.
+        """
         number_of_sensitivity_parameters = self._setup[
             "number_of_sensitivity_parameters"
         ]
         sensitivity_names = self._setup["sensitivity_names"]
+        if self.natural_steps:
+            self._thin_solution_steps(sol)
         t = sol.t
         number_of_timesteps = t.size
-        number_of_states = y0.size
+        number_of_states = model.y0.shape[0]
         if self.output_variables:
             # Substitute empty vectors for state vector 'y'
             y_out = np.zeros((number_of_timesteps * number_of_states, 0))
@@ -638,6 +872,7 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 sensitivities=yS_out,
             )
             newsol.integration_time = integration_time
+            newsol.solver_stats = self._get_solver_stats(sol)
             if self.output_variables:
                 # Populate variables and sensititivies dictionaries directly
                 number_of_samples = sol.y.shape[0] // number_of_timesteps
@@ -33,6 +33,9 @@ class ProcessedVariable(object):
         Default is True.
     """
 
+    # Number of time points evaluated in each call to the mapped casadi function
+    _map_chunk_size = 100
+
     def __init__(
         self,
         base_variables,
@@ -114,16 +117,15 @@ class ProcessedVariable(object):
         # initialise empty array of the correct size
         entries = np.empty(len(self.t_pts))
         idx = 0
-        # Evaluate the base_variable index-by-index
+        # Evaluate the base_variable sub-solution by sub-solution
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[idx] = float(base_var_casadi(t, y, inputs))
-
-                idx += 1
+            n_t = len(ts)
+            entries[idx : idx + n_t] = self._evaluate_base_variable(
+                base_var_casadi, ts, ys, inputs
+            )[0]
+            idx += n_t
 
         if self.cumtrapz_ic is not None:
             entries = cumulative_trapezoid(
@@ -140,16 +142,16 @@ class ProcessedVariable(object):
         len_space = self.base_eval_shape[0]
         entries = np.empty((len_space, len(self.t_pts)))
 
-        # Evaluate the base_variable index-by-index
+        # Evaluate the base_variable sub-solution by sub-solution
         idx = 0
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, idx] = base_var_casadi(t, y, inputs).full()[:, 0]
-                idx += 1
+            n_t = len(ts)
+            entries[:, idx : idx + n_t] = self._evaluate_base_variable(
+                base_var_casadi, ts, ys, inputs
+            )
+            idx += n_t
 
         # Get node and edge values
         nodes = self.mesh.nodes
@@ -209,20 +211,18 @@ class ProcessedVariable(object):
         second_dim_size = len(second_dim_pts)
         entries = np.empty((first_dim_size, second_dim_size, len(self.t_pts)))
 
-        # Evaluate the base_variable index-by-index
+        # Evaluate the base_variable sub-solution by sub-solution
         idx = 0
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [first_dim_size, second_dim_size],
-                    order="F",
-                )
-                idx += 1
+            n_t = len(ts)
+            entries[:, :, idx : idx + n_t] = np.reshape(
+                self._evaluate_base_variable(base_var_casadi, ts, ys, inputs),
+                [first_dim_size, second_dim_size, n_t],
+                order="F",
+            )
+            idx += n_t
 
         # add points outside first dimension domain for extrapolation to
         # boundaries
@@ -306,20 +306,18 @@ class ProcessedVariable(object):
         len_z = len(z_sol)
         entries = np.empty((len_y, len_z, len(self.t_pts)))
 
-        # Evaluate the base_variable index-by-index
+        # Evaluate the base_variable sub-solution by sub-solution
         idx = 0
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [len_y, len_z],
-                    order="C",
-                )
-                idx += 1
+            n_t = len(ts)
+            entries[:, :, idx : idx + n_t] = np.reshape(
+                self._evaluate_base_variable(base_var_casadi, ts, ys, inputs),
+                [len_y, len_z, n_t],
+                order="C",
+            )
+            idx += n_t
 
         # assign attributes for reference
         self.entries = entries
@@ -337,6 +335,86 @@ class ProcessedVariable(object):
             coords={"y": y_sol, "z": z_sol, "t": self.t_pts},
         )
 
+    def _evaluate_base_variable(self, base_var_casadi, ts, ys, inputs):
+        """
+        Evaluate a casadi function at every time point of a sub-solution.
+
+        The function is mapped over chunks of time points and evaluated straight into
+        a numpy array, so that only a few casadi calls are made per sub-solution
+        rather than one per time point. If the function cannot be mapped, fall back
+        to evaluating it time point by time point.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of size (n, len(ts)), where n is the size of the variable
+        """
+        if base_var_casadi.size2_out(0) == 1:
+            try:
+                return self._evaluate_base_variable_mapped(
+                    base_var_casadi, ts, ys, inputs
+                )
+            except RuntimeError:
+                pybamm.logger.debug(
+                    "Could not map '{}', evaluating index-by-index".format(
+                        base_var_casadi.name()
+                    )
+                )
+        return np.hstack(
+            [
+                np.reshape(
+                    base_var_casadi(t, ys[:, inner_idx], inputs).full(),
+                    (-1, 1),
+                    order="F",
+                )
+                for inner_idx, t in enumerate(ts)
+            ]
+        )
+
+    def _evaluate_base_variable_mapped(self, base_var_casadi, ts, ys, inputs):
+        n_t = len(ts)
+        size = base_var_casadi.size1_out(0)
+        ts = np.ascontiguousarray(ts, dtype=float)
+        # Evaluate directly into a numpy buffer if possible. Otherwise (e.g. if the
+        # states are stored as a casadi.DM), call the mapped function on each chunk
+        use_buffer = (
+            isinstance(ys, np.ndarray) and base_var_casadi.sparsity_out(0).is_dense()
+        )
+        if use_buffer:
+            # casadi matrices are column-major, so the states at each time point
+            # must be contiguous in memory
+            ys_T = np.ascontiguousarray(ys.T, dtype=float)
+            inputs = np.ascontiguousarray(casadi.DM(inputs).full(), dtype=float)
+            entries_T = np.empty((n_t, size))
+        else:
+            entries = np.empty((size, n_t))
+
+        n_mapped = None
+        for start in range(0, n_t, self._map_chunk_size):
+            end = min(start + self._map_chunk_size, n_t)
+            if end - start != n_mapped:
+                # the inputs are the same at every time point, so are not mapped
+                n_mapped = end - start
+                mapped = base_var_casadi.map(
+                    "mapped_" + base_var_casadi.name(), "serial", n_mapped, [2], []
+                )
+                if use_buffer:
+                    buffer, evaluate = mapped.buffer()
+                    buffer.set_arg(2, memoryview(inputs.ravel()))
+            if use_buffer:
+                buffer.set_arg(0, memoryview(ts[start:end]))
+                buffer.set_arg(1, memoryview(ys_T[start:end]))
+                buffer.set_res(0, memoryview(entries_T[start:end]))
+                evaluate()
+            else:
+                entries[:, start:end] = mapped(
+                    ts[start:end], ys[:, start:end], inputs
+                ).full()
+
+        if use_buffer:
+            return entries_T.T
+        return entries
+
     def _process_spatial_variable_names(self, spatial_variable):
         if len(spatial_variable) == 0:
             return None
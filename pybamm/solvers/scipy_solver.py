@@ -25,6 +25,13 @@ class ScipySolver(pybamm.BaseSolver):
         Any options to pass to the solver.
         Please consult `SciPy documentation <https://tinyurl.com/yafgqg9y>`_ for
         details.
+    natural_steps : bool, optional
+        Whether to return the solution at the steps taken by the integrator, instead
+        of at the times in `t_eval` (see :class:`pybamm.BaseSolver`). Default is
+        False.
+    natural_steps_tol : float, optional
+        The tolerance to thin the natural steps with (see
+        :class:`pybamm.BaseSolver`). Default is None, which keeps all the steps.
     """
 
     def __init__(
@@ -34,14 +41,19 @@ class ScipySolver(pybamm.BaseSolver):
         atol=1e-6,
         extrap_tol=None,
         extra_options=None,
+        natural_steps=False,
+        natural_steps_tol=None,
     ):
         super().__init__(
             method=method,
             rtol=rtol,
             atol=atol,
             extrap_tol=extrap_tol,
+            natural_steps=natural_steps,
+            natural_steps_tol=natural_steps_tol,
         )
         self.ode_solver = True
+        self.supports_natural_steps = True
         self.extra_options = extra_options or {}
         self.name = "Scipy solver ({})".format(method)
         pybamm.citations.register("Virtanen2020")
@@ -120,12 +132,18 @@ class ScipySolver(pybamm.BaseSolver):
             rhs,
             (t_eval[0], t_eval[-1]),
             y0,
-            t_eval=t_eval,
+            t_eval=None if self.natural_steps else t_eval,
             method=self.method,
             dense_output=True,
             **extra_options
         )
         integration_time = timer.time()
+        solver_stats = pybamm.SolverStats(
+            number_of_steps=len(sol.sol.ts) - 1 if sol.sol is not None else None,
+            number_of_residual_evaluations=sol.nfev,
+            number_of_jacobian_evaluations=sol.njev,
+            number_of_linear_solver_setups=sol.nlu,
+        )
 
         if sol.success:
             # Set the reason for termination
@@ -141,9 +159,12 @@ class ScipySolver(pybamm.BaseSolver):
                 termination = "final time"
                 t_event = None
                 y_event = np.array(None)
+            keep = slice(None)
+            if self.natural_steps:
+                keep = self._thin_natural_steps(sol.t, sol.y)
             sol = pybamm.Solution(
-                sol.t,
-                sol.y,
+                sol.t[keep],
+                sol.y[:, keep],
                 model,
                 inputs_dict,
                 t_event,
@@ -152,6 +173,7 @@ class ScipySolver(pybamm.BaseSolver):
                 sensitivities=bool(model.calculate_sensitivities),
             )
             sol.integration_time = integration_time
+            sol.solver_stats = solver_stats
             return sol
         else:
             raise pybamm.SolverError(sol.message)
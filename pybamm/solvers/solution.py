@@ -118,6 +118,9 @@ class Solution(object):
         self.solve_time = None
         self.integration_time = None
 
+        # Statistics of the integrator calls, set by the solver
+        self.solver_stats = pybamm.SolverStats()
+
         # initialize empty variables and data
         self._variables = pybamm.FuzzyDict()
         self.data = pybamm.FuzzyDict()
@@ -733,76 +736,178 @@ class Solution(object):
             raise pybamm.SolverError(
                 "Only a Solution or None can be added to a Solution"
             )
+        new_sol = self.copy()
         # Special case: new solution only has one timestep and it is already in the
-        # existing solution. In this case, return a copy of the existing solution
-        if (
-            len(other.all_ts) == 1
-            and len(other.all_ts[0]) == 1
-            and other.all_ts[0][0] == self.all_ts[-1][-1]
-        ):
-            new_sol = self.copy()
-            # Update termination using the latter solution
-            new_sol._termination = other.termination
-            new_sol._t_event = other._t_event
-            new_sol._y_event = other._y_event
-            return new_sol
+        # existing solution, in which case only the termination is updated
+        if not self._is_repeated_last_state(other):
+            new_sol.sensitivities = bool(self.sensitivities)
+            new_sol.set_up_time = None
+        new_sol.append(other)
+        return new_sol
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def append(self, other):
+        """
+        Appends another solution to this one in place, e.g. when stepping.
+
+        Unlike `__add__`, this does not create a new solution and copy the lists of
+        times, states, models and inputs, so building up a solution one step at a
+        time has a total cost that is linear in the number of steps. If `t` and `y`
+        have already been computed, they are extended rather than recomputed.
+
+        Parameters
+        ----------
+        other : :class:`pybamm.Solution`, :class:`pybamm.EmptySolution` or None
+            The solution to append. Appending None or an empty solution does nothing.
+
+        Returns
+        -------
+        :class:`pybamm.Solution`
+            This solution, for convenience
+        """
+        if other is None or isinstance(other, EmptySolution):
+            return self
+        if not isinstance(other, Solution):
+            raise pybamm.SolverError(
+                "Only a Solution or None can be appended to a Solution"
+            )
+
+        # Update termination using the latter solution
+        self._termination = other.termination
+        self._t_event = other._t_event
+        self._y_event = other._y_event
+
+        # Special case: new solution only has one timestep and it is already in the
+        # existing solution, so there is nothing else to update
+        if self._is_repeated_last_state(other):
+            return self
 
         # Update list of sub-solutions
         if other.all_ts[0][0] == self.all_ts[-1][-1]:
             # Skip first time step if it is repeated
-            all_ts = self.all_ts + [other.all_ts[0][1:]] + other.all_ts[1:]
-            all_ys = self.all_ys + [other.all_ys[0][:, 1:]] + other.all_ys[1:]
+            new_ts = [other.all_ts[0][1:]] + other.all_ts[1:]
+            new_ys = [other.all_ys[0][:, 1:]] + other.all_ys[1:]
         else:
-            all_ts = self.all_ts + other.all_ts
-            all_ys = self.all_ys + other.all_ys
-
-        new_sol = Solution(
-            all_ts,
-            all_ys,
-            self.all_models + other.all_models,
-            self.all_inputs + other.all_inputs,
-            other.t_event,
-            other.y_event,
-            other.termination,
-            bool(self.sensitivities),
-        )
-
-        new_sol.closest_event_idx = other.closest_event_idx
-        new_sol._all_inputs_casadi = self.all_inputs_casadi + other.all_inputs_casadi
+            new_ts = other.all_ts
+            new_ys = other.all_ys
+
+        # A new solution is its own (only) sub-solution, so replace it with a copy
+        # that will not be extended
+        if self._sub_solutions == [self]:
+            sub_solution = self.copy()
+            sub_solution._sub_solutions = [sub_solution]
+            self._sub_solutions = [sub_solution]
+
+        self._all_ts.extend(new_ts)
+        self._all_ys.extend(new_ys)
+        self._all_models.extend(other.all_models)
+        self.all_inputs.extend(other.all_inputs)
+        self._sub_solutions.extend(other.sub_solutions)
+        if "all_inputs_casadi" in self.__dict__:
+            self.all_inputs_casadi.extend(other.all_inputs_casadi)
+        self._extend_t_and_y(new_ts, new_ys)
+
+        self.closest_event_idx = other.closest_event_idx
 
         # Set solution time
-        new_sol.solve_time = self.solve_time + other.solve_time
-        new_sol.integration_time = self.integration_time + other.integration_time
+        self.solve_time = self.solve_time + other.solve_time
+        self.integration_time = self.integration_time + other.integration_time
+        self.solver_stats = self.solver_stats + other.solver_stats
 
-        # Set sub_solutions
-        new_sol._sub_solutions = self.sub_solutions + other.sub_solutions
+        # Clear anything that was computed from the previous states
+        self.__dict__.pop("last_state", None)
+        self._variables = pybamm.FuzzyDict()
+        self.data = pybamm.FuzzyDict()
 
-        return new_sol
+        return self
 
-    def __radd__(self, other):
-        return self.__add__(other)
+    def _is_repeated_last_state(self, other):
+        return (
+            len(other.all_ts) == 1
+            and len(other.all_ts[0]) == 1
+            and other.all_ts[0][0] == self.all_ts[-1][-1]
+        )
+
+    def _extend_t_and_y(self, new_ts, new_ys):
+        """
+        Extend the cached `t` and `y` (if they have been computed) with new times and
+        states, or clear them if they cannot be extended (in which case they are
+        recomputed, and any errors raised, when they are next accessed)
+        """
+        if hasattr(self, "_t"):
+            new_t = np.concatenate(new_ts)
+            if len(new_t) == 0 or (
+                new_t[0] > self._t[-1] and all(np.diff(new_t) > 0)
+            ):
+                self._t_buffer, self._t = _append_to_buffer(
+                    getattr(self, "_t_buffer", None), self._t, new_t
+                )
+            else:
+                del self._t
+        if hasattr(self, "_y"):
+            if isinstance(self._y, np.ndarray) and all(
+                isinstance(y, np.ndarray) and y.shape[0] == self._y.shape[0]
+                for y in new_ys
+            ):
+                self._y_buffer, self._y = _append_to_buffer(
+                    getattr(self, "_y_buffer", None), self._y, np.hstack(new_ys)
+                )
+            else:
+                del self._y
 
     def copy(self):
         new_sol = self.__class__(
-            self.all_ts,
-            self.all_ys,
-            self.all_models,
-            self.all_inputs,
+            self.all_ts[:],
+            self.all_ys[:],
+            self.all_models[:],
+            self.all_inputs[:],
             self.t_event,
             self.y_event,
             self.termination,
         )
         new_sol._all_inputs_casadi = self.all_inputs_casadi
-        new_sol._sub_solutions = self.sub_solutions
+        new_sol._sub_solutions = self.sub_solutions[:]
         new_sol.closest_event_idx = self.closest_event_idx
 
         new_sol.solve_time = self.solve_time
         new_sol.integration_time = self.integration_time
         new_sol.set_up_time = self.set_up_time
+        new_sol.solver_stats = self.solver_stats
 
         return new_sol
 
 
+def _append_to_buffer(buffer, data, new_data):
+    """
+    Append `new_data` to `data` along the last axis, where `data` is a view of the
+    start of `buffer`. The buffer is reallocated with twice the required size when it
+    is too small, so that appending repeatedly has amortised constant cost.
+
+    Returns
+    -------
+    buffer : :class:`numpy.ndarray`
+        The (possibly reallocated) buffer
+    data : :class:`numpy.ndarray`
+        A view of the start of the buffer, containing `data` and `new_data`
+    """
+    n = data.shape[-1]
+    n_total = n + new_data.shape[-1]
+    dtype = np.result_type(data, new_data)
+    if (
+        buffer is None
+        or data.base is not buffer
+        or buffer.shape[-1] < n_total
+        or buffer.dtype != dtype
+    ):
+        new_buffer = np.empty(data.shape[:-1] + (2 * n_total,), dtype=dtype)
+        new_buffer[..., :n] = data
+        buffer = new_buffer
+    buffer[..., n:n_total] = new_data
+    return buffer, buffer[..., :n_total]
+
+
 class EmptySolution:
     def __init__(self, termination=None, t=None):
         self.termination = termination
@@ -851,7 +956,10 @@ def make_cycle_solution(step_solutions, esoh_solver=None, save_this_cycle=True):
     """
     sum_sols = step_solutions[0].copy()
     for step_solution in step_solutions[1:]:
-        sum_sols = sum_sols + step_solution
+        if isinstance(sum_sols, Solution):
+            sum_sols.append(step_solution)
+        else:
+            sum_sols = sum_sols + step_solution
 
     cycle_solution = Solution(
         sum_sols.all_ts,
@@ -868,6 +976,7 @@ def make_cycle_solution(step_solutions, esoh_solver=None, save_this_cycle=True):
     cycle_solution.solve_time = sum_sols.solve_time
     cycle_solution.integration_time = sum_sols.integration_time
     cycle_solution.set_up_time = sum_sols.set_up_time
+    cycle_solution.solver_stats = sum_sols.solver_stats
 
     cycle_solution.steps = step_solutions
 
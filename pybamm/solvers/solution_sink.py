@@ -0,0 +1,177 @@
+#
+# Sinks to stream the cycles of an experiment solution to disk
+#
+import os
+import numpy as np
+import pybamm
+
+
+class SolutionSink:
+    """
+    Base class for sinks to which the cycles of an experiment are streamed as they
+    finish. When a sink is passed to :meth:`pybamm.Simulation.solve`, each finished
+    cycle is written to the sink and then dropped from memory, so that the memory
+    used by long experiments does not grow with the number of cycles.
+
+    **EXPERIMENTAL** - this class is experimental and the sink interface may change
+    in future releases.
+
+    Parameters
+    ----------
+    output_variables : list of str, optional
+        The variables to write for each cycle. Default is "Time [s]", "Current [A]"
+        and "Voltage [V]". The summary variables of each cycle are always written.
+    """
+
+    def __init__(self, output_variables=None):
+        self.output_variables = output_variables or [
+            "Time [s]",
+            "Current [A]",
+            "Voltage [V]",
+        ]
+
+    def write_cycle(self, cycle_number, cycle_solution, summary_variables):
+        """
+        Write a finished cycle to the sink.
+
+        Parameters
+        ----------
+        cycle_number : int
+            The number of the cycle (1-indexed)
+        cycle_solution : :class:`pybamm.Solution`
+            The solution for the cycle
+        summary_variables : dict
+            The summary variables for the cycle
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Write any data still held by the sink. Called at the end of the experiment.
+        """
+        pass
+
+
+class NpzSolutionSink(SolutionSink):
+    """
+    Sink that writes the cycles of an experiment to a directory of numpy `.npz`
+    files, with `cycles_per_file` cycles in each file. The cycles can be loaded
+    back with :meth:`load_cycle` and :meth:`load_summary_variables`, which only
+    read the files written by this sink (not, e.g., files left in the directory by
+    an earlier run).
+
+    **EXPERIMENTAL** - this class is experimental and the sink interface may change
+    in future releases.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which to write the files. Created if it does not exist.
+    output_variables : list of str, optional
+        The variables to write for each cycle. See :class:`pybamm.SolutionSink`.
+    cycles_per_file : int, optional
+        The number of cycles to hold in memory before writing them to a file.
+        Default is 1.
+    """
+
+    def __init__(self, directory, output_variables=None, cycles_per_file=1):
+        super().__init__(output_variables)
+        self.directory = directory
+        self.cycles_per_file = cycles_per_file
+        os.makedirs(directory, exist_ok=True)
+        self._buffer = {}
+        self._buffered_cycles = []
+        # the files written by this sink, with the first and last cycle in each
+        self._files = []
+
+    def write_cycle(self, cycle_number, cycle_solution, summary_variables):
+        """See :meth:`SolutionSink.write_cycle`"""
+        for name in self.output_variables:
+            self._buffer[f"cycle {cycle_number}/{name}"] = cycle_solution[name].data
+        for name, value in summary_variables.items():
+            self._buffer[f"cycle {cycle_number}/summary/{name}"] = value
+        self._buffered_cycles.append(cycle_number)
+        if len(self._buffered_cycles) >= self.cycles_per_file:
+            self.close()
+
+    def close(self):
+        """See :meth:`SolutionSink.close`"""
+        if len(self._buffered_cycles) == 0:
+            return
+        first, last = self._buffered_cycles[0], self._buffered_cycles[-1]
+        filename = os.path.join(self.directory, f"cycles_{first:06d}_{last:06d}.npz")
+        np.savez(filename, **self._buffer)
+        self._files.append((first, last, filename))
+        self._buffer = {}
+        self._buffered_cycles = []
+
+    def load_cycle(self, cycle_number):
+        """
+        Load the output variables and summary variables written for a cycle.
+
+        Parameters
+        ----------
+        cycle_number : int
+            The number of the cycle (1-indexed)
+
+        Returns
+        -------
+        variables : dict
+            The output variables of the cycle
+        summary_variables : dict
+            The summary variables of the cycle
+        """
+        prefix = f"cycle {cycle_number}/"
+        # the last file holding the cycle, in case it was written more than once
+        for first, last, filename in reversed(self._files):
+            if first <= cycle_number <= last:
+                with np.load(filename) as data:
+                    cycle_data = {
+                        key[len(prefix) :]: data[key]
+                        for key in data.files
+                        if key.startswith(prefix)
+                    }
+                break
+        else:
+            raise KeyError(f"Cycle {cycle_number} has not been written to the sink")
+        variables = {}
+        summary_variables = {}
+        for name, value in cycle_data.items():
+            if name.startswith("summary/"):
+                summary_variables[name[len("summary/") :]] = value[()]
+            else:
+                variables[name] = value
+        return variables, summary_variables
+
+    def load_summary_variables(self):
+        """
+        Load the summary variables of all the cycles written to the sink.
+
+        Returns
+        -------
+        :class:`pybamm.FuzzyDict`
+            The summary variables, as arrays over the cycles, including the
+            "Cycle number"
+        """
+        # summary variables of each cycle, keyed by cycle number (a cycle written
+        # more than once keeps the values that were written last)
+        cycles = {}
+        for _, _, filename in self._files:
+            with np.load(filename) as data:
+                for key in data.files:
+                    cycle, name = key.split("/", 1)
+                    if not name.startswith("summary/"):
+                        continue
+                    cycle_number = int(cycle[len("cycle ") :])
+                    summary_name = name[len("summary/") :]
+                    cycles.setdefault(cycle_number, {})[summary_name] = data[key][()]
+        cycle_numbers = sorted(cycles)
+        names = dict.fromkeys(name for cycle in cycles.values() for name in cycle)
+        summary_variables = {
+            name: np.array(
+                [cycles[number].get(name, np.nan) for number in cycle_numbers]
+            )
+            for name in names
+        }
+        summary_variables["Cycle number"] = np.array(cycle_numbers)
+        return pybamm.FuzzyDict(summary_variables)
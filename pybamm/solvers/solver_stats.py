@@ -0,0 +1,115 @@
+#
+# Statistics of the integrators that calculated a solution
+#
+
+
+class SolverStats:
+    """
+    Statistics of the integrator calls that calculated a solution, to find the
+    expensive parts of a simulation (e.g. the steps of an experiment) and to choose
+    tolerances and linear solvers. Each solver records the statistics that its
+    integrator provides, and the others are None. The statistics are summed when
+    solutions are added or appended, e.g. over the windows between discontinuities
+    or over the steps and cycles of an experiment.
+
+    Parameters
+    ----------
+    number_of_steps : int, optional
+        The number of (accepted) steps taken by the integrator
+    number_of_residual_evaluations : int, optional
+        The number of evaluations of the residual (or right-hand side) function
+    number_of_jacobian_evaluations : int, optional
+        The number of evaluations of the Jacobian
+    number_of_linear_solver_setups : int, optional
+        The number of setups (e.g. factorisations) of the linear solver
+    number_of_nonlinear_iterations : int, optional
+        The number of iterations of the nonlinear solver
+    number_of_error_test_failures : int, optional
+        The number of steps that failed the local error test
+    number_of_root_function_calls : int, optional
+        The number of evaluations of the event (root) functions
+    residual_time : float, optional
+        The time spent evaluating the residual function, in seconds
+    jacobian_time : float, optional
+        The time spent evaluating the Jacobian, in seconds
+    linear_solve_time : float, optional
+        The time spent setting up and solving the linear systems, in seconds
+    """
+
+    fields = [
+        "number_of_steps",
+        "number_of_residual_evaluations",
+        "number_of_jacobian_evaluations",
+        "number_of_linear_solver_setups",
+        "number_of_nonlinear_iterations",
+        "number_of_error_test_failures",
+        "number_of_root_function_calls",
+        "residual_time",
+        "jacobian_time",
+        "linear_solve_time",
+    ]
+
+    def __init__(
+        self,
+        number_of_steps=None,
+        number_of_residual_evaluations=None,
+        number_of_jacobian_evaluations=None,
+        number_of_linear_solver_setups=None,
+        number_of_nonlinear_iterations=None,
+        number_of_error_test_failures=None,
+        number_of_root_function_calls=None,
+        residual_time=None,
+        jacobian_time=None,
+        linear_solve_time=None,
+    ):
+        self.number_of_steps = number_of_steps
+        self.number_of_residual_evaluations = number_of_residual_evaluations
+        self.number_of_jacobian_evaluations = number_of_jacobian_evaluations
+        self.number_of_linear_solver_setups = number_of_linear_solver_setups
+        self.number_of_nonlinear_iterations = number_of_nonlinear_iterations
+        self.number_of_error_test_failures = number_of_error_test_failures
+        self.number_of_root_function_calls = number_of_root_function_calls
+        self.residual_time = residual_time
+        self.jacobian_time = jacobian_time
+        self.linear_solve_time = linear_solve_time
+
+    def __add__(self, other):
+        """
+        Sum two sets of statistics. A statistic that is only recorded in one of
+        them is kept, and one that is recorded in neither stays None.
+        """
+        if other is None:
+            return self.copy()
+        if not isinstance(other, SolverStats):
+            return NotImplemented
+        new_stats = SolverStats()
+        for name in self.fields:
+            value, other_value = getattr(self, name), getattr(other, name)
+            if value is None:
+                setattr(new_stats, name, other_value)
+            elif other_value is None:
+                setattr(new_stats, name, value)
+            else:
+                setattr(new_stats, name, value + other_value)
+        return new_stats
+
+    def __radd__(self, other):
+        # allow sum() of a list of statistics
+        if other == 0 or other is None:
+            return self.copy()
+        return NotImplemented
+
+    def copy(self):
+        return SolverStats(**self.as_dict())
+
+    def as_dict(self):
+        """Return the statistics as a dictionary, keyed by name"""
+        return {name: getattr(self, name) for name in self.fields}
+
+    def __repr__(self):
+        recorded = ", ".join(
+            f"{name}={value}"
+            for name, value in self.as_dict().items()
+            if value is not None
+        )
+        return f"SolverStats({recorded})"
@@ -7,7 +7,6 @@ from scipy.sparse import (
     diags,
     spdiags,
     eye,
-    kron,
     csr_matrix,
     vstack,
     hstack,
@@ -17,6 +16,36 @@ from scipy.sparse import (
 import numpy as np
 
 
+def block_diagonal(sub_matrix, repeats):
+    """
+    Block-diagonal matrix with `repeats` copies of `sub_matrix` on the diagonal,
+    i.e. `csr_matrix(kron(eye(repeats), sub_matrix))`, assembled directly from the
+    compressed rows of the block instead of going through the coordinate format.
+
+    Parameters
+    ----------
+    sub_matrix : :class:`scipy.sparse.spmatrix` or :class:`numpy.ndarray`
+        The block
+    repeats : int
+        The number of copies of the block
+
+    Returns
+    -------
+    :class:`scipy.sparse.csr_matrix`
+        The block-diagonal matrix
+    """
+    block = csr_matrix(sub_matrix)
+    n_rows, n_cols = block.shape
+    nnz = block.indptr[-1]
+    offsets = np.arange(repeats)[:, np.newaxis]
+    data = np.tile(block.data[:nnz], repeats)
+    indices = (block.indices[:nnz] + n_cols * offsets).ravel()
+    indptr = np.append((block.indptr[:-1] + nnz * offsets).ravel(), nnz * repeats)
+    return csr_matrix(
+        (data, indices, indptr), shape=(n_rows * repeats, n_cols * repeats)
+    )
+
+
 class FiniteVolume(pybamm.SpatialMethod):
     """
     A class which implements the steps specific to the finite volume method during
@@ -40,6 +69,23 @@ class FiniteVolume(pybamm.SpatialMethod):
         for dom in mesh.keys():
             mesh[dom].npts_for_broadcast_to_nodes = mesh[dom].npts
 
+        # The operator matrices only depend on the mesh, so they are assembled once
+        # for each combination of operator, domain, boundary condition types and
+        # number of repeats in the auxiliary domains, and shared by all the symbols
+        self._operator_cache = {}
+
+    def _get_operator(self, key, assemble):
+        """
+        Get an operator matrix from the cache of operators on the mesh, assembling it
+        with `assemble()` if it is not in the cache yet.
+        """
+        try:
+            return self._operator_cache[key]
+        except KeyError:
+            operator = assemble()
+            self._operator_cache[key] = operator
+            return operator
+
     def spatial_variable(self, symbol):
         """
         Creates a discretised spatial variable compatible with
@@ -108,25 +154,24 @@ class FiniteVolume(pybamm.SpatialMethod):
         :class:`pybamm.Matrix`
             The (sparse) finite volume gradient matrix for the domain
         """
-        # Create appropriate submesh by combining submeshes in primary domain
-        submesh = self.mesh[domain]
-
-        # Create 1D matrix using submesh
-        n = submesh.npts
-        e = 1 / submesh.d_nodes
-        sub_matrix = diags([-e, e], [0, 1], shape=(n - 1, n))
-
         # number of repeats
         second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
 
-        # generate full matrix from the submatrix
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
+        def assemble():
+            # Create appropriate submesh by combining submeshes in primary domain
+            submesh = self.mesh[domain]
+
+            # Create 1D matrix using submesh
+            n = submesh.npts
+            e = 1 / submesh.d_nodes
+            sub_matrix = diags([-e, e], [0, 1], shape=(n - 1, n))
+
+            # generate full matrix from the submatrix
+            return pybamm.Matrix(block_diagonal(sub_matrix, second_dim_repeats))
 
-        return pybamm.Matrix(matrix)
+        return self._get_operator(
+            ("gradient", tuple(domain), second_dim_repeats), assemble
+        )
 
     def divergence(self, symbol, discretised_symbol, boundary_conditions):
         """Matrix-vector multiplication to implement the divergence operator.
@@ -166,35 +211,36 @@ class FiniteVolume(pybamm.SpatialMethod):
         :class:`pybamm.Matrix`
             The (sparse) finite volume divergence matrix for the domain
         """
-        # Create appropriate submesh by combining submeshes in domain
-        submesh = self.mesh[domains["primary"]]
+        # repeat matrix for each node in secondary dimensions
+        second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
 
-        # check coordinate system
-        if submesh.coord_sys in ["cylindrical polar", "spherical polar"]:
-            r_edges_left = submesh.edges[:-1]
-            r_edges_right = submesh.edges[1:]
-            if submesh.coord_sys == "spherical polar":
-                d_edges = (r_edges_right**3 - r_edges_left**3) / 3
-            elif submesh.coord_sys == "cylindrical polar":
-                d_edges = (r_edges_right**2 - r_edges_left**2) / 2
-        else:
-            d_edges = submesh.d_edges
+        def assemble():
+            # Create appropriate submesh by combining submeshes in domain
+            submesh = self.mesh[domains["primary"]]
 
-        e = 1 / d_edges
+            # check coordinate system
+            if submesh.coord_sys in ["cylindrical polar", "spherical polar"]:
+                r_edges_left = submesh.edges[:-1]
+                r_edges_right = submesh.edges[1:]
+                if submesh.coord_sys == "spherical polar":
+                    d_edges = (r_edges_right**3 - r_edges_left**3) / 3
+                elif submesh.coord_sys == "cylindrical polar":
+                    d_edges = (r_edges_right**2 - r_edges_left**2) / 2
+            else:
+                d_edges = submesh.d_edges
 
-        # Create matrix using submesh
-        n = submesh.npts + 1
-        sub_matrix = diags([-e, e], [0, 1], shape=(n - 1, n))
+            e = 1 / d_edges
 
-        # repeat matrix for each node in secondary dimensions
-        second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
-        # generate full matrix from the submatrix
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-        return pybamm.Matrix(matrix)
+            # Create matrix using submesh
+            n = submesh.npts + 1
+            sub_matrix = diags([-e, e], [0, 1], shape=(n - 1, n))
+
+            # generate full matrix from the submatrix
+            return pybamm.Matrix(block_diagonal(sub_matrix, second_dim_repeats))
+
+        return self._get_operator(
+            ("divergence", tuple(domains["primary"]), second_dim_repeats), assemble
+        )
 
     def laplacian(self, symbol, discretised_symbol, boundary_conditions):
         """
@@ -248,47 +294,19 @@ class FiniteVolume(pybamm.SpatialMethod):
             )
 
         domain = child.domains[integration_dimension]
-        submesh = self.mesh[domain]
-
-        # check coordinate system
-        if submesh.coord_sys in ["cylindrical polar", "spherical polar"]:
-            r_edges_left = submesh.edges[:-1]
-            r_edges_right = submesh.edges[1:]
-            if submesh.coord_sys == "spherical polar":
-                d_edges = 4 * np.pi * (r_edges_right**3 - r_edges_left**3) / 3
-            elif submesh.coord_sys == "cylindrical polar":
-                d_edges = 2 * np.pi * (r_edges_right**2 - r_edges_left**2) / 2
-        else:
-            d_edges = submesh.d_edges
 
         if integration_dimension == "primary":
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh[domains["primary"]]
-
-            # Create vector of ones for primary domain submesh
-
-            if vector_type == "row":
-                d_edges = d_edges[np.newaxis, :]
-            elif vector_type == "column":
-                d_edges = d_edges[:, np.newaxis]
-
             # repeat matrix for each node in secondary dimensions
             second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
-            # generate full matrix from the submatrix
-            matrix = kron(eye(second_dim_repeats), d_edges)
+            key = ("definite integral", tuple(domain), vector_type, second_dim_repeats)
         elif integration_dimension == "secondary":
-            # Create appropriate submesh by combining submeshes in domain
-            primary_submesh = self.mesh[domains["primary"]]
-
-            # Create matrix which integrates in the secondary dimension
             # Different number of edges depending on whether child evaluates on edges
             # in the primary dimensions
+            primary_submesh = self.mesh[domains["primary"]]
             if child.evaluates_on_edges("primary"):
                 n_primary_pts = primary_submesh.npts + 1
             else:
                 n_primary_pts = primary_submesh.npts
-            int_matrix = hstack([d_edge * eye(n_primary_pts) for d_edge in d_edges])
-
             # repeat matrix for each node in higher dimensions
             third_dim_repeats = self._get_auxiliary_domain_repeats(
                 {
@@ -297,14 +315,43 @@ class FiniteVolume(pybamm.SpatialMethod):
                     if (k == "tertiary" or k == "quaternary")
                 }
             )
-            # generate full matrix from the submatrix
-            matrix = kron(eye(third_dim_repeats), int_matrix)
-        # generate full matrix from the submatrix
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        return pybamm.Matrix(csr_matrix(matrix))
+            key = (
+                "secondary definite integral",
+                tuple(domain),
+                n_primary_pts,
+                third_dim_repeats,
+            )
+
+        def assemble():
+            submesh = self.mesh[domain]
+
+            # check coordinate system
+            if submesh.coord_sys in ["cylindrical polar", "spherical polar"]:
+                r_edges_left = submesh.edges[:-1]
+                r_edges_right = submesh.edges[1:]
+                if submesh.coord_sys == "spherical polar":
+                    d_edges = 4 * np.pi * (r_edges_right**3 - r_edges_left**3) / 3
+                elif submesh.coord_sys == "cylindrical polar":
+                    d_edges = 2 * np.pi * (r_edges_right**2 - r_edges_left**2) / 2
+            else:
+                d_edges = submesh.d_edges
+
+            if integration_dimension == "primary":
+                if vector_type == "row":
+                    d_edges = d_edges[np.newaxis, :]
+                elif vector_type == "column":
+                    d_edges = d_edges[:, np.newaxis]
+
+                # generate full matrix from the submatrix
+                matrix = block_diagonal(d_edges, second_dim_repeats)
+            elif integration_dimension == "secondary":
+                # Create matrix which integrates in the secondary dimension
+                int_matrix = hstack([d_edge * eye(n_primary_pts) for d_edge in d_edges])
+                # generate full matrix from the submatrix
+                matrix = block_diagonal(int_matrix, third_dim_repeats)
+            return pybamm.Matrix(matrix)
+
+        return self._get_operator(key, assemble)
 
     def indefinite_integral(self, child, discretised_child, direction):
         """Implementation of the indefinite integral operator."""
@@ -409,35 +456,40 @@ class FiniteVolume(pybamm.SpatialMethod):
         indefinite integral matrix to ignore these.
         """
 
-        # Create appropriate submesh by combining submeshes in domain
-        submesh = self.mesh[domains["primary"]]
-        n = submesh.npts
         second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
 
-        du_n = submesh.d_nodes
-        if direction == "forward":
-            du_entries = [du_n] * (n - 1)
-            offset = -np.arange(1, n, 1)
-            main_integral_matrix = spdiags(du_entries, offset, n, n - 1)
-            bc_offset_matrix = lil_matrix((n, n - 1))
-            bc_offset_matrix[:, 0] = du_n[0] / 2
-        elif direction == "backward":
-            du_entries = [du_n] * (n + 1)
-            offset = np.arange(n, -1, -1)
-            main_integral_matrix = spdiags(du_entries, offset, n, n - 1)
-            bc_offset_matrix = lil_matrix((n, n - 1))
-            bc_offset_matrix[:, -1] = du_n[-1] / 2
-        sub_matrix = main_integral_matrix + bc_offset_matrix
-        # add a column of zeros at each end
-        zero_col = csr_matrix((n, 1))
-        sub_matrix = hstack([zero_col, sub_matrix, zero_col])
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-        return pybamm.Matrix(matrix)
+        def assemble():
+            # Create appropriate submesh by combining submeshes in domain
+            submesh = self.mesh[domains["primary"]]
+            n = submesh.npts
+
+            du_n = submesh.d_nodes
+            if direction == "forward":
+                du_entries = [du_n] * (n - 1)
+                offset = -np.arange(1, n, 1)
+                main_integral_matrix = spdiags(du_entries, offset, n, n - 1)
+                bc_offset_matrix = lil_matrix((n, n - 1))
+                bc_offset_matrix[:, 0] = du_n[0] / 2
+            elif direction == "backward":
+                du_entries = [du_n] * (n + 1)
+                offset = np.arange(n, -1, -1)
+                main_integral_matrix = spdiags(du_entries, offset, n, n - 1)
+                bc_offset_matrix = lil_matrix((n, n - 1))
+                bc_offset_matrix[:, -1] = du_n[-1] / 2
+            sub_matrix = main_integral_matrix + bc_offset_matrix
+            # add a column of zeros at each end
+            zero_col = csr_matrix((n, 1))
+            sub_matrix = hstack([zero_col, sub_matrix, zero_col])
+            # generate full matrix from the submatrix
+            return pybamm.Matrix(block_diagonal(sub_matrix, second_dim_repeats))
+
+        key = (
+            "indefinite integral edges",
+            tuple(domains["primary"]),
+            direction,
+            second_dim_repeats,
+        )
+        return self._get_operator(key, assemble)
 
     def indefinite_integral_matrix_nodes(self, domains, direction):
         """
@@ -459,25 +511,30 @@ class FiniteVolume(pybamm.SpatialMethod):
             The finite volume integral matrix for the domain
         """
 
-        # Create appropriate submesh by combining submeshes in domain
-        submesh = self.mesh[domains["primary"]]
-        n = submesh.npts
         second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
 
-        du_n = submesh.d_edges
-        du_entries = [du_n] * n
-        if direction == "forward":
-            offset = -np.arange(1, n + 1, 1)  # from -1 down to -n
-        elif direction == "backward":
-            offset = np.arange(n - 1, -1, -1)  # from n-1 down to 0
-        sub_matrix = spdiags(du_entries, offset, n + 1, n)
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-        return pybamm.Matrix(matrix)
+        def assemble():
+            # Create appropriate submesh by combining submeshes in domain
+            submesh = self.mesh[domains["primary"]]
+            n = submesh.npts
+
+            du_n = submesh.d_edges
+            du_entries = [du_n] * n
+            if direction == "forward":
+                offset = -np.arange(1, n + 1, 1)  # from -1 down to -n
+            elif direction == "backward":
+                offset = np.arange(n - 1, -1, -1)  # from n-1 down to 0
+            sub_matrix = spdiags(du_entries, offset, n + 1, n)
+            # generate full matrix from the submatrix
+            return pybamm.Matrix(block_diagonal(sub_matrix, second_dim_repeats))
+
+        key = (
+            "indefinite integral nodes",
+            tuple(domains["primary"]),
+            direction,
+            second_dim_repeats,
+        )
+        return self._get_operator(key, assemble)
 
     def delta_function(self, symbol, discretised_symbol):
         """
@@ -507,11 +564,7 @@ class FiniteVolume(pybamm.SpatialMethod):
         # is the same as the integral of the child
         domain_width = submesh.edges[-1] - submesh.edges[0]
         # Generate full matrix from the submatrix
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = kron(eye(second_dim_repeats), sub_matrix).toarray()
+        matrix = block_diagonal(sub_matrix, second_dim_repeats).toarray()
 
         # Return delta function, keep domains
         delta_fn = pybamm.Matrix(domain_width / dx * matrix) * discretised_symbol
@@ -554,14 +607,12 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         left_sub_matrix = np.zeros((1, left_npts))
         left_sub_matrix[0][left_npts - 1] = 1
-        left_matrix = pybamm.Matrix(
-            csr_matrix(kron(eye(second_dim_repeats), left_sub_matrix))
-        )
+        left_matrix = pybamm.Matrix(block_diagonal(left_sub_matrix, second_dim_repeats))
 
         right_sub_matrix = np.zeros((1, right_npts))
         right_sub_matrix[0][0] = 1
         right_matrix = pybamm.Matrix(
-            csr_matrix(kron(eye(second_dim_repeats), right_sub_matrix))
+            block_diagonal(right_sub_matrix, second_dim_repeats)
         )
 
         # Finite volume derivative
@@ -626,10 +677,51 @@ class FiniteVolume(pybamm.SpatialMethod):
             domain = domain + [domain[-1] + "_right ghost cell"]
             n_bcs += 1
 
+        def assemble():
+            # Matrices that put the values of the ghost nodes in place
+            if lbc_type == "Dirichlet":
+                lbc_sub_matrix = coo_matrix(([1], ([0], [0])), shape=(n + n_bcs, 1))
+                lbc_matrix = block_diagonal(lbc_sub_matrix, second_dim_repeats)
+            else:
+                lbc_matrix = None
+            if rbc_type == "Dirichlet":
+                rbc_sub_matrix = coo_matrix(
+                    ([1], ([n + n_bcs - 1], [0])), shape=(n + n_bcs, 1)
+                )
+                rbc_matrix = block_diagonal(rbc_sub_matrix, second_dim_repeats)
+            else:
+                rbc_matrix = None
+
+            # Make matrix to calculate ghost nodes
+            # coo_matrix takes inputs (data, (row, col)) and puts data[i] at the point
+            # (row[i], col[i]) for each index of data.
+            if lbc_type == "Dirichlet":
+                left_ghost_vector = coo_matrix(([-1], ([0], [0])), shape=(1, n))
+            else:
+                left_ghost_vector = None
+            if rbc_type == "Dirichlet":
+                right_ghost_vector = coo_matrix(([-1], ([0], [n - 1])), shape=(1, n))
+            else:
+                right_ghost_vector = None
+            sub_matrix = vstack([left_ghost_vector, eye(n), right_ghost_vector])
+
+            # repeat matrix for secondary dimensions
+            matrix = block_diagonal(sub_matrix, second_dim_repeats)
+            return lbc_matrix, rbc_matrix, matrix
+
+        lbc_matrix, rbc_matrix, matrix = self._get_operator(
+            (
+                "ghost nodes",
+                tuple(symbol.domain),
+                lbc_type,
+                rbc_type,
+                second_dim_repeats,
+            ),
+            assemble,
+        )
+
         # Calculate values for ghost nodes for any Dirichlet boundary conditions
         if lbc_type == "Dirichlet":
-            lbc_sub_matrix = coo_matrix(([1], ([0], [0])), shape=(n + n_bcs, 1))
-            lbc_matrix = csr_matrix(kron(eye(second_dim_repeats), lbc_sub_matrix))
             if lbc_value.evaluates_to_number():
                 left_ghost_constant = (
                     2 * lbc_value * pybamm.Vector(np.ones(second_dim_repeats))
@@ -647,10 +739,6 @@ class FiniteVolume(pybamm.SpatialMethod):
             )
 
         if rbc_type == "Dirichlet":
-            rbc_sub_matrix = coo_matrix(
-                ([1], ([n + n_bcs - 1], [0])), shape=(n + n_bcs, 1)
-            )
-            rbc_matrix = csr_matrix(kron(eye(second_dim_repeats), rbc_sub_matrix))
             if rbc_value.evaluates_to_number():
                 right_ghost_constant = (
                     2 * rbc_value * pybamm.Vector(np.ones(second_dim_repeats))
@@ -673,26 +761,6 @@ class FiniteVolume(pybamm.SpatialMethod):
         # has domain electrode, since it is a function of the macroscopic variables
         bcs_vector.copy_domains(discretised_symbol)
 
-        # Make matrix to calculate ghost nodes
-        # coo_matrix takes inputs (data, (row, col)) and puts data[i] at the point
-        # (row[i], col[i]) for each index of data.
-        if lbc_type == "Dirichlet":
-            left_ghost_vector = coo_matrix(([-1], ([0], [0])), shape=(1, n))
-        else:
-            left_ghost_vector = None
-        if rbc_type == "Dirichlet":
-            right_ghost_vector = coo_matrix(([-1], ([0], [n - 1])), shape=(1, n))
-        else:
-            right_ghost_vector = None
-        sub_matrix = vstack([left_ghost_vector, eye(n), right_ghost_vector])
-
-        # repeat matrix for secondary dimensions
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
         new_symbol = pybamm.Matrix(matrix) @ discretised_symbol + bcs_vector
 
         return new_symbol, domain
@@ -743,10 +811,46 @@ class FiniteVolume(pybamm.SpatialMethod):
         if rbc_type == "Neumann":
             n_bcs += 1
 
+        def assemble():
+            # Matrices that put the values from Neumann boundary conditions in place
+            if lbc_type == "Neumann":
+                lbc_sub_matrix = coo_matrix(([1], ([0], [0])), shape=(n + n_bcs, 1))
+                lbc_matrix = block_diagonal(lbc_sub_matrix, second_dim_repeats)
+            else:
+                lbc_matrix = None
+            if rbc_type == "Neumann":
+                rbc_sub_matrix = coo_matrix(
+                    ([1], ([n + n_bcs - 1], [0])), shape=(n + n_bcs, 1)
+                )
+                rbc_matrix = block_diagonal(rbc_sub_matrix, second_dim_repeats)
+            else:
+                rbc_matrix = None
+
+            # Make matrix which makes "gaps" in the the discretised gradient into
+            # which the known Neumann values will be added. E.g. in 1D if the left
+            # boundary condition is Dirichlet and the right Neumann, this matrix will
+            # act to append a zero to the end of the discretised gradient
+            if lbc_type == "Neumann":
+                left_vector = csr_matrix((1, n))
+            else:
+                left_vector = None
+            if rbc_type == "Neumann":
+                right_vector = csr_matrix((1, n))
+            else:
+                right_vector = None
+            sub_matrix = vstack([left_vector, eye(n), right_vector])
+
+            # repeat matrix for secondary dimensions
+            matrix = block_diagonal(sub_matrix, second_dim_repeats)
+            return lbc_matrix, rbc_matrix, matrix
+
+        lbc_matrix, rbc_matrix, matrix = self._get_operator(
+            ("neumann values", tuple(domain), lbc_type, rbc_type, second_dim_repeats),
+            assemble,
+        )
+
         # Add any values from Neumann boundary conditions to the bcs vector
         if lbc_type == "Neumann" and lbc_value != 0:
-            lbc_sub_matrix = coo_matrix(([1], ([0], [0])), shape=(n + n_bcs, 1))
-            lbc_matrix = csr_matrix(kron(eye(second_dim_repeats), lbc_sub_matrix))
             if lbc_value.evaluates_to_number():
                 left_bc = lbc_value * pybamm.Vector(np.ones(second_dim_repeats))
             else:
@@ -761,10 +865,6 @@ class FiniteVolume(pybamm.SpatialMethod):
                 )
             )
         if rbc_type == "Neumann" and rbc_value != 0:
-            rbc_sub_matrix = coo_matrix(
-                ([1], ([n + n_bcs - 1], [0])), shape=(n + n_bcs, 1)
-            )
-            rbc_matrix = csr_matrix(kron(eye(second_dim_repeats), rbc_sub_matrix))
             if rbc_value.evaluates_to_number():
                 right_bc = rbc_value * pybamm.Vector(np.ones(second_dim_repeats))
             else:
@@ -785,27 +885,6 @@ class FiniteVolume(pybamm.SpatialMethod):
         # has domain electrode, since it is a function of the macroscopic variables
         bcs_vector.copy_domains(discretised_gradient)
 
-        # Make matrix which makes "gaps" in the the discretised gradient into
-        # which the known Neumann values will be added. E.g. in 1D if the left
-        # boundary condition is Dirichlet and the right Neumann, this matrix will
-        # act to append a zero to the end of the discretised gradient
-        if lbc_type == "Neumann":
-            left_vector = csr_matrix((1, n))
-        else:
-            left_vector = None
-        if rbc_type == "Neumann":
-            right_vector = csr_matrix((1, n))
-        else:
-            right_vector = None
-        sub_matrix = vstack([left_vector, eye(n), right_vector])
-
-        # repeat matrix for secondary dimensions
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
         new_gradient = pybamm.Matrix(matrix) @ discretised_gradient + bcs_vector
 
         return new_gradient
@@ -1008,11 +1087,7 @@ class FiniteVolume(pybamm.SpatialMethod):
                     raise NotImplementedError
 
         # Generate full matrix from the submatrix
-        # Convert to csr_matrix so that we can take the index (row-slicing), which is
-        # not supported by the default kron format
-        # Note that this makes column-slicing inefficient, but this should not be an
-        # issue
-        matrix = csr_matrix(kron(eye(repeats), sub_matrix))
+        matrix = block_diagonal(sub_matrix, repeats)
 
         # Return boundary value with domain given by symbol
         boundary_value = pybamm.Matrix(matrix) @ discretised_child
@@ -1162,40 +1237,47 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         def arithmetic_mean(array):
             """Calculate the arithmetic mean of an array using matrix multiplication"""
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh[array.domain]
-
-            # Create 1D matrix using submesh
-            n = submesh.npts
-
-            if shift_key == "node to edge":
-                sub_matrix_left = csr_matrix(
-                    ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
-                )
-                sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
-                sub_matrix_right = csr_matrix(
-                    ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
-                )
-                sub_matrix = vstack(
-                    [sub_matrix_left, sub_matrix_center, sub_matrix_right]
-                )
-            elif shift_key == "edge to node":
-                sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
-            else:
-                raise ValueError("shift key '{}' not recognised".format(shift_key))
             # Second dimension length
             second_dim_repeats = self._get_auxiliary_domain_repeats(
                 discretised_symbol.domains
             )
 
-            # Generate full matrix from the submatrix
-            # Convert to csr_matrix so that we can take the index (row-slicing), which
-            # is not supported by the default kron format
-            # Note that this makes column-slicing inefficient, but this should not be an
-            # issue
-            matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
+            def assemble():
+                # Create appropriate submesh by combining submeshes in domain
+                submesh = self.mesh[array.domain]
+
+                # Create 1D matrix using submesh
+                n = submesh.npts
+
+                if shift_key == "node to edge":
+                    sub_matrix_left = csr_matrix(
+                        ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
+                    )
+                    sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
+                    sub_matrix_right = csr_matrix(
+                        ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
+                    )
+                    sub_matrix = vstack(
+                        [sub_matrix_left, sub_matrix_center, sub_matrix_right]
+                    )
+                elif shift_key == "edge to node":
+                    sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
+                else:
+                    raise ValueError("shift key '{}' not recognised".format(shift_key))
 
-            return pybamm.Matrix(matrix) @ array
+                # Generate full matrix from the submatrix
+                return pybamm.Matrix(block_diagonal(sub_matrix, second_dim_repeats))
+
+            matrix = self._get_operator(
+                (
+                    "arithmetic mean",
+                    tuple(array.domain),
+                    shift_key,
+                    second_dim_repeats,
+                ),
+                assemble,
+            )
+            return matrix @ array
 
         def harmonic_mean(array):
             """
@@ -1220,113 +1302,103 @@ class FiniteVolume(pybamm.SpatialMethod):
             [2] Recktenwald, Gerald. "The control-volume finite-difference
             approximation to the diffusion equation." (2012).
             """
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh[array.domain]
-
             # Get second dimension length for use later
             second_dim_repeats = self._get_auxiliary_domain_repeats(
                 discretised_symbol.domains
             )
 
-            # Create 1D matrix using submesh
-            n = submesh.npts
+            def assemble():
+                # Create appropriate submesh by combining submeshes in domain
+                submesh = self.mesh[array.domain]
 
-            if shift_key == "node to edge":
-                # Matrix to compute values at the exterior edges
-                edges_sub_matrix_left = csr_matrix(
-                    ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
-                )
-                edges_sub_matrix_center = csr_matrix((n - 1, n))
-                edges_sub_matrix_right = csr_matrix(
-                    ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
-                )
-                edges_sub_matrix = vstack(
-                    [
-                        edges_sub_matrix_left,
-                        edges_sub_matrix_center,
-                        edges_sub_matrix_right,
-                    ]
-                )
+                # Create 1D matrix using submesh
+                n = submesh.npts
 
-                # Generate full matrix from the submatrix
-                # Convert to csr_matrix so that we can take the index (row-slicing),
-                # which is not supported by the default kron format
-                # Note that this makes column-slicing inefficient, but this should
-                # not be an issue
-                edges_matrix = csr_matrix(
-                    kron(eye(second_dim_repeats), edges_sub_matrix)
-                )
-
-                # Matrix to extract the node values running from the first node
-                # to the penultimate node in the primary dimension (D_1 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D1 = hstack([eye(n - 1), csr_matrix((n - 1, 1))])
-                matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
-                D1 = pybamm.Matrix(matrix_D1) @ array
-
-                # Matrix to extract the node values running from the second node
-                # to the final node in the primary dimension  (D_2 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D2 = hstack([csr_matrix((n - 1, 1)), eye(n - 1)])
-                matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
-                D2 = pybamm.Matrix(matrix_D2) @ array
-
-                # Compute weight beta
-                dx = submesh.d_edges
-                sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
-                beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
+                if shift_key == "node to edge":
+                    # Matrix to compute values at the exterior edges
+                    edges_sub_matrix_left = csr_matrix(
+                        ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
+                    )
+                    edges_sub_matrix_center = csr_matrix((n - 1, n))
+                    edges_sub_matrix_right = csr_matrix(
+                        ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
+                    )
+                    edges_sub_matrix = vstack(
+                        [
+                            edges_sub_matrix_left,
+                            edges_sub_matrix_center,
+                            edges_sub_matrix_right,
+                        ]
+                    )
+                    edges_matrix = pybamm.Matrix(
+                        block_diagonal(edges_sub_matrix, second_dim_repeats)
+                    )
 
-                # Compute harmonic mean on internal edges
-                # Note: add small number to denominator to regularise D_eff
-                D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
+                    # Matrix to extract the node values running from the first node
+                    # to the penultimate node in the primary dimension (D_1 in the
+                    # definiton of the harmonic mean)
+                    sub_matrix_D1 = hstack([eye(n - 1), csr_matrix((n - 1, 1))])
+                    # Matrix to extract the node values running from the second node
+                    # to the final node in the primary dimension  (D_2 in the
+                    # definiton of the harmonic mean)
+                    sub_matrix_D2 = hstack([csr_matrix((n - 1, 1)), eye(n - 1)])
+
+                    # Compute weight beta
+                    dx = submesh.d_edges
+
+                    # Matrix to pad zeros at the beginning and end of the array where
+                    # the exterior edge values will be added
+                    sub_matrix = vstack(
+                        [csr_matrix((1, n - 1)), eye(n - 1), csr_matrix((1, n - 1))]
+                    )
+                    matrix = pybamm.Matrix(
+                        block_diagonal(sub_matrix, second_dim_repeats)
+                    )
+                elif shift_key == "edge to node":
+                    edges_matrix = None
+                    matrix = None
+                    # Matrix to extract the edge values running from the first edge
+                    # to the penultimate edge in the primary dimension (D_1 in the
+                    # definiton of the harmonic mean)
+                    sub_matrix_D1 = hstack([eye(n), csr_matrix((n, 1))])
+                    # Matrix to extract the edge values running from the second edge
+                    # to the final edge in the primary dimension  (D_2 in the
+                    # definiton of the harmonic mean)
+                    sub_matrix_D2 = hstack([csr_matrix((n, 1)), eye(n)])
+
+                    # Compute weight beta
+                    dx0 = submesh.nodes[0] - submesh.edges[0]  # first edge to node
+                    dxN = submesh.edges[-1] - submesh.nodes[-1]  # last node to edge
+                    dx = np.concatenate(([dx0], submesh.d_nodes, [dxN]))
+                else:
+                    raise ValueError("shift key '{}' not recognised".format(shift_key))
 
-                # Matrix to pad zeros at the beginning and end of the array where
-                # the exterior edge values will be added
-                sub_matrix = vstack(
-                    [csr_matrix((1, n - 1)), eye(n - 1), csr_matrix((1, n - 1))]
+                matrix_D1 = pybamm.Matrix(
+                    block_diagonal(sub_matrix_D1, second_dim_repeats)
                 )
-
-                # Generate full matrix from the submatrix
-                # Convert to csr_matrix so that we can take the index (row-slicing),
-                # which is not supported by the default kron format
-                # Note that this makes column-slicing inefficient, but this should
-                # not be an issue
-                matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-                return (
-                    pybamm.Matrix(edges_matrix) @ array + pybamm.Matrix(matrix) @ D_eff
+                matrix_D2 = pybamm.Matrix(
+                    block_diagonal(sub_matrix_D2, second_dim_repeats)
                 )
-
-            elif shift_key == "edge to node":
-                # Matrix to extract the edge values running from the first edge
-                # to the penultimate edge in the primary dimension (D_1 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D1 = hstack([eye(n), csr_matrix((n, 1))])
-                matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
-                D1 = pybamm.Matrix(matrix_D1) @ array
-
-                # Matrix to extract the edge values running from the second edge
-                # to the final edge in the primary dimension  (D_2 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D2 = hstack([csr_matrix((n, 1)), eye(n)])
-                matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
-                D2 = pybamm.Matrix(matrix_D2) @ array
-
-                # Compute weight beta
-                dx0 = submesh.nodes[0] - submesh.edges[0]  # first edge to node
-                dxN = submesh.edges[-1] - submesh.nodes[-1]  # last node to edge
-                dx = np.concatenate(([dx0], submesh.d_nodes, [dxN]))
                 sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
                 beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
+                return edges_matrix, matrix_D1, matrix_D2, beta, matrix
 
-                # Compute harmonic mean on nodes
-                # Note: add small number to denominator to regularise D_eff
-                D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
+            edges_matrix, matrix_D1, matrix_D2, beta, matrix = self._get_operator(
+                ("harmonic mean", tuple(array.domain), shift_key, second_dim_repeats),
+                assemble,
+            )
+            D1 = matrix_D1 @ array
+            D2 = matrix_D2 @ array
 
-                return D_eff
+            # Compute harmonic mean on internal edges (node to edge) or on nodes (edge
+            # to node)
+            # Note: add small number to denominator to regularise D_eff
+            D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
 
+            if shift_key == "node to edge":
+                return edges_matrix @ array + matrix @ D_eff
             else:
-                raise ValueError("shift key '{}' not recognised".format(shift_key))
+                return D_eff
 
         # If discretised_symbol evaluates to number there is no need to average
         if discretised_symbol.size == 1:
@@ -2,7 +2,9 @@
 Tests for the batch_study.py
 """
 from tests import TestCase
+from concurrent.futures import ThreadPoolExecutor
 import os
+import numpy as np
 import pybamm
 import unittest
 
@@ -89,6 +91,100 @@ class TestBatchStudy(TestCase):
             ]
             self.assertIn(output_experiment, experiments_list)
 
+    def test_solve_with_executor(self):
+        models = {"SPM": spm, "SPM uniform": spm_uniform}
+        bs = pybamm.BatchStudy(models=models, repeats=2)
+        bs.solve(t_eval=[0, 3600])
+        for executor in [2, ThreadPoolExecutor(max_workers=2)]:
+            bs_parallel = pybamm.BatchStudy(models=models, repeats=2, executor=executor)
+            bs_parallel.solve(t_eval=[0, 3600])
+
+            # the simulations are returned in the same order
+            self.assertEqual(
+                [sim.model.name for sim in bs_parallel.sims],
+                [sim.model.name for sim in bs.sims],
+            )
+            for sim, sim_parallel in zip(bs.sims, bs_parallel.sims):
+                np.testing.assert_array_almost_equal(
+                    sim.solution["Voltage [V]"].entries,
+                    sim_parallel.solution["Voltage [V]"].entries,
+                )
+
+            # timings are collected for each simulation and each repeat
+            self.assertEqual(len(bs_parallel.timings), 2)
+            for sim, timings in zip(bs_parallel.sims, bs_parallel.timings):
+                self.assertGreater(timings["build time"].value, 0)
+                self.assertEqual(len(timings["solve times"]), 2)
+                self.assertEqual(len(timings["integration times"]), 2)
+                self.assertAlmostEqual(
+                    sim.solution.solve_time.value,
+                    (sum(timings["solve times"]) / 2).value,
+                )
+            if not isinstance(executor, int):
+                executor.shutdown()
+
+        # simulations run in threads do not share a solver
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bs_parallel = pybamm.BatchStudy(
+                models=models,
+                solvers={"casadi 1": casadi_safe, "casadi 2": casadi_safe},
+                executor=executor,
+            )
+            bs_parallel.solve(t_eval=[0, 3600])
+        solvers = [sim.solver for sim in bs_parallel.sims]
+        self.assertIsNot(solvers[0], solvers[1])
+        self.assertNotIn(casadi_safe, solvers)
+        for sim, sim_parallel in zip(bs.sims, bs_parallel.sims):
+            np.testing.assert_array_almost_equal(
+                sim.solution["Voltage [V]"].entries,
+                sim_parallel.solution["Voltage [V]"].entries,
+                decimal=5,
+            )
+
+    def test_solve_with_sweep(self):
+        name = "Negative electrode diffusivity [m2.s-1]"
+        values = [1e-14, 1e-13]
+        param = pybamm.ParameterValues("Chen2020")
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm, "SPM uniform": spm_uniform},
+            parameter_values={"Chen2020": param},
+            sweep={name: values},
+            permutations=True,
+            repeats=2,
+        )
+        bs.solve(t_eval=[0, 3600])
+        self.assertEqual(len(bs.sims), 2)
+        self.assertEqual(param[name], 3.3e-14)
+        for sim, timings in zip(bs.sims, bs.timings):
+            self.assertEqual(len(sim.solution), 2)
+            self.assertEqual(len(timings["solve times"]), 2)
+            # the times of each solution are averaged over the repeats
+            total_integration_time = sum(sol.integration_time for sol in sim.solution)
+            self.assertAlmostEqual(
+                total_integration_time.value,
+                (sum(timings["integration times"]) / 2).value,
+            )
+        for value, sol in zip(values, bs.sims[0].solution):
+            self.assertEqual(sol.all_inputs[0][name], value)
+        # the diffusivity is not used with a uniform profile in the particles
+        self.assertEqual(bs.sims[1].solution[1].all_inputs[0], {})
+
+        # the swept solutions are plotted together, labelled with their values
+        quick_plot = bs.plot(testing=True)
+        self.assertEqual(len(quick_plot.labels), 4)
+        self.assertEqual(
+            quick_plot.labels[:2],
+            [
+                f"Single Particle Model ({name}=1e-14)",
+                f"Single Particle Model ({name}=1e-13)",
+            ],
+        )
+        self.assertEqual(quick_plot.labels[2], "Single Particle Model ()")
+        test_file = "batch_study_sweep_test.gif"
+        bs.quick_plot = None
+        bs.create_gif(number_of_images=3, duration=1, output_filename=test_file)
+        os.remove(test_file)
+
     def test_create_gif(self):
         bs = pybamm.BatchStudy({"spm": pybamm.lithium_ion.SPM()})
         bs.solve([0, 10])
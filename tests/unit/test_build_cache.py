@@ -0,0 +1,226 @@
+#
+# Tests for the BuildCache class
+#
+from tests import TestCase
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+import pybamm
+
+
+class TestBuildCache(TestCase):
+    def test_load_built_model(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = pybamm.lithium_ion.SPM()
+            sim = pybamm.Simulation(model, build_cache=directory)
+            sol = sim.solve([0, 3600])
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            # a new simulation with the same model loads the built model and the
+            # solver set-up from the cache
+            model = pybamm.lithium_ion.SPM()
+            sim_load = pybamm.Simulation(
+                model, build_cache=pybamm.BuildCache(directory)
+            )
+            sim_load.build()
+            self.assertIsNone(sim_load.model_with_set_params)
+            self.assertEqual(sim_load._build_cache_key, sim._build_cache_key)
+            self.assertIsNotNone(sim_load._build_cache_set_up_key)
+            sol_load = sim_load.solve([0, 3600])
+            self.assertIn(sim_load.built_model, sim_load.solver._model_set_up)
+            np.testing.assert_array_almost_equal(
+                sol["Voltage [V]"].entries, sol_load["Voltage [V]"].entries
+            )
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+    def test_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.BuildCache(directory)
+            model = pybamm.lithium_ion.SPM()
+            key = cache.get_simulation_key(pybamm.Simulation(model))
+            self.assertEqual(
+                key,
+                cache.get_simulation_key(pybamm.Simulation(pybamm.lithium_ion.SPM())),
+            )
+
+            # the key changes with the model, parameter values and mesh
+            other_simulations = [
+                pybamm.Simulation(pybamm.lithium_ion.SPMe()),
+                pybamm.Simulation(pybamm.lithium_ion.SPM({"thermal": "lumped"})),
+                pybamm.Simulation(
+                    model, parameter_values=pybamm.ParameterValues("Chen2020")
+                ),
+                pybamm.Simulation(model, var_pts={**model.default_var_pts, "r_n": 10}),
+            ]
+            parameter_values = model.default_parameter_values
+            parameter_values["Current function [A]"] = 1
+            other_simulations.append(
+                pybamm.Simulation(model, parameter_values=parameter_values)
+            )
+            model = pybamm.lithium_ion.SPM()
+            model.variables["New variable"] = pybamm.t
+            other_simulations.append(pybamm.Simulation(model))
+            for sim in other_simulations:
+                self.assertNotEqual(key, cache.get_simulation_key(sim))
+
+    def test_key_parameter_functions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.BuildCache(directory)
+            model = pybamm.lithium_ion.SPM()
+
+            def get_key(function):
+                parameter_values = model.default_parameter_values
+                parameter_values["Negative electrode OCP [V]"] = function
+                return cache.get_simulation_key(
+                    pybamm.Simulation(model, parameter_values=parameter_values)
+                )
+
+            # values captured in closures
+            def make(scale):
+                def ocp(sto):
+                    return scale * (1 - sto)
+
+                return ocp
+
+            self.assertEqual(get_key(make(1.0)), get_key(make(1.0)))
+            self.assertNotEqual(get_key(make(1.0)), get_key(make(2.0)))
+
+            # default arguments
+            def ocp_default(sto, scale=1.0):
+                return scale * (1 - sto)
+
+            key = get_key(ocp_default)
+            ocp_default.__defaults__ = (2.0,)
+            self.assertNotEqual(key, get_key(ocp_default))
+
+            # objects that cannot be hashed reliably are not cached
+            class Scale:
+                def __init__(self, value):
+                    self.value = value
+
+                def __mul__(self, other):
+                    return self.value * other
+
+            self.assertIsNone(get_key(make(Scale(1.0))))
+            parameter_values = model.default_parameter_values
+            parameter_values["Negative electrode OCP [V]"] = make(Scale(1.0))
+            sim = pybamm.Simulation(
+                model, parameter_values=parameter_values, build_cache=cache
+            )
+            sim.solve([0, 600])
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_key_symbol_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = pybamm.lithium_ion.SPM()
+            t = np.linspace(0, 600, 10)
+
+            def get_simulation(scale):
+                parameter_values = pybamm.ParameterValues("Chen2020")
+                parameter_values["Current function [A]"] = pybamm.Interpolant(
+                    t, scale * np.ones(10), pybamm.t
+                )
+                return pybamm.Simulation(
+                    model, parameter_values=parameter_values, build_cache=directory
+                )
+
+            # drive cycles which only differ in their data have different keys
+            cache = pybamm.BuildCache(directory)
+            key = cache.get_simulation_key(get_simulation(1.0))
+            self.assertEqual(key, cache.get_simulation_key(get_simulation(1.0)))
+            self.assertNotEqual(key, cache.get_simulation_key(get_simulation(5.0)))
+
+            get_simulation(1.0).solve([0, 600])
+            solution = get_simulation(5.0).solve([0, 600])
+            np.testing.assert_array_almost_equal(solution["Current [A]"].entries, 5)
+
+            # so do arrays which only differ in their entries
+            keys = set()
+            for entries in [np.ones(3), 2 * np.ones(3)]:
+                new_model = pybamm.lithium_ion.SPM()
+                new_model.variables["Vector"] = pybamm.Vector(entries)
+                keys.add(cache.get_simulation_key(pybamm.Simulation(new_model)))
+            self.assertEqual(len(keys), 2)
+
+    def test_set_up_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.BuildCache(directory)
+            model = pybamm.lithium_ion.SPM()
+            solver = pybamm.CasadiSolver()
+            key = cache.get_set_up_key(solver, model, [0, 1], {"a": 1})
+            self.assertEqual(
+                key,
+                cache.get_set_up_key(pybamm.CasadiSolver(), model, [0, 1], {"a": 2}),
+            )
+            for other_solver, inputs in [
+                (pybamm.CasadiSolver(mode="fast"), {"a": 1}),
+                (pybamm.CasadiSolver(rtol=1e-3), {"a": 1}),
+                (pybamm.ScipySolver(), {"a": 1}),
+                (solver, {"b": 1}),
+                (solver, {"a": np.ones(2)}),
+            ]:
+                self.assertNotEqual(
+                    key, cache.get_set_up_key(other_solver, model, [0, 1], inputs)
+                )
+
+            # solvers that store (part of) the set-up on the solver are not cached
+            solver = pybamm.CasadiSolver()
+            solver.output_variables = ["Voltage [V]"]
+            self.assertIsNone(cache.get_set_up_key(solver, model, [0, 1], {}))
+
+            class SolverWithSetUp(pybamm.CasadiSolver):
+                def set_up(self, *args, **kwargs):
+                    super().set_up(*args, **kwargs)
+
+            solver = SolverWithSetUp()
+            self.assertIsNone(cache.get_set_up_key(solver, model, [0, 1], {}))
+
+    def test_not_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # models in the python format
+            model = pybamm.lithium_ion.SPM()
+            model.convert_to_format = "python"
+            sim = pybamm.Simulation(model, build_cache=directory)
+            sim.solve([0, 3600])
+            self.assertEqual(os.listdir(directory), [])
+
+            # experiments
+            sim = pybamm.Simulation(
+                pybamm.lithium_ion.SPM(),
+                experiment=["Discharge at 1C for 1 minute"],
+                build_cache=directory,
+            )
+            sim.solve()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_load_save_clear(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.BuildCache(directory)
+            self.assertIsNone(cache.load("key"))
+            cache.save("key", {"a": 1})
+            self.assertEqual(cache.load("key"), {"a": 1})
+            # unreadable or truncated entries are rejected
+            with open(os.path.join(directory, "key.pkl"), "w") as f:
+                f.write("not a pickle")
+            with self.assertLogs(pybamm.logger, level="WARNING"):
+                self.assertIsNone(cache.load("key"))
+            with open(os.path.join(directory, "key.pkl"), "wb") as f:
+                f.write(pickle.dumps({"a": 1})[:-2])
+            with self.assertLogs(pybamm.logger, level="WARNING"):
+                self.assertIsNone(cache.load("key"))
+            cache.clear()
+            self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -757,6 +757,48 @@ class TestDiscretise(TestCase):
         )
         discretised_model.check_well_posedness()
 
+    def test_remesh(self):
+        c = pybamm.Variable("c", domain=["negative electrode"])
+        d = pybamm.Variable("d")
+        forcing = 2 * pybamm.sin(pybamm.t)
+        model = pybamm.BaseModel()
+        model.rhs = {c: pybamm.div(pybamm.grad(c)) + forcing, d: forcing - d}
+        model.initial_conditions = {c: pybamm.Scalar(3), d: pybamm.Scalar(1)}
+        model.boundary_conditions = {
+            c: {"left": (0, "Neumann"), "right": (0, "Neumann")}
+        }
+        model.variables = {"c": c, "d": d}
+
+        disc = get_discretisation_for_testing()
+        disc.process_model(model, inplace=False)
+        new_mesh = get_mesh_for_testing(xpts=20)
+        new_disc = disc.remesh(new_mesh)
+        self.assertEqual(new_disc.mesh, new_mesh)
+
+        # spatial methods are copied, and shared between the same domains
+        for domain, method in disc.spatial_methods.items():
+            self.assertIsNot(new_disc.spatial_methods[domain], method)
+            self.assertEqual(new_disc.spatial_methods[domain].mesh, new_mesh)
+        self.assertIs(
+            new_disc.spatial_methods["negative electrode"],
+            new_disc.spatial_methods["separator"],
+        )
+        self.assertEqual(disc.spatial_methods["negative electrode"].mesh, disc.mesh)
+
+        # only the discretised symbols that do not depend on the mesh are kept
+        self.assertIs(
+            new_disc._discretised_symbols[forcing], disc._discretised_symbols[forcing]
+        )
+        self.assertNotIn(c, new_disc._discretised_symbols)
+        self.assertNotIn(d, new_disc._discretised_symbols)
+
+        discretised_model = new_disc.process_model(model, inplace=False)
+        y0 = discretised_model.concatenated_initial_conditions.evaluate()
+        self.assertEqual(y0.shape, (new_mesh["negative electrode"].npts + 1, 1))
+        np.testing.assert_array_equal(
+            discretised_model.concatenated_rhs.evaluate(0, y0)[-1], -1
+        )
+
     def test_initial_condition_bounds(self):
         # concatenation of variables as the key
         c = pybamm.Variable("c", bounds=(0, 1))
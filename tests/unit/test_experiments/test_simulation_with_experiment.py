@@ -6,6 +6,7 @@ import casadi
 import pybamm
 import numpy as np
 import os
+import tempfile
 import unittest
 from datetime import datetime
 
@@ -172,6 +173,25 @@ class TestSimulationExperiment(TestCase):
             sol1["Voltage [V]"].data, sol2["Voltage [V]"].data
         )
 
+    def test_run_experiment_solver_stats(self):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C for 10 minutes", "Rest for 5 minutes")] * 2
+        )
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+        sol = sim.solve()
+
+        # the statistics are summed over the steps and cycles
+        for cycle in sol.cycles:
+            self.assertEqual(
+                cycle.solver_stats.number_of_steps,
+                sum(step.solver_stats.number_of_steps for step in cycle.steps),
+            )
+        self.assertEqual(
+            sol.solver_stats.number_of_steps,
+            sum(cycle.solver_stats.number_of_steps for cycle in sol.cycles),
+        )
+        self.assertGreater(sol.solver_stats.residual_time, 0)
+
     @unittest.skipIf(not pybamm.have_idaklu(), "idaklu solver is not installed")
     def test_run_experiment_cccv_solvers(self):
         experiment_2step = pybamm.Experiment(
@@ -205,6 +225,88 @@ class TestSimulationExperiment(TestCase):
         )
         self.assertEqual(solutions[1].termination, "final time")
 
+    def test_run_experiment_share_structure(self):
+        experiment = pybamm.Experiment(
+            [
+                pybamm.step.string(
+                    "Discharge at C/2 for 10 minutes", temperature="30oC"
+                ),
+                "Rest for 5 minutes",
+                "Charge at 1 A until 4.1 V",
+                "Hold at 4.1 V until C/2",
+                "Discharge at 2 W for 5 minutes",
+            ],
+        )
+
+        solutions = []
+        for share_experiment_structure in [False, True]:
+            model = pybamm.lithium_ion.SPM({"thermal": "lumped"})
+            sim = pybamm.Simulation(
+                model,
+                experiment=experiment,
+                share_experiment_structure=share_experiment_structure,
+            )
+            solutions.append(sim.solve())
+
+        # one template model for each type of step
+        self.assertEqual(
+            sorted(sim._experiment_template_models.keys()),
+            ["current", "power", "voltage"],
+        )
+        for step_model in sim.op_conds_to_built_models.values():
+            self.assertEqual(step_model.input_parameters, [])
+        np.testing.assert_array_almost_equal(
+            solutions[0]["Voltage [V]"].data,
+            solutions[1]["Voltage [V]"].data,
+        )
+        np.testing.assert_array_almost_equal(
+            solutions[0]["X-averaged cell temperature [K]"].data,
+            solutions[1]["X-averaged cell temperature [K]"].data,
+        )
+
+    def test_run_experiment_generic_steps(self):
+        experiment = pybamm.Experiment(
+            [
+                "Discharge at C/2 for 5 minutes or until 3.3 V",
+                "Discharge at 1 A for 5 minutes or until 3.2 V",
+                "Charge at 1 A for 5 minutes or until 4.1 V",
+                "Charge at C/2 for 5 minutes or until 4.2 V",
+                "Hold at 4.1 V until C/2",
+                "Hold at 4 V until C/5",
+            ],
+        )
+
+        solutions = []
+        for generic_experiment_steps in [False, True]:
+            model = pybamm.lithium_ion.SPM()
+            sim = pybamm.Simulation(
+                model,
+                experiment=experiment,
+                generic_experiment_steps=generic_experiment_steps,
+            )
+            solutions.append(sim.solve())
+
+        # discharge, charge and hold steps each share a model and a solver
+        models = sim.op_conds_to_built_models.values()
+        solvers = sim.op_conds_to_built_solvers.values()
+        self.assertEqual(len({id(model) for model in models}), 3)
+        self.assertEqual(len({id(solver) for solver in solvers}), 3)
+        op_conds = experiment.operating_conditions_steps[1]
+        self.assertEqual(
+            sim.op_conds_to_step_inputs[op_conds.basic_repr()][
+                "Voltage cut-off [V] [experiment step]"
+            ],
+            3.2,
+        )
+        np.testing.assert_array_almost_equal(
+            solutions[0]["Voltage [V]"].data,
+            solutions[1]["Voltage [V]"].data,
+        )
+        np.testing.assert_array_almost_equal(
+            solutions[0]["Current [A]"].data,
+            solutions[1]["Current [A]"].data,
+        )
+
     def test_run_experiment_drive_cycle(self):
         drive_cycle = np.array([np.arange(10), np.arange(10)]).T
         experiment = pybamm.Experiment(
@@ -393,6 +495,41 @@ class TestSimulationExperiment(TestCase):
         # Summary variables are not None
         self.assertIsNotNone(sol.summary_variables["Capacity [A.h]"])
 
+    def test_solve_with_sink(self):
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C until 3.3V",
+                    "Charge at 1C until 4.1 V",
+                    "Hold at 4.1V until C/10",
+                ),
+            ]
+            * 3,
+        )
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model, experiment=experiment)
+        with tempfile.TemporaryDirectory() as directory:
+            sink = pybamm.NpzSolutionSink(directory)
+            sol = sim.solve(solver=pybamm.CasadiSolver("fast with events"), sink=sink)
+            # Only the last cycle is kept in memory
+            self.assertEqual(sol.cycles, [None, None, None])
+            self.assertEqual(sol.all_first_states, [None, None, None])
+            variables, _ = sink.load_cycle(3)
+            np.testing.assert_array_equal(
+                variables["Voltage [V]"], sol["Voltage [V]"].data
+            )
+            np.testing.assert_array_almost_equal(
+                sink.load_summary_variables()["Capacity [A.h]"],
+                sol.summary_variables["Capacity [A.h]"],
+            )
+
+            with self.assertRaisesRegex(ValueError, "cannot both be given"):
+                sim.solve(sink=sink, save_at_cycles=2)
+
+        sim = pybamm.Simulation(model)
+        with self.assertRaisesRegex(ValueError, "if simulating an Experiment"):
+            sim.solve([0, 600], sink=pybamm.SolutionSink())
+
     def test_cycle_summary_variables(self):
         # Test cycle_summary_variables works for different combinations of data and
         # function OCPs
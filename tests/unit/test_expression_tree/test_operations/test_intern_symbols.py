@@ -0,0 +1,68 @@
+#
+# Tests for the symbol interner
+#
+from tests import TestCase
+import pybamm
+import numpy as np
+import unittest
+
+
+class TestSymbolInterner(TestCase):
+    def test_intern_symbol(self):
+        a = pybamm.InputParameter("a")
+        b = pybamm.StateVector(slice(0, 1))
+        # two structurally identical subtrees built separately
+        expr_1 = pybamm.exp(a * b)
+        expr_2 = pybamm.exp(a * b)
+        self.assertIsNot(expr_1, expr_2)
+
+        interner = pybamm.SymbolInterner()
+        self.assertIs(interner.intern_symbol(expr_1), expr_1)
+        self.assertIs(interner.intern_symbol(expr_2), expr_1)
+
+        # the children of a new tree are swapped for their canonical instances
+        expr_3 = pybamm.exp(a * b) + pybamm.StateVector(slice(0, 1))
+        ids = [symbol.id for symbol in expr_3.pre_order()]
+        self.assertIs(interner.intern_symbol(expr_3), expr_3)
+        self.assertIs(expr_3.children[0], expr_1)
+        self.assertIs(expr_3.left, expr_1)
+        self.assertIs(expr_3.right, b)
+        # ids and values are unchanged
+        self.assertEqual([symbol.id for symbol in expr_3.pre_order()], ids)
+        y = np.array([2])
+        np.testing.assert_array_almost_equal(
+            expr_3.evaluate(y=y, inputs={"a": 3}), np.exp(6) + 2
+        )
+
+    def test_variables_not_interned(self):
+        c = pybamm.Variable("c", bounds=(0, 1))
+        c_copy = pybamm.Variable("c")
+        interner = pybamm.SymbolInterner()
+        self.assertIs(interner.intern_symbol(c), c)
+        self.assertIs(interner.intern_symbol(c_copy), c_copy)
+        self.assertEqual(len(interner), 0)
+
+        expr = interner.intern_symbol(2 * c_copy)
+        self.assertIs(expr.right, c_copy)
+
+    def test_shared_table(self):
+        a = pybamm.InputParameter("a")
+        table = {}
+        expr = pybamm.SymbolInterner(table).intern_symbol(a + 1)
+        self.assertIs(pybamm.SymbolInterner(table).intern_symbol(a + 1), expr)
+
+    def test_intern_dict(self):
+        a = pybamm.InputParameter("a")
+        interner = pybamm.SymbolInterner()
+        new_dict = interner.intern_dict({"x": a + 1, "y": a + 1})
+        self.assertIs(new_dict["x"], new_dict["y"])
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
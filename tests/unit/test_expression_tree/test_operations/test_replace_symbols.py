@@ -0,0 +1,78 @@
+#
+# Tests for the symbol replacer
+#
+from tests import TestCase
+import pybamm
+import numpy as np
+import unittest
+
+
+class TestSymbolReplacer(TestCase):
+    def test_basic_symbols(self):
+        a = pybamm.InputParameter("a")
+        b = pybamm.StateVector(slice(0, 1))
+        replacer = pybamm.SymbolReplacer({a: pybamm.Scalar(2)})
+
+        self.assertEqual(replacer.process_symbol(a), pybamm.Scalar(2))
+        # symbols that don't depend on the replaced symbols are returned unchanged
+        self.assertIs(replacer.process_symbol(b), b)
+
+    def test_operators(self):
+        a = pybamm.InputParameter("a")
+        b = pybamm.StateVector(slice(0, 1))
+        replacer = pybamm.SymbolReplacer({a: pybamm.Scalar(2)})
+
+        expr = pybamm.exp(-(a * b)) + pybamm.numpy_concatenation(a, b)
+        new_expr = replacer.process_symbol(expr)
+        self.assertFalse(new_expr.has_symbol_of_classes(pybamm.InputParameter))
+        y = pybamm.Vector([3])
+        self.assertEqual(
+            new_expr.evaluate(y=y.entries).tolist(),
+            expr.evaluate(y=y.entries, inputs={"a": 2}).tolist(),
+        )
+
+        # domains are kept
+        c = pybamm.Variable("c", domain="test")
+        new_expr = replacer.process_symbol(a * c)
+        self.assertEqual(new_expr.domain, ["test"])
+
+    def test_shared_dependencies(self):
+        a = pybamm.InputParameter("a")
+        b = pybamm.StateVector(slice(0, 1))
+        expr = a * b + b
+        dependent_symbols = {}
+        replacer_1 = pybamm.SymbolReplacer({a: pybamm.Scalar(1)}, dependent_symbols)
+        replacer_1.process_dict({"expr": expr})
+        self.assertTrue(dependent_symbols[expr])
+        self.assertFalse(dependent_symbols[b])
+
+        replacer_2 = pybamm.SymbolReplacer({a: pybamm.Scalar(2)}, dependent_symbols)
+        new_expr = replacer_2.process_dict({"expr": expr})["expr"]
+        self.assertEqual(new_expr.evaluate(y=np.array([3])), 9)
+
+    def test_meshes_are_kept(self):
+        a = pybamm.InputParameter("a")
+        b = pybamm.StateVector(slice(0, 1))
+        expr = a * b
+        expr.mesh = "mesh"
+        expr.secondary_mesh = None
+        new_expr = pybamm.SymbolReplacer({a: pybamm.Scalar(2)}).process_symbol(expr)
+        self.assertEqual(new_expr.mesh, "mesh")
+        self.assertIsNone(new_expr.secondary_mesh)
+
+    def test_not_implemented(self):
+        a = pybamm.InputParameter("a")
+        replacer = pybamm.SymbolReplacer({a: pybamm.Scalar(2)})
+        symbol = pybamm.Symbol("symbol", children=[a])
+        with self.assertRaisesRegex(NotImplementedError, "Cannot replace"):
+            replacer.process_symbol(symbol)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,116 @@
+#
+# Tests for the coloured sparse Jacobian
+#
+from tests import TestCase
+import pybamm
+
+import numpy as np
+import unittest
+from scipy import sparse
+from tests import get_discretisation_for_testing
+
+
+def get_discretised_symbol():
+    whole_cell = ["negative electrode", "separator", "positive electrode"]
+    c = pybamm.Variable("c", domain=whole_cell)
+    d = pybamm.Variable("d", domain=whole_cell)
+    a = pybamm.InputParameter("a")
+    model = pybamm.BaseModel()
+    model.rhs = {c: pybamm.div(pybamm.grad(c)) + a * c * d, d: pybamm.exp(c) - d}
+    model.initial_conditions = {c: 1, d: 2}
+    model.boundary_conditions = {c: {"left": (0, "Neumann"), "right": (0, "Neumann")}}
+    disc = get_discretisation_for_testing()
+    disc.process_model(model)
+    return model.concatenated_rhs, model.len_rhs
+
+
+class TestSparseJacobian(TestCase):
+    def test_jacobian_sparsity(self):
+        symbol, n = get_discretised_symbol()
+        y = pybamm.StateVector(slice(0, n))
+        y0 = np.linspace(1, 2, n)
+        inputs = {"a": 3}
+        jac = symbol.jac(y).evaluate(y=y0, inputs=inputs)
+
+        sparsity = pybamm.jacobian_sparsity(symbol, n, inputs)
+        self.assertEqual(sparsity.shape, (n, n))
+        np.testing.assert_array_equal(sparsity.toarray() != 0, jac.toarray() != 0)
+
+        # vector input
+        y = pybamm.StateVector(slice(0, 2))
+        p = pybamm.InputParameter("p", expected_size=2)
+        sparsity = pybamm.jacobian_sparsity(p * y, 2, {"p": np.ones(2)})
+        np.testing.assert_array_equal(sparsity.toarray(), np.eye(2))
+
+    def assert_valid_colouring(self, pattern, colours):
+        pattern = sparse.csc_matrix(pattern, dtype=bool)
+        for colour in np.unique(colours):
+            columns = pattern[:, colours == colour]
+            self.assertLessEqual(columns.sum(axis=1).max(), 1)
+
+    def test_colour_columns(self):
+        # diagonal: a single colour
+        colours = pybamm.colour_columns(sparse.eye(10))
+        np.testing.assert_array_equal(colours, np.zeros(10))
+
+        # tridiagonal: three colours
+        pattern = sparse.diags([1, 1, 1], [-1, 0, 1], shape=(10, 10))
+        colours = pybamm.colour_columns(pattern)
+        np.testing.assert_array_equal(colours, np.arange(10) % 3)
+
+        # dense: one colour per column
+        colours = pybamm.colour_columns(np.ones((4, 5)))
+        np.testing.assert_array_equal(colours, np.arange(5))
+
+        # discretised model
+        symbol, n = get_discretised_symbol()
+        pattern = pybamm.jacobian_sparsity(symbol, n, {"a": 1})
+        colours = pybamm.colour_columns(pattern)
+        self.assert_valid_colouring(pattern, colours)
+        self.assertLess(colours.max() + 1, n)
+
+    def test_coloured_jacobian(self):
+        symbol, n = get_discretised_symbol()
+        y = pybamm.StateVector(slice(0, n))
+        y0 = np.linspace(1, 2, n)
+        inputs = {"a": 3}
+        jac = symbol.jac(y).evaluate(y=y0, inputs=inputs).toarray()
+        sparsity = pybamm.jacobian_sparsity(symbol, n, inputs)
+
+        # finite differences
+        func = pybamm.EvaluatorPython(symbol)
+        coloured_jac = pybamm.ColouredJacobian(func, sparsity)
+        self.assertLess(coloured_jac.n_colours, n)
+        result = coloured_jac(0, y0, inputs)
+        self.assertIsInstance(result, sparse.csr_matrix)
+        np.testing.assert_allclose(result.toarray(), jac, rtol=1e-6, atol=1e-6)
+
+        # Jacobian-vector products
+        def jvp(t, y, v, inputs):
+            return jac @ v
+
+        coloured_jac = pybamm.ColouredJacobian(func, sparsity, jvp=jvp)
+        np.testing.assert_array_almost_equal(coloured_jac(0, y0, inputs).toarray(), jac)
+
+    @unittest.skipIf(not pybamm.have_jax(), "jax or jaxlib is not installed")
+    def test_coloured_jacobian_jax(self):
+        symbol, n = get_discretised_symbol()
+        y = pybamm.StateVector(slice(0, n))
+        y0 = np.linspace(1, 2, n)
+        inputs = {"a": 3.0}
+        jac = symbol.jac(y).evaluate(y=y0, inputs=inputs).toarray()
+
+        func = pybamm.EvaluatorJax(symbol)
+        sparsity = pybamm.jacobian_sparsity(symbol, n, inputs)
+        coloured_jac = pybamm.ColouredJacobian(func, sparsity, jvp=func.jvp)
+        np.testing.assert_allclose(coloured_jac(0, y0, inputs).toarray(), jac)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,96 @@
+#
+# Tests for the iterative traversal of expression trees
+#
+from tests import TestCase
+import pybamm
+import casadi
+import unittest
+
+
+class TestTraverseSymbols(TestCase):
+    def setUp(self):
+        self.a = pybamm.InputParameter("a")
+        self.b = pybamm.StateVector(slice(0, 1))
+        self.shared = pybamm.exp(self.a)
+        self.expr = pybamm.Addition(
+            pybamm.Multiplication(self.shared, self.b), self.shared
+        )
+
+    def test_pre_order(self):
+        mul = self.expr.left
+        nodes = list(pybamm.pre_order(self.expr))
+        self.assertEqual(
+            nodes, [self.expr, mul, self.shared, self.a, self.b, self.shared, self.a]
+        )
+        self.assertEqual(list(self.expr.pre_order()), nodes)
+
+    def test_post_order(self):
+        # each unique node is visited once, after its children
+        mul = self.expr.left
+        nodes = list(pybamm.post_order(self.expr))
+        self.assertEqual(nodes, [self.a, self.shared, self.b, mul, self.expr])
+
+        # visited nodes and their children are skipped
+        nodes = list(pybamm.post_order(self.expr, visited={self.shared}))
+        self.assertEqual(nodes, [self.b, mul, self.expr])
+
+        # children of nodes that are not expanded are skipped
+        nodes = list(
+            pybamm.post_order(
+                self.expr, expand=lambda node: not isinstance(node, pybamm.Function)
+            )
+        )
+        self.assertEqual(nodes, [self.shared, self.b, mul, self.expr])
+
+    def test_transform_symbol(self):
+        calls = []
+
+        def count_nodes(node):
+            calls.append(node)
+            return 1 + sum(cache[child] for child in node.children)
+
+        cache = {}
+        self.assertEqual(pybamm.transform_symbol(self.expr, count_nodes, cache), 7)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(cache[self.shared], 2)
+
+        # cached nodes are not transformed again
+        expr = self.shared * 2
+        self.assertEqual(pybamm.transform_symbol(expr, count_nodes, cache), 4)
+        self.assertEqual(len(calls), 7)
+
+    def test_deep_tree(self):
+        # passes do not recurse down the tree, so very deep trees can be processed
+        y = pybamm.StateVector(slice(0, 1))
+        a = pybamm.Parameter("a")
+        expr = y
+        for _ in range(2000):
+            expr = pybamm.Addition(expr, pybamm.Multiplication(a, y))
+        self.assertEqual(len(list(expr.pre_order())), 8001)
+        self.assertEqual(len(list(pybamm.post_order(expr))), 2003)
+
+        unpacked = pybamm.SymbolUnpacker(pybamm.Parameter).unpack_symbol(expr)
+        self.assertEqual(unpacked, {a})
+        processed = pybamm.ParameterValues({"a": 2}).process_symbol(expr)
+        processed = pybamm.Discretisation().process_symbol(processed)
+        jac = processed.jac(y)
+        # evaluate with casadi, since evaluate recurses down the tree
+        y_casadi = casadi.MX.sym("y")
+        f = casadi.Function(
+            "f",
+            [y_casadi],
+            [processed.to_casadi(y=y_casadi), jac.to_casadi(y=y_casadi)],
+        )
+        value, jac_value = f(1)
+        self.assertEqual(value, 4001)
+        self.assertEqual(jac_value, 4001)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -433,6 +433,70 @@ class TestSymbol(TestCase):
         state = 2 * pybamm.StateVector(slice(100000))
         self.assertEqual(state.shape, (100000, 1))
 
+    def test_infer_shape(self):
+        state = pybamm.StateVector(slice(10))
+        matrix = pybamm.Matrix(np.ones((5, 10)))
+        vector = pybamm.Vector(np.ones(5))
+        for symbol, shape in [
+            (pybamm.t * state, (10, 1)),
+            (matrix @ state + vector, (5, 1)),
+            (pybamm.exp(state) - 2, (10, 1)),
+            (pybamm.Index(state, slice(2, 7)), (5, 1)),
+            (pybamm.Index(state, 3), (1, 1)),
+            (pybamm.NumpyConcatenation(state, 2 * state, pybamm.t), (21, 1)),
+            (pybamm.SparseStack(matrix, pybamm.Matrix(np.ones((3, 10)))), (8, 10)),
+            (pybamm.Equality(pybamm.t, pybamm.Scalar(1)), ()),
+            (pybamm.Function(np.maximum, state, pybamm.t), (10, 1)),
+            (pybamm.Function(np.sum, state), ()),
+        ]:
+            self.assertEqual(
+                symbol._infer_shape([child.shape for child in symbol.children]), shape
+            )
+            self.assertEqual(symbol.shape, symbol._evaluate_shape())
+
+        # symbols whose shape is found by evaluation
+        for symbol in [
+            pybamm.Max(state),
+            pybamm.Gradient(pybamm.Variable("var", domain="test")),
+            pybamm.Concatenation(
+                pybamm.StateVector(slice(10), domain="test"),
+                pybamm.StateVector(slice(10), domain="test 2"),
+                concat_fun=np.hstack,
+            ),
+        ]:
+            with self.assertRaises(NotImplementedError):
+                symbol._infer_shape([child.shape for child in symbol.children])
+
+        # element-wise functions are not evaluated to infer their shape
+        exp = pybamm.exp(state)
+        exp.function = None
+        self.assertEqual(exp._infer_shape([(10, 1)]), (10, 1))
+
+        with self.assertRaisesRegex(ValueError, "incompatible"):
+            (matrix @ state)._infer_shape([(5, 10), (5, 1)])
+        with self.assertRaisesRegex(ValueError, "cannot concatenate"):
+            pybamm.NumpyConcatenation(state)._infer_shape([(10, 1), (10, 2)])
+
+    def test_check_inferred_shape(self):
+        state = pybamm.StateVector(slice(10))
+        with self.assertRaisesRegex(pybamm.ShapeError, "Inferred shape"):
+            state._check_inferred_shape((10, 2), (10, 1))
+
+        # the inferred shape is checked against the evaluated shape in debug mode
+        class BadShape(pybamm.Negate):
+            def _unary_shape(self, child_shape):
+                return (1, 1)
+
+        bad_shape = BadShape(state)
+        self.assertEqual(bad_shape.shape, (1, 1))
+        debug_mode = pybamm.settings.debug_mode
+        pybamm.settings.debug_mode = True
+        try:
+            with self.assertRaisesRegex(pybamm.ShapeError, "Inferred shape"):
+                BadShape(state)
+        finally:
+            pybamm.settings.debug_mode = debug_mode
+
     def test_shape_and_size_for_testing(self):
         scal = pybamm.Scalar(1)
         self.assertEqual(scal.shape_for_testing, scal.shape)
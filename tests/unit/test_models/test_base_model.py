@@ -269,6 +269,29 @@ class TestBaseModel(TestCase):
         self.assertEqual(new_model.use_jacobian, model.use_jacobian)
         self.assertEqual(new_model.convert_to_format, model.convert_to_format)
 
+    def test_intern_symbols(self):
+        model = pybamm.BaseModel()
+        c = pybamm.Variable("c")
+        d = pybamm.Variable("d")
+        model.rhs = {c: -pybamm.exp(2 * d)}
+        model.algebraic = {d: pybamm.exp(2 * d) - c}
+        model.initial_conditions = {c: 1, d: 0}
+        model.variables = {"c": c, "e": pybamm.exp(2 * d)}
+        model.events = [pybamm.Event("event", pybamm.exp(2 * d) - 2)]
+
+        model.intern_symbols()
+        e = model.variables["e"]
+        self.assertIs(model.rhs[c].child, e)
+        for expr in [model.algebraic[d], model.events[0].expression]:
+            self.assertTrue(any(child is e for child in expr.children))
+        self.assertIs(model.variables["c"], c)
+
+        # interning a discretised model
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+        model.intern_symbols()
+        self.assertEqual(model.concatenated_rhs.evaluate(0, np.array([1, 0])), -1)
+
     def test_check_no_repeated_keys(self):
         model = pybamm.BaseModel()
 
@@ -971,6 +994,57 @@ class TestBaseModel(TestCase):
         self.assertEqual(model.rhs[u].value, 2)
         self.assertEqual(model.algebraic[v], -1.0 + v)
 
+    def test_build_coupled_variables_order(self):
+        calls = []
+
+        class SubmodelU(pybamm.BaseSubModel):
+            def get_fundamental_variables(self):
+                return {"u": pybamm.Variable("u")}
+
+            def get_coupled_variables(self, variables):
+                calls.append("u")
+                return {"w": 2 * variables["v"]}
+
+        class SubmodelV(pybamm.BaseSubModel):
+            def get_coupled_variables(self, variables):
+                calls.append("v")
+                return {"v": 3 * variables["u"]}
+
+        def build(options):
+            model = pybamm.BaseModel()
+            model.options = options
+            model.submodels = {
+                "u": SubmodelU(None, "negative"),
+                "v": SubmodelV(None, "negative"),
+            }
+            model.build_fundamental()
+            model.build_coupled_variables()
+            return model
+
+        # the first build finds the order by trial and error
+        model = build({"order test": "first"})
+        self.assertEqual(calls, ["u", "v", "u"])
+        self.assertEqual(model.variables["w"], 6 * model.variables["u"])
+
+        # the order is cached for the model class, options and submodels
+        calls.clear()
+        model = build({"order test": "first"})
+        self.assertEqual(calls, ["v", "u"])
+        self.assertEqual(model.variables["w"], 6 * model.variables["u"])
+
+        calls.clear()
+        build({"order test": "second"})
+        self.assertEqual(calls, ["u", "v", "u"])
+
+        # missing variables are still reported
+        model = pybamm.BaseModel()
+        model.submodels = {"u": SubmodelU(None, "negative")}
+        model.build_fundamental()
+        with self.assertRaisesRegex(
+            pybamm.ModelError, "Missing variable for submodel 'u': 'v'"
+        ):
+            model.build_coupled_variables()
+
     def test_timescale_lengthscale_get_set_not_implemented(self):
         model = pybamm.BaseModel()
         with self.assertRaises(NotImplementedError):
@@ -134,6 +134,46 @@ class TestSimulation(TestCase):
         sim.solve([0, 600])
         sim.set_parameters()
 
+    def test_remesh(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        sim.solve([0, 600])
+
+        var_pts = {**model.default_var_pts, "r_n": 10, "r_p": 10}
+        new_sim = sim.remesh(var_pts)
+        self.assertIsNone(new_sim.built_model)
+        self.assertIsNone(new_sim.solution)
+        self.assertIsNot(new_sim.solver, sim.solver)
+        # the model with set parameters is reused
+        self.assertIs(new_sim.model_with_set_params, sim.model_with_set_params)
+        new_sol = new_sim.solve([0, 600])
+        self.assertEqual(new_sim.mesh["negative particle"].npts, 10)
+        self.assertEqual(sim.mesh["negative particle"].npts, 20)
+
+        # same solution as a new simulation
+        sol = pybamm.Simulation(model, var_pts=var_pts).solve([0, 600])
+        np.testing.assert_array_almost_equal(
+            new_sol["Voltage [V]"].entries, sol["Voltage [V]"].entries
+        )
+
+        # remesh an unbuilt simulation with an experiment
+        sim = pybamm.Simulation(model, experiment=["Discharge at 1C for 1 minute"])
+        new_sim = sim.remesh(var_pts)
+        new_sim.solve()
+        self.assertEqual(new_sim.mesh["negative particle"].npts, 10)
+
+        # a model that is already discretised cannot be remeshed
+        model = pybamm.lithium_ion.SPM()
+        geometry = model.default_geometry
+        param = model.default_parameter_values
+        param.process_model(model)
+        param.process_geometry(geometry)
+        mesh = pybamm.Mesh(geometry, model.default_submesh_types, model.default_var_pts)
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        disc.process_model(model)
+        with self.assertRaisesRegex(pybamm.ModelError, "already discretised"):
+            pybamm.Simulation(model).remesh(var_pts)
+
     def test_set_crate(self):
         model = pybamm.lithium_ion.SPM()
         current_1C = model.default_parameter_values["Current function [A]"]
@@ -207,14 +247,14 @@ class TestSimulation(TestCase):
         options = {"working electrode": "positive"}
         model = pybamm.lithium_ion.DFN(options)
         sim = pybamm.Simulation(model)
-        sim.solve([0,1], initial_soc = 0.9)
+        sim.solve([0, 1], initial_soc=0.9)
         self.assertEqual(sim._built_initial_soc, 0.9)
 
         # Test whether initial_soc works with half cell (build)
         options = {"working electrode": "positive"}
         model = pybamm.lithium_ion.DFN(options)
         sim = pybamm.Simulation(model)
-        sim.build(initial_soc = 0.9)
+        sim.build(initial_soc=0.9)
         self.assertEqual(sim._built_initial_soc, 0.9)
 
         # Test whether initial_soc works with half cell when it is a voltage
@@ -226,7 +266,7 @@ class TestSimulation(TestCase):
         options = {"working electrode": "positive"}
         parameter_values["Current function [A]"] = 0.0
         sim = pybamm.Simulation(model, parameter_values=parameter_values)
-        sol = sim.solve([0,1], initial_soc = "{} V".format(ucv))
+        sol = sim.solve([0, 1], initial_soc="{} V".format(ucv))
         voltage = sol["Terminal voltage [V]"].entries
         self.assertAlmostEqual(voltage[0], ucv, places=5)
 
@@ -247,6 +287,79 @@ class TestSimulation(TestCase):
             sim.solution.all_inputs[0]["Current function [A]"], 1
         )
 
+    def test_sweep(self):
+        name = "Negative electrode diffusivity [m2.s-1]"
+        model = pybamm.lithium_ion.SPM()
+        param = pybamm.ParameterValues("Chen2020")
+        values = [1e-14, 1e-13]
+        sim = pybamm.Simulation(model, parameter_values=param)
+        sols = sim.sweep({name: values}, [0, 3600])
+        self.assertEqual(len(sols), 2)
+        self.assertIs(sim.solution, sols)
+        # the swept parameter is an input of the simulation only
+        self.assertIsInstance(sim.parameter_values[name], pybamm.InputParameter)
+        self.assertEqual(param[name], 3.3e-14)
+        built_model = sim.built_model
+
+        # same solutions as new simulations
+        for value, sol in zip(values, sols):
+            self.assertEqual(sol.all_inputs[0][name], value)
+            new_param = param.copy()
+            new_param[name] = value
+            new_sol = pybamm.Simulation(model, parameter_values=new_param).solve(
+                [0, 3600]
+            )
+            np.testing.assert_array_almost_equal(
+                sol["Voltage [V]"].entries, new_sol["Voltage [V]"].entries
+            )
+
+        # sweeping the same parameter again does not build the simulation again,
+        # and other inputs are passed to each solve
+        param = pybamm.ParameterValues("Chen2020")
+        param.update({"Current function [A]": "[input]"})
+        sim = pybamm.Simulation(model, parameter_values=param)
+        sim.sweep({name: values}, [0, 600], inputs={"Current function [A]": 1})
+        built_model = sim.built_model
+        sols = sim.sweep(
+            {name: values, "Current function [A]": [2, 3]},
+            [0, 600],
+            permutations=True,
+        )
+        self.assertIs(sim.built_model, built_model)
+        self.assertEqual(
+            [sol.all_inputs[0] for sol in sols],
+            [
+                {name: 1e-14, "Current function [A]": 2},
+                {name: 1e-14, "Current function [A]": 3},
+                {name: 1e-13, "Current function [A]": 2},
+                {name: 1e-13, "Current function [A]": 3},
+            ],
+        )
+        with self.assertRaisesRegex(ValueError, "same number of values"):
+            sim.sweep({name: values, "Current function [A]": [1]}, [0, 600])
+
+        # with an experiment
+        sim = pybamm.Simulation(
+            model, parameter_values=param, experiment=["Rest for 10 minutes"]
+        )
+        sols = sim.sweep({name: values}, inputs={"Current function [A]": 1})
+        self.assertEqual(len(sols), 2)
+        self.assertEqual(sols[1].all_inputs[0][name], 1e-13)
+
+        # a model that is already discretised cannot be swept
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        model.rhs = {v: -pybamm.Parameter("a") * v}
+        model.initial_conditions = {v: 1}
+        disc = pybamm.Discretisation()
+        pybamm.ParameterValues({"a": 1}).process_model(model)
+        disc.process_model(model)
+        sim = pybamm.Simulation(
+            model, parameter_values=pybamm.ParameterValues({"a": 1})
+        )
+        with self.assertRaisesRegex(pybamm.ModelError, "already discretised"):
+            sim.sweep({"a": [1, 2]}, [0, 1])
+
     def test_step_with_inputs(self):
         dt = 0.001
         model = pybamm.lithium_ion.SPM()
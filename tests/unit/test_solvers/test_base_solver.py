@@ -75,6 +75,33 @@ class TestBaseSolver(TestCase):
         ):
             solver.step(None, model, dt)
 
+    def test_natural_steps(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        model.rhs = {v: 1}
+        model.initial_conditions = {v: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # solver that cannot return its natural steps
+        solver = pybamm.CasadiSolver()
+        solver.natural_steps = True
+        with self.assertRaisesRegex(
+            pybamm.SolverError, "cannot return the solution at its natural steps"
+        ):
+            solver.solve(model, [0, 1])
+
+        # thinning
+        solver = pybamm.BaseSolver(atol=1e-8, natural_steps=True)
+        t = np.linspace(0, 1, 11)
+        y = np.vstack([2 * t, np.where(t < 0.5, 0, t - 0.5)])
+        np.testing.assert_array_equal(solver._thin_natural_steps(t, y), np.arange(11))
+        solver.natural_steps_tol = 1e-6
+        np.testing.assert_array_equal(solver._thin_natural_steps(t, y), [0, 5, 10])
+        np.testing.assert_array_equal(
+            solver._thin_natural_steps(t[:2], y[:, :2]), [0, 1]
+        )
+
     def test_solution_time_length_fail(self):
         model = pybamm.BaseModel()
         v = pybamm.Scalar(1)
@@ -332,6 +359,90 @@ class TestBaseSolver(TestCase):
         with self.assertRaisesRegex(RuntimeError, "already been initialised"):
             solver.solve(model2, t_eval=[0, 1])
 
+    def test_solve_adjoint(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        u = pybamm.Variable("u")
+        a = pybamm.InputParameter("a")
+        b = pybamm.InputParameter("b")
+        model.rhs = {v: -a * v}
+        model.initial_conditions = {v: b}
+        model.variables = {"v": v}
+        t_eval = np.linspace(0, 1, 11)
+        inputs = {"a": 1.5, "b": 2}
+        exp = np.exp(-inputs["a"] * t_eval)
+
+        # ODE: sum of v ** 2, with v = b * exp(-a * t)
+        solver = pybamm.CasadiSolver(rtol=1e-10, atol=1e-10)
+        value, gradient = solver.solve_adjoint(
+            model, t_eval, lambda v: casadi.sumsqr(v["v"]), ["v"], inputs
+        )
+        self.assertAlmostEqual(value, np.sum(4 * exp**2))
+        self.assertEqual(set(gradient), {"a", "b"})
+        self.assertAlmostEqual(gradient["a"], np.sum(-8 * t_eval * exp**2), places=6)
+        self.assertAlmostEqual(gradient["b"], np.sum(4 * exp**2), places=6)
+
+        # DAE: sum of u, with u = a * v
+        model = pybamm.BaseModel()
+        model.rhs = {v: -a * v}
+        model.algebraic = {u: a * v - u}
+        model.initial_conditions = {v: b, u: 0}
+        model.variables = {"v": v, "u": u}
+        solver = pybamm.CasadiSolver(rtol=1e-10, atol=1e-10)
+        value, gradient = solver.solve_adjoint(
+            model, t_eval, lambda v: casadi.sum2(v["u"]), ["u"], inputs
+        )
+        self.assertAlmostEqual(value, np.sum(3 * exp))
+        self.assertAlmostEqual(
+            gradient["a"], np.sum(2 * exp * (1 - 1.5 * t_eval)), places=6
+        )
+        self.assertAlmostEqual(gradient["b"], np.sum(1.5 * exp), places=6)
+
+        # matches forward sensitivities
+        solution = pybamm.CasadiSolver(rtol=1e-10, atol=1e-10).solve(
+            model.new_copy(), t_eval, inputs=inputs, calculate_sensitivities=True
+        )
+        for name in ["a", "b"]:
+            self.assertAlmostEqual(
+                gradient[name],
+                np.sum(solution["u"].sensitivities[name]),
+                places=6,
+            )
+
+    def test_solve_adjoint_errors(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        a = pybamm.InputParameter("a")
+        model.rhs = {v: -a * v}
+        model.initial_conditions = {v: 1}
+        model.variables = {"v": v}
+
+        def functional(v):
+            return casadi.sum2(v["v"])
+
+        solver = pybamm.CasadiSolver()
+        with self.assertRaisesRegex(pybamm.SolverError, "at least two times"):
+            solver.solve_adjoint(model, [0], functional, ["v"], {"a": 1})
+
+        solver.solve(model, [0, 1], inputs={"a": 1}, calculate_sensitivities=True)
+        with self.assertRaisesRegex(pybamm.SolverError, "forward sensitivities"):
+            solver.solve_adjoint(model, [0, 1], functional, ["v"], {"a": 1})
+
+        model = model.new_copy()
+        model.convert_to_format = "python"
+        solver = pybamm.ScipySolver()
+        with self.assertRaisesRegex(pybamm.SolverError, "convert_to_format"):
+            solver.solve_adjoint(model, [0, 1], functional, ["v"], {"a": 1})
+
+        model = pybamm.BaseModel()
+        model.algebraic = {v: v - a}
+        model.initial_conditions = {v: 1}
+        model.variables = {"v": v}
+        pybamm.Discretisation().process_model(model)
+        solver = pybamm.CasadiAlgebraicSolver()
+        with self.assertRaisesRegex(pybamm.SolverError, "purely algebraic"):
+            solver.solve_adjoint(model, [0, 1], functional, ["v"], {"a": 1})
+
     @unittest.skipIf(not pybamm.have_idaklu(), "idaklu solver is not installed")
     def test_sensitivities(self):
         def exact_diff_a(y, a, b):
@@ -0,0 +1,147 @@
+#
+# Tests for the casadi function compiler
+#
+from tests import TestCase
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import casadi
+import numpy as np
+
+import pybamm
+
+
+@unittest.skipIf(shutil.which("cc") is None, "no C compiler")
+class TestCasadiFunctionCompiler(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.compiler = pybamm.CasadiFunctionCompiler(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compile(self):
+        x = casadi.MX.sym("x", 2)
+        p = casadi.MX.sym("p")
+        f = casadi.Function("f", [x, p], [casadi.vertcat(p * x[0], casadi.sin(x[1]))])
+        g = casadi.Function("g", [x], [casadi.sum1(x)])
+
+        compiled_f, compiled_g = self.compiler.compile([f, g])
+        np.testing.assert_array_equal(compiled_f([1, 2], 3).full(), f([1, 2], 3).full())
+        self.assertEqual(compiled_g([1, 2]), 3)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+
+        # the library is loaded from the cache
+        with mock.patch.object(pybamm.CasadiFunctionCompiler, "_build") as build:
+            compiled_f, compiled_g = self.compiler.compile([f, g])
+        build.assert_not_called()
+        self.assertEqual(compiled_f([1, 2], 3)[0], 3)
+        self.assertEqual(compiled_g([1, 2]), 3)
+
+        # other compiler flags give a different library
+        compiler = pybamm.CasadiFunctionCompiler(self.directory.name, flags=["-O0"])
+        compiler.compile([f, g])
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
+
+    def test_compile_with_jacobian(self):
+        x = casadi.MX.sym("x", 2)
+        f = casadi.Function("f", [x], [x**2])
+        compiled_f = self.compiler.compile(f, with_jacobian=True)
+        jac = casadi.Function("jac_f", [x], [casadi.jacobian(compiled_f(x), x)])
+        np.testing.assert_array_equal(jac([1, 2]).full(), np.diag([2, 4]))
+
+    def test_compile_error(self):
+        compiler = pybamm.CasadiFunctionCompiler(
+            self.directory.name, compiler="not-a-compiler"
+        )
+        x = casadi.MX.sym("x")
+        with self.assertRaisesRegex(pybamm.SolverError, "Could not compile") as cm:
+            compiler.compile(casadi.Function("f", [x], [x]))
+        self.assertIsInstance(cm.exception.__cause__, OSError)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+        compiler = pybamm.CasadiFunctionCompiler(
+            self.directory.name, flags=["-not-a-flag"]
+        )
+        with self.assertRaisesRegex(pybamm.SolverError, "not-a-flag"):
+            compiler.compile(casadi.Function("f", [x], [x]))
+
+    def test_solver_option(self):
+        solver = pybamm.CasadiSolver(compile_functions=True)
+        self.assertIsInstance(solver.compile_functions, pybamm.CasadiFunctionCompiler)
+        solver.compile_functions = False
+        self.assertIsNone(solver.compile_functions)
+        with self.assertRaisesRegex(pybamm.SolverError, "compile_functions"):
+            solver.compile_functions = "yes"
+
+        t_eval = np.linspace(0, 3600, 10)
+        solution = pybamm.Simulation(pybamm.lithium_ion.SPMe()).solve(t_eval)
+        for mode in ["safe", "fast"]:
+            solver = pybamm.CasadiSolver(mode=mode, compile_functions=self.compiler)
+            sim = pybamm.Simulation(pybamm.lithium_ion.SPMe(), solver=solver)
+            compiled_solution = sim.solve(t_eval)
+            self.assertEqual(sim.built_model.casadi_rhs.class_name(), "External")
+            np.testing.assert_array_almost_equal(
+                compiled_solution["Voltage [V]"].entries,
+                solution["Voltage [V]"].entries,
+            )
+
+        # functions are not compiled when calculating sensitivities
+        model = pybamm.lithium_ion.SPM()
+        parameter_values = model.default_parameter_values
+        parameter_values["Current function [A]"] = "[input]"
+        sim = pybamm.Simulation(
+            model,
+            parameter_values=parameter_values,
+            solver=pybamm.CasadiSolver(compile_functions=self.compiler),
+        )
+        sim.solve(
+            [0, 600], inputs={"Current function [A]": 1}, calculate_sensitivities=True
+        )
+        self.assertNotEqual(sim.built_model.casadi_rhs.class_name(), "External")
+
+        # other solvers do not compile the functions used by the casadi solver
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.algebraic = {var: var - 1}
+        model.initial_conditions = {var: 0}
+        pybamm.Discretisation().process_model(model)
+        solver = pybamm.CasadiAlgebraicSolver()
+        solver.compile_functions = self.compiler
+        solver.set_up(model)
+        self.assertNotEqual(model.casadi_algebraic.class_name(), "External")
+
+    @unittest.skipIf(not pybamm.have_idaklu(), "idaklu solver is not installed")
+    def test_idaklu_solver_option(self):
+        t_eval = np.linspace(0, 3600, 10)
+        solution = pybamm.Simulation(
+            pybamm.lithium_ion.SPMe(), solver=pybamm.IDAKLUSolver()
+        ).solve(t_eval)
+        with mock.patch.object(
+            self.compiler, "compile", wraps=self.compiler.compile
+        ) as compile:
+            solver = pybamm.IDAKLUSolver(compile_functions=self.compiler)
+            sim = pybamm.Simulation(pybamm.lithium_ion.SPMe(), solver=solver)
+            compiled_solution = sim.solve(t_eval)
+        # the residual, Jacobian, Jacobian action and events are compiled together
+        compile.assert_called_once()
+        self.assertEqual(len(compile.call_args.args[0]), 4)
+        for function in compile.call_args.args[0]:
+            self.assertIsInstance(function, casadi.Function)
+        np.testing.assert_array_almost_equal(
+            compiled_solution["Voltage [V]"].entries,
+            solution["Voltage [V]"].entries,
+        )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -7,6 +7,8 @@ import unittest
 import numpy as np
 from tests import get_mesh_for_testing, get_discretisation_for_testing
 from scipy.sparse import eye
+import casadi
+from pybamm.solvers.base_solver import expand_casadi_function
 
 
 class TestCasadiSolver(TestCase):
@@ -539,6 +541,120 @@ class TestCasadiSolver(TestCase):
         with self.assertRaisesRegex(pybamm.SolverError, "interpolation bounds"):
             solver.solve(model, t_eval=[0, 1])
 
+    def test_reuse_integrators(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var = 0.5", var - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # windows with the same number of equally spaced points share an
+        # integrator, whatever their start time and length
+        solver = pybamm.CasadiSolver(dt_max=1)
+        solution = solver.solve(model, np.linspace(0, 4, 41))
+        keys = list(solver.integrators[model])
+        self.assertTrue(all(isinstance(key, int) for key in keys))
+        solution = solver.solve(model, np.linspace(0, 3.1, 32))
+        np.testing.assert_array_almost_equal(
+            solution.y.full()[0], np.exp(-0.1 * solution.t), decimal=5
+        )
+        self.assertEqual(list(solver.integrators[model]), keys)
+
+        # including the dense windows used to find the time of events
+        solver = pybamm.CasadiSolver()
+        solution = solver.solve(model, np.linspace(0, 10, 101))
+        self.assertEqual(solution.termination, "event: var = 0.5")
+        self.assertAlmostEqual(solution.t_event[0], 10 * np.log(2), places=3)
+        self.assertEqual(list(solver.integrators[model]), [100, 99])
+        solution = solver.solve(model, np.linspace(0, 20, 101))
+        self.assertAlmostEqual(solution.t_event[0], 10 * np.log(2), places=3)
+        self.assertEqual(list(solver.integrators[model]), [100, 99])
+
+        # unequally spaced windows are stored under their grid rescaled to [0, 1]
+        t_eval = np.array([0, 0.1, 0.5, 0.7])
+        solution = solver.solve(model, t_eval)
+        np.testing.assert_array_almost_equal(
+            solution.y.full()[0], np.exp(-0.1 * t_eval), decimal=5
+        )
+        solver.solve(model, 2 * t_eval)
+        self.assertEqual(len(solver.integrators[model]), 3)
+
+        # a single time gives a solution of length 1, which is an error
+        model.events = []
+        for extra_options_setup in [{}, {"max_step_size": 1}]:
+            for mode in ["safe", "fast", "safe without grid"]:
+                solver = pybamm.CasadiSolver(
+                    mode=mode, extra_options_setup=extra_options_setup
+                )
+                with self.assertRaisesRegex(pybamm.SolverError, "has length 1"):
+                    solver.solve(model, np.array([0.0]))
+
+    def test_extra_options_time_rescaled(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # the maximum step size is in seconds, whatever the length of the window
+        for t_end in [100, 1000]:
+            solver = pybamm.CasadiSolver(
+                mode="fast", extra_options_setup={"max_step_size": 10}
+            )
+            solution = solver.solve(model, [0, t_end])
+            self.assertGreaterEqual(solution.solver_stats.number_of_steps, t_end // 10)
+            self.assertEqual(list(solver.integrators[model]), [(99, t_end)])
+        np.testing.assert_array_almost_equal(
+            solution.y.full()[0], np.exp(-0.1 * solution.t), decimal=5
+        )
+
+        # windows of different lengths need different integrators
+        solver.solve(model, [0, 500])
+        self.assertEqual(list(solver.integrators[model]), [(99, 1000), (99, 500)])
+
+    def test_expand_functions(self):
+        model = pybamm.BaseModel()
+        var1 = pybamm.Variable("var1", domain="negative electrode")
+        var2 = pybamm.Variable("var2", domain="negative electrode")
+        a = pybamm.InputParameter("a")
+        model.rhs = {var1: -a * var1}
+        model.algebraic = {var2: 2 * var1 - var2}
+        model.initial_conditions = {var1: 1, var2: 2}
+        model.events = [pybamm.Event("var1 = 0.5", pybamm.min(var1 - 0.5))]
+        disc = get_discretisation_for_testing()
+        disc.process_model(model)
+        t_eval = np.linspace(0, 1, 20)
+
+        solutions = []
+        for expand_functions in [False, True]:
+            solver = pybamm.CasadiSolver(expand_functions=expand_functions)
+            model_copy = model.new_copy()
+            solutions.append(solver.solve(model_copy, t_eval, inputs={"a": 1}))
+            for function in [
+                model_copy.rhs_algebraic_eval,
+                model_copy.jac_rhs_algebraic_eval,
+                model_copy.casadi_rhs,
+                *model_copy.terminate_events_eval,
+            ]:
+                self.assertEqual(function.is_a("SXFunction"), expand_functions)
+        np.testing.assert_array_almost_equal(solutions[0].y, solutions[1].y)
+        np.testing.assert_array_almost_equal(solutions[0].t, solutions[1].t)
+
+    def test_expand_casadi_function_fallback(self):
+        x = casadi.MX.sym("x")
+        f = casadi.Function("f", [x], [2 * x])
+        f_expanded = expand_casadi_function(f)
+        self.assertTrue(f_expanded.is_a("SXFunction"))
+        self.assertEqual(f_expanded(3), 6)
+
+        # functions that call an integrator cannot be expanded, and are kept as MX
+        integrator = casadi.integrator("integrator", "cvodes", {"x": x, "ode": -x})
+        g = casadi.Function("g", [x], [integrator(x0=x)["xf"]])
+        self.assertIs(expand_casadi_function(g), g)
+
 
 class TestCasadiSolverODEsWithForwardSensitivityEquations(TestCase):
     def test_solve_sensitivity_scalar_var_scalar_input(self):
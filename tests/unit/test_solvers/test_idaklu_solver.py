@@ -2,6 +2,7 @@
 # Tests for the KLU Solver class
 #
 from tests import TestCase
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stdout
 import io
 import unittest
@@ -185,6 +186,111 @@ class TestIDAKLUSolver(TestCase):
             true_solution = b_value * sol.t
             np.testing.assert_array_almost_equal(sol.y[1:3], true_solution)
 
+    def test_multiple_inputs(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        a = pybamm.InputParameter("a")
+        model.rhs = {u: -a * u}
+        model.algebraic = {v: u - v}
+        model.initial_conditions = {u: 1, v: 1}
+        model.events = [pybamm.Event("u=0.5", u - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 3, 100)
+        inputs_list = [{"a": a_value} for a_value in [0.1, 0.2, 0.3, 0.4, 0.5]]
+        for nproc in [1, 2, 8]:
+            solver = pybamm.IDAKLUSolver()
+            timer = pybamm.Timer()
+            solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=nproc)
+            batch_time = timer.time().value
+            # each solution records the time taken by its own solve
+            integration_times = [sol.integration_time.value for sol in solutions]
+            self.assertTrue(all(0 < time < batch_time for time in integration_times))
+            if nproc == 1:
+                self.assertLess(sum(integration_times), batch_time)
+            # the solver keeps one compiled solver per thread
+            self.assertEqual(
+                len(solver._setup["batch_solvers"]), min(nproc, len(inputs_list))
+            )
+            for inputs, solution in zip(inputs_list, solutions):
+                self.assertEqual(solution.all_inputs[0], inputs)
+                np.testing.assert_array_almost_equal(
+                    solution.y[0], np.exp(-inputs["a"] * solution.t), decimal=5
+                )
+                np.testing.assert_array_almost_equal(solution.y[0], solution.y[1])
+                single_solution = solver.solve(model, t_eval, inputs=inputs)
+                np.testing.assert_array_equal(solution.t, single_solution.t)
+                np.testing.assert_array_equal(solution.y, single_solution.y)
+                self.assertEqual(solution.termination, single_solution.termination)
+
+    def test_concurrent_solves(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        a = pybamm.InputParameter("a")
+        model.rhs = {u: -a * u}
+        model.algebraic = {v: u - v}
+        model.initial_conditions = {u: 1, v: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 3, 100)
+        a_values = [0.1, 0.2, 0.3, 0.4, 0.5]
+        solver = pybamm.IDAKLUSolver()
+        serial_solutions = [
+            solver.solve(model, t_eval, inputs={"a": a_value}) for a_value in a_values
+        ]
+
+        # clones of the compiled solver solve independently
+        compiled_solver = solver._setup["solver"]
+        clone = compiled_solver.clone()
+        y0 = np.ones(2)
+        yp0 = np.zeros(2)
+        sol = clone.solve(t_eval, y0, yp0, np.array([[0.3]]))
+        np.testing.assert_array_equal(sol.y, serial_solutions[2].y.flatten("F"))
+
+        # threads that call solve use a compiled solver each
+        def solve(a_value):
+            return solver.solve(model, t_eval, inputs={"a": a_value})
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            solutions = list(executor.map(solve, a_values))
+            thread_solver = executor.submit(solver._get_thread_solver).result()
+        self.assertIs(solver._get_thread_solver(), compiled_solver)
+        self.assertIsNot(thread_solver, compiled_solver)
+        for solution, serial_solution in zip(solutions, serial_solutions):
+            np.testing.assert_array_equal(solution.t, serial_solution.t)
+            np.testing.assert_array_equal(solution.y, serial_solution.y)
+        self.assertEqual(solver._active_solves, {})
+
+        # models whose initial state depends on the inputs cannot be solved in
+        # several threads at once
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        model.rhs = {u: -u}
+        model.initial_conditions = {u: a}
+        disc.process_model(model)
+        solver = pybamm.IDAKLUSolver()
+        # ... nor models that have not been set up
+        solver._active_solves[model] = 1
+        with self.assertRaisesRegex(pybamm.SolverError, "several threads"):
+            solver.solve(model, t_eval, inputs={"a": 1})
+        del solver._active_solves[model]
+        solver.solve(model, t_eval, inputs={"a": 1})
+        solver._active_solves[model] = 1
+        with self.assertRaisesRegex(pybamm.SolverError, "several threads"):
+            solver.solve(model, t_eval, inputs={"a": 2})
+        del solver._active_solves[model]
+
+        # solves in other threads that do not overlap are fine
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            solution = executor.submit(
+                solver.solve, model, t_eval, inputs={"a": 2}
+            ).result()
+        np.testing.assert_allclose(solution.y[0], 2 * np.exp(-t_eval), rtol=1e-4)
+
     def test_sensitivites_initial_condition(self):
         for output_variables in [[], ["2v"]]:
             model = pybamm.BaseModel()
@@ -546,6 +652,116 @@ class TestIDAKLUSolver(TestCase):
                         with self.assertRaises(ValueError):
                             soln = solver.solve(model, t_eval)
 
+    def test_solver_stats(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        model.rhs = {u: -0.1 * u}
+        model.algebraic = {v: v - u}
+        model.initial_conditions = {u: 1, v: 1}
+        model.events = [pybamm.Event("u = 0.5", u - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 100)
+        solution = pybamm.IDAKLUSolver().solve(model, t_eval)
+        stats = solution.solver_stats
+        for name in [
+            "number_of_steps",
+            "number_of_residual_evaluations",
+            "number_of_jacobian_evaluations",
+            "number_of_linear_solver_setups",
+            "number_of_nonlinear_iterations",
+            "number_of_root_function_calls",
+        ]:
+            self.assertIsInstance(getattr(stats, name), int)
+            self.assertGreater(getattr(stats, name), 0)
+        self.assertIsInstance(stats.number_of_error_test_failures, int)
+        self.assertGreater(stats.residual_time, 0)
+        self.assertGreater(stats.jacobian_time, 0)
+
+    def test_dense_output(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        a = pybamm.InputParameter("a")
+        model.rhs = {u: -a * u}
+        model.algebraic = {v: v - u}
+        model.initial_conditions = {u: 1, v: 1}
+        model.events = [pybamm.Event("u = 0.5", u - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # dense output times, with an event between two of them
+        t_eval = np.linspace(0, 10, 1001)
+        inputs = {"a": 0.1}
+        solver = pybamm.IDAKLUSolver(
+            rtol=1e-8, atol=1e-8, options={"dense_output": True}
+        )
+        soln = solver.solve(model, t_eval, inputs=inputs, calculate_sensitivities=True)
+        soln_base = pybamm.IDAKLUSolver(rtol=1e-8, atol=1e-8).solve(
+            model, t_eval, inputs=inputs, calculate_sensitivities=True
+        )
+
+        # the solution is interpolated at the requested times, up to the event
+        self.assertEqual(soln.termination, "event: u = 0.5")
+        np.testing.assert_array_almost_equal(soln.t, soln_base.t)
+        np.testing.assert_allclose(soln.t[:-1], t_eval[: len(soln.t) - 1])
+        np.testing.assert_allclose(soln.y[0], np.exp(-0.1 * soln.t), rtol=1e-6)
+        np.testing.assert_allclose(soln.y[1], soln.y[0], rtol=1e-6)
+        np.testing.assert_allclose(
+            np.asarray(soln.sensitivities["a"]).flatten()[::2],
+            -soln.t * np.exp(-0.1 * soln.t),
+            rtol=1e-4,
+            atol=1e-6,
+        )
+
+    def test_natural_steps(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        a = pybamm.InputParameter("a")
+        model.rhs = {u: -a * u}
+        model.algebraic = {v: v - u}
+        model.initial_conditions = {u: 1, v: 1}
+        model.events = [pybamm.Event("u = 0.5", u - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        inputs = {"a": 0.1}
+        solver = pybamm.IDAKLUSolver(rtol=1e-8, atol=1e-8, natural_steps=True)
+        t_eval = np.linspace(0, 5, 1000)
+        soln = solver.solve(model, t_eval, inputs=inputs, calculate_sensitivities=True)
+
+        # the solution is returned at the steps taken by IDA
+        self.assertLess(len(soln.t), len(t_eval))
+        self.assertEqual(soln.t[0], 0)
+        self.assertEqual(soln.t[-1], 5)
+        np.testing.assert_allclose(soln.y[0], np.exp(-0.1 * soln.t), rtol=1e-6)
+        np.testing.assert_allclose(soln.y[1], soln.y[0], rtol=1e-6)
+        np.testing.assert_allclose(
+            np.asarray(soln.sensitivities["a"]).flatten()[::2],
+            -soln.t * np.exp(-0.1 * soln.t),
+            rtol=1e-4,
+            atol=1e-6,
+        )
+
+        # thinned steps
+        solver.natural_steps_tol = 1e-3
+        thinned = solver.solve(model, t_eval, inputs=inputs)
+        self.assertLess(len(thinned.t), len(soln.t))
+        np.testing.assert_allclose(thinned.y[0], np.exp(-0.1 * thinned.t), rtol=1e-6)
+
+        # event
+        soln = solver.solve(model, [0, 10], inputs=inputs)
+        self.assertEqual(soln.termination, "event: u = 0.5")
+        np.testing.assert_allclose(soln.t[-1], 10 * np.log(2), rtol=1e-6)
+
+        # python models are not supported
+        model.convert_to_format = "python"
+        with self.assertRaisesRegex(pybamm.SolverError, "natural steps"):
+            pybamm.IDAKLUSolver(natural_steps=True).solve(model, t_eval, inputs=inputs)
+
     def test_with_output_variables(self):
         # Construct a model and solve for all vairables, then test
         # the 'output_variables' option for each variable in turn, confirming
@@ -8,6 +8,7 @@ import tests
 
 import numpy as np
 import unittest
+from unittest.mock import patch
 
 
 def to_casadi(var_pybamm, y, inputs=None):
@@ -212,6 +213,38 @@ class TestProcessedVariable(TestCase):
             processed_eqn2.entries, y_sol + x_sol[:, np.newaxis]
         )
 
+    def test_processed_variable_1D_unmappable(self):
+        # if the casadi function cannot be mapped, evaluate index-by-index
+        t = pybamm.t
+        var = pybamm.Variable("var", domain=["negative electrode", "separator"])
+        x = pybamm.SpatialVariable("x", domain=["negative electrode", "separator"])
+        eqn = t * var + x
+
+        disc = tests.get_discretisation_for_testing()
+        disc.set_variable_slices([var])
+        x_sol = disc.process_symbol(x).entries[:, 0]
+        eqn_sol = disc.process_symbol(eqn)
+        t_sol = np.linspace(0, 1)
+        y_sol = np.ones_like(x_sol)[:, np.newaxis] * np.linspace(0, 5)
+        eqn_casadi = to_casadi(eqn_sol, y_sol)
+        solution = pybamm.Solution(
+            t_sol, y_sol, tests.get_base_model_with_battery_geometry(), {}
+        )
+
+        processed_eqn = pybamm.ProcessedVariable(
+            [eqn_sol], [eqn_casadi], solution, warn=False
+        )
+        with patch.object(casadi.Function, "map", side_effect=RuntimeError):
+            processed_eqn_loop = pybamm.ProcessedVariable(
+                [eqn_sol], [eqn_casadi], solution, warn=False
+            )
+        np.testing.assert_array_almost_equal(
+            processed_eqn.entries, t_sol * y_sol + x_sol[:, np.newaxis]
+        )
+        np.testing.assert_array_equal(
+            processed_eqn.entries, processed_eqn_loop.entries
+        )
+
     def test_processed_variable_1D_unknown_domain(self):
         x = pybamm.SpatialVariable("x", domain="SEI layer", coord_sys="cartesian")
         geometry = pybamm.Geometry(
@@ -6,6 +6,7 @@ import unittest
 import numpy as np
 from tests import get_mesh_for_testing, get_discretisation_for_testing
 import warnings
+import pickle
 import sys
 
 
@@ -105,6 +106,41 @@ class TestScipySolver(TestCase):
         # Test event in solution variables_and_events
         np.testing.assert_array_almost_equal(solution["Event: var=0.5"].data[-1], 0)
 
+    def test_model_solver_natural_steps(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "python"
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        model.variables = {"var": var}
+        model.events = [pybamm.Event("var=0.5", var - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, natural_steps=True)
+        t_eval = np.linspace(0, 5, 1000)
+        solution = solver.solve(model, t_eval)
+        # the solution is returned at the steps taken, fewer than the times in t_eval
+        self.assertLess(len(solution.t), 100)
+        self.assertEqual(solution.t[0], 0)
+        self.assertEqual(solution.t[-1], 5)
+        np.testing.assert_allclose(solution.y[0], np.exp(-0.1 * solution.t))
+        np.testing.assert_allclose(
+            solution["var"](t_eval), np.exp(-0.1 * t_eval), rtol=1e-3
+        )
+
+        # thinned steps
+        solver.natural_steps_tol = 1e-3
+        thinned = solver.solve(model, t_eval)
+        self.assertLess(len(thinned.t), len(solution.t))
+        self.assertEqual(thinned.t[-1], 5)
+        np.testing.assert_allclose(thinned.y[0], np.exp(-0.1 * thinned.t))
+
+        # event
+        solution = solver.solve(model, [0, 10])
+        self.assertEqual(solution.termination, "event: var=0.5")
+        np.testing.assert_allclose(solution.t[-1], 10 * np.log(2), rtol=1e-6)
+
     def test_model_solver_ode_with_jacobian_python(self):
         # Create model
         model = pybamm.BaseModel()
@@ -155,6 +191,29 @@ class TestScipySolver(TestCase):
             np.ones((N, T.size)) * (T[np.newaxis, :] - np.exp(T[np.newaxis, :])),
         )
 
+    def test_model_solver_with_coloured_jacobian_python(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "python"
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=whole_cell)
+        a = pybamm.InputParameter("a")
+        model.rhs = {var: pybamm.div(pybamm.grad(var)) - a * var**2}
+        model.initial_conditions = {var: 1.0}
+        model.boundary_conditions = {
+            var: {"left": (0, "Neumann"), "right": (0, "Neumann")}
+        }
+        disc = get_discretisation_for_testing()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 1, 100)
+        solutions = []
+        for use_jacobian_colouring in [False, True]:
+            model.use_jacobian_colouring = use_jacobian_colouring
+            solver = pybamm.ScipySolver(method="BDF", rtol=1e-8, atol=1e-8)
+            solutions.append(solver.solve(model, t_eval, inputs={"a": 2}))
+        self.assertIsInstance(model.jac_rhs_eval, pybamm.ColouredJacobian)
+        np.testing.assert_allclose(solutions[0].y, solutions[1].y, rtol=1e-6)
+
     def test_model_step_python(self):
         # Create model
         model = pybamm.BaseModel()
@@ -278,6 +337,57 @@ class TestScipySolver(TestCase):
                         solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
                     )
 
+    def test_model_solver_multiple_inputs_pool(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "casadi"
+        var = pybamm.Variable("var")
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 10, 100)
+        inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(8)]
+
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        pool = solver._pool
+        self.assertIsNotNone(pool)
+
+        # The pool is reused by later calls with the same model and nproc
+        solutions = solver.solve(
+            model, t_eval, inputs=inputs_list, nproc=2, chunksize=3
+        )
+        self.assertIs(solver._pool, pool)
+        for i, solution in enumerate(solutions):
+            self.assertIs(solution.all_models[0], model)
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
+            )
+
+        # Copies and pickled solvers do not share the pool
+        self.assertIsNone(solver.copy()._pool)
+        self.assertIsNone(pickle.loads(pickle.dumps(solver))._pool)
+
+        # A new pool is created for a different number of processes
+        solver.solve(model, t_eval, inputs=inputs_list, nproc=3)
+        self.assertIsNot(solver._pool, pool)
+
+        # ... and when the settings of the solver change
+        solver = pybamm.ScipySolver(rtol=1e-2, atol=1e-2)
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        pool = solver._pool
+        solver.rtol = solver.atol = 1e-10
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        self.assertIsNot(solver._pool, pool)
+        for i, solution in enumerate(solutions):
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-0.01 * (i + 1) * solution.t), rtol=1e-8
+            )
+
+        solver.close_pool()
+        self.assertIsNone(solver._pool)
+
     def test_model_solver_multiple_inputs_discontinuity_error(self):
         # Create model
         model = pybamm.BaseModel()
@@ -132,6 +132,73 @@ class TestSolution(TestCase):
         ):
             sol_sum.y
 
+    def test_append_solutions(self):
+        t1 = np.linspace(0, 1)
+        y1 = np.tile(t1, (20, 1))
+        sol1 = pybamm.Solution(t1, y1, pybamm.BaseModel(), {"a": 1})
+        sol1.solve_time = 1.5
+        sol1.integration_time = 0.3
+
+        t2 = np.linspace(1, 2)
+        y2 = np.tile(t2, (20, 1))
+        sol2 = pybamm.Solution(t2, y2, pybamm.BaseModel(), {"a": 2})
+        sol2.solve_time = 1
+        sol2.integration_time = 0.5
+
+        t3 = np.linspace(3, 4)
+        y3 = np.tile(t3, (20, 1))
+        sol3 = pybamm.Solution(t3, y3, pybamm.BaseModel(), {"a": 3})
+        sol3.solve_time = 1
+        sol3.integration_time = 0.5
+
+        # Compute t and y so that they are extended rather than recomputed
+        sol = sol1.copy()
+        sol.t, sol.y
+        self.assertIs(sol.append(sol2), sol)
+        sol.append(sol3)
+        sol_sum = sol1 + sol2 + sol3
+
+        self.assertEqual(sol.integration_time, 1.3)
+        self.assertEqual(len(sol.all_ts), 3)
+        self.assertEqual(len(sol.sub_solutions), 3)
+        np.testing.assert_array_equal(sol.t, sol_sum.t)
+        np.testing.assert_array_equal(sol.y, sol_sum.y)
+        np.testing.assert_array_equal(sol.all_inputs, sol_sum.all_inputs)
+        self.assertEqual(len(sol.all_inputs_casadi), 3)
+
+        # Original solutions are unchanged
+        self.assertEqual(len(sol1.all_ts), 1)
+        np.testing.assert_array_equal(sol1.t, t1)
+        np.testing.assert_array_equal(sol1.sub_solutions[0].t, t1)
+
+        # Appending to a new solution keeps its original sub-solution
+        sol1.append(sol2)
+        np.testing.assert_array_equal(sol1.sub_solutions[0].t, t1)
+        np.testing.assert_array_equal(sol1.t, np.concatenate([t1, t2[1:]]))
+
+        # Appending a repeated state only updates the termination
+        sol4 = pybamm.Solution(
+            np.array([4]), np.ones((20, 1)), pybamm.BaseModel(), {}, termination="a"
+        )
+        sol.append(sol4)
+        self.assertEqual(len(sol.all_ts), 3)
+        self.assertEqual(sol.termination, "a")
+
+        # Appending None or an empty solution does nothing
+        sol.append(None)
+        sol.append(pybamm.EmptySolution())
+        self.assertEqual(len(sol.all_ts), 3)
+
+        with self.assertRaisesRegex(
+            pybamm.SolverError, "Only a Solution or None can be appended"
+        ):
+            sol.append(2)
+
+        # Times that are not increasing raise an error when t is next accessed
+        sol.append(sol2)
+        with self.assertRaisesRegex(ValueError, "must be strictly increasing"):
+            sol.t
+
     def test_copy(self):
         # Set up first solution
         t1 = [np.linspace(0, 1), np.linspace(1, 2, 5)]
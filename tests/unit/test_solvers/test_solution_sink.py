@@ -0,0 +1,82 @@
+#
+# Tests for the solution sinks
+#
+from tests import TestCase
+import os
+import tempfile
+import pybamm
+import unittest
+import numpy as np
+
+
+class TestSolutionSink(TestCase):
+    def test_base_sink(self):
+        sink = pybamm.SolutionSink()
+        self.assertEqual(
+            sink.output_variables, ["Time [s]", "Current [A]", "Voltage [V]"]
+        )
+        with self.assertRaises(NotImplementedError):
+            sink.write_cycle(1, None, {})
+        sink.close()
+
+    def test_npz_sink(self):
+        model = pybamm.BaseModel()
+        a = pybamm.Variable("a")
+        model.rhs = {a: pybamm.Scalar(1)}
+        model.initial_conditions = {a: 0}
+        model.variables = {"a": a, "2a": 2 * a}
+        pybamm.Discretisation().process_model(model)
+        solver = pybamm.ScipySolver()
+
+        with tempfile.TemporaryDirectory() as directory:
+            # files left by an earlier run, with a different number of cycles per
+            # file, are not read
+            sink = pybamm.NpzSolutionSink(directory, output_variables=["a"])
+            for cycle_number in range(1, 5):
+                solution = solver.solve(model, np.linspace(0, 1, 5))
+                sink.write_cycle(cycle_number, solution, {"Cycle end": -1})
+            sink.close()
+
+            sink = pybamm.NpzSolutionSink(
+                directory, output_variables=["a", "2a"], cycles_per_file=2
+            )
+            for cycle_number in range(1, 4):
+                solution = solver.solve(model, np.linspace(0, cycle_number, 5))
+                sink.write_cycle(cycle_number, solution, {"Cycle end": cycle_number})
+            # the last cycle is only written when the sink is closed
+            self.assertEqual(len(sink._files), 1)
+            sink.close()
+            self.assertEqual(
+                [os.path.basename(filename) for _, _, filename in sink._files],
+                ["cycles_000001_000002.npz", "cycles_000003_000003.npz"],
+            )
+
+            variables, summary_variables = sink.load_cycle(3)
+            np.testing.assert_array_almost_equal(
+                variables["2a"], 2 * np.linspace(0, 3, 5)
+            )
+            self.assertEqual(summary_variables, {"Cycle end": 3})
+            with self.assertRaisesRegex(KeyError, "Cycle 4"):
+                sink.load_cycle(4)
+
+            summary_variables = sink.load_summary_variables()
+            np.testing.assert_array_equal(summary_variables["Cycle number"], [1, 2, 3])
+            np.testing.assert_array_equal(summary_variables["Cycle end"], [1, 2, 3])
+
+            # a cycle written again keeps its latest values
+            sink.write_cycle(2, solution, {"Cycle end": 20})
+            sink.close()
+            summary_variables = sink.load_summary_variables()
+            np.testing.assert_array_equal(summary_variables["Cycle number"], [1, 2, 3])
+            np.testing.assert_array_equal(summary_variables["Cycle end"], [1, 20, 3])
+            self.assertEqual(sink.load_cycle(2)[1], {"Cycle end": 20})
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,85 @@
+#
+# Tests for the SolverStats class
+#
+from tests import TestCase
+import pybamm
+import unittest
+import numpy as np
+
+
+class TestSolverStats(TestCase):
+    def test_init(self):
+        stats = pybamm.SolverStats()
+        self.assertTrue(all(value is None for value in stats.as_dict().values()))
+        self.assertEqual(list(stats.as_dict()), pybamm.SolverStats.fields)
+        self.assertEqual(repr(stats), "SolverStats()")
+
+        stats = pybamm.SolverStats(number_of_steps=10, residual_time=0.5)
+        self.assertEqual(stats.number_of_steps, 10)
+        self.assertEqual(stats.residual_time, 0.5)
+        self.assertIsNone(stats.jacobian_time)
+        self.assertEqual(
+            repr(stats), "SolverStats(number_of_steps=10, residual_time=0.5)"
+        )
+
+    def test_add(self):
+        stats1 = pybamm.SolverStats(
+            number_of_steps=10, number_of_residual_evaluations=20, residual_time=0.5
+        )
+        stats2 = pybamm.SolverStats(
+            number_of_steps=5, number_of_jacobian_evaluations=2, residual_time=0.25
+        )
+        stats = stats1 + stats2
+        self.assertEqual(stats.number_of_steps, 15)
+        self.assertEqual(stats.residual_time, 0.75)
+        # statistics recorded by only one of the solutions are kept
+        self.assertEqual(stats.number_of_residual_evaluations, 20)
+        self.assertEqual(stats.number_of_jacobian_evaluations, 2)
+        self.assertIsNone(stats.linear_solve_time)
+        # the original statistics are not changed
+        self.assertEqual(stats1.number_of_steps, 10)
+
+        self.assertEqual((stats1 + None).as_dict(), stats1.as_dict())
+        self.assertEqual(sum([stats1, stats2]).as_dict(), stats.as_dict())
+        with self.assertRaises(TypeError):
+            stats1 + 1
+
+    def test_solution_stats(self):
+        # statistics are summed when solutions are added
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 1, 20)
+        for solver in [pybamm.CasadiSolver(), pybamm.ScipySolver()]:
+            solution = solver.solve(model, t_eval)
+            stats = solution.solver_stats
+            self.assertIsInstance(stats, pybamm.SolverStats)
+            self.assertGreater(stats.number_of_steps, 0)
+            self.assertGreater(stats.number_of_residual_evaluations, 0)
+
+            solution2 = solver.solve(model, t_eval + 1)
+            total = (solution + solution2).solver_stats
+            self.assertEqual(
+                total.number_of_steps,
+                stats.number_of_steps + solution2.solver_stats.number_of_steps,
+            )
+            self.assertEqual(solution.copy().solver_stats.as_dict(), stats.as_dict())
+
+        # casadi records the time spent in the residual and jacobian functions
+        casadi_stats = pybamm.CasadiSolver().solve(model, t_eval).solver_stats
+        self.assertGreater(casadi_stats.residual_time, 0)
+        self.assertGreater(casadi_stats.number_of_nonlinear_iterations, 0)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
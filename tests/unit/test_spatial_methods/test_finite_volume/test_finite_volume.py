@@ -9,7 +9,8 @@ from tests import (
     get_1p1d_mesh_for_testing,
 )
 import numpy as np
-from scipy.sparse import kron, eye
+from scipy.sparse import kron, eye, csr_matrix
+from pybamm.spatial_methods.finite_volume import block_diagonal
 import unittest
 
 
@@ -229,6 +230,75 @@ class TestFiniteVolume(TestCase):
             mass.toarray(), model.mass_matrix.entries.toarray()
         )
 
+    def test_operator_cache(self):
+        mesh = get_p2d_mesh_for_testing()
+        fin_vol = pybamm.FiniteVolume()
+        fin_vol.build(mesh)
+        c = pybamm.Variable(
+            "c",
+            domain=["negative particle"],
+            auxiliary_domains={"secondary": "negative electrode"},
+        )
+        d = pybamm.Variable(
+            "d",
+            domain=["negative particle"],
+            auxiliary_domains={"secondary": "negative electrode"},
+        )
+        e = pybamm.Variable("e", domain=["negative particle"])
+
+        # operators are shared by all the symbols with the same domains
+        grad_matrix = fin_vol.gradient_matrix(c.domain, c.domains)
+        self.assertIs(fin_vol.gradient_matrix(d.domain, d.domains), grad_matrix)
+        self.assertIs(
+            fin_vol.divergence_matrix(c.domains), fin_vol.divergence_matrix(d.domains)
+        )
+        self.assertIs(
+            fin_vol.definite_integral_matrix(c), fin_vol.definite_integral_matrix(d)
+        )
+        self.assertIs(
+            fin_vol.indefinite_integral_matrix_edges(c.domains, "forward"),
+            fin_vol.indefinite_integral_matrix_edges(d.domains, "forward"),
+        )
+        self.assertIsNot(
+            fin_vol.indefinite_integral_matrix_edges(c.domains, "forward"),
+            fin_vol.indefinite_integral_matrix_edges(c.domains, "backward"),
+        )
+        self.assertIsNot(fin_vol.gradient_matrix(e.domain, e.domains), grad_matrix)
+
+        # the boundary condition types are part of the key, but not their values
+        disc_c = pybamm.StateVector(slice(0, grad_matrix.shape[1]), domains=c.domains)
+        bcs = {
+            "left": (pybamm.Scalar(0), "Neumann"),
+            "right": (pybamm.Scalar(1), "Dirichlet"),
+        }
+        fin_vol.add_ghost_nodes(c, disc_c, bcs)
+        n_operators = len(fin_vol._operator_cache)
+        bcs = {
+            "left": (pybamm.Scalar(1), "Neumann"),
+            "right": (pybamm.Scalar(2), "Dirichlet"),
+        }
+        fin_vol.add_ghost_nodes(d, disc_c, bcs)
+        self.assertEqual(len(fin_vol._operator_cache), n_operators)
+        bcs = {
+            "left": (pybamm.Scalar(1), "Dirichlet"),
+            "right": (pybamm.Scalar(2), "Dirichlet"),
+        }
+        fin_vol.add_ghost_nodes(d, disc_c, bcs)
+        self.assertEqual(len(fin_vol._operator_cache), n_operators + 1)
+
+        # the cache is cleared when the method is built on a new mesh
+        fin_vol.build(get_p2d_mesh_for_testing(6))
+        self.assertIsNot(fin_vol.gradient_matrix(c.domain, c.domains), grad_matrix)
+
+    def test_block_diagonal(self):
+        sub_matrix = np.array([[1, 0, 2], [0, 3, 0]])
+        for repeats in [1, 4]:
+            matrix = block_diagonal(sub_matrix, repeats)
+            self.assertIsInstance(matrix, csr_matrix)
+            np.testing.assert_array_equal(
+                matrix.toarray(), kron(eye(repeats), sub_matrix).toarray()
+            )
+
     def test_jacobian(self):
         # Create discretisation
         whole_cell = ["negative electrode", "separator", "positive electrode"]
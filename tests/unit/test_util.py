@@ -12,7 +12,7 @@ from unittest.mock import patch
 from io import StringIO
 from tempfile import TemporaryDirectory
 
-anytree = sys.modules['anytree']
+import anytree
 
 class TestUtil(TestCase):
     """